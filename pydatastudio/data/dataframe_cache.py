@@ -0,0 +1,131 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Per-DataFrame cache for derived data (statistics, indexes, filter masks...).
+
+Entries are attached to a DataFrame by its fingerprint (identity, shape,
+columns, index identity and data version) and are dropped when the DataFrame
+is garbage collected, replaced by another object with the same identity or
+invalidated.
+
+In-place modifications of a DataFrame can not be detected, so they have to be
+declared with invalidate_dataframe_cache, which drops the cached data and bumps
+the data version of the DataFrame. DataFrames whose modifications are always
+declared (e.g. the researches stored in the knowledge of a DataStudio) are
+registered with track_dataframe_version: derived data that is not explicitly
+requested (e.g. the zone maps used by the filter engine) is only created
+automatically for them (see dataframe_version).
+"""
+import logging
+import weakref
+from threading import RLock
+
+logger = logging.getLogger(__name__)
+
+_caches = {}
+_versions = {}
+_finalized = set()
+_lock = RLock()
+
+
+def track_dataframe_version(dataframe):
+    """
+    Registers a DataFrame whose in-place modifications are declared with invalidate_dataframe_cache.
+
+    :return: Data version of the DataFrame
+    """
+    identity = id(dataframe)
+
+    with _lock:
+        _register_finalizer(dataframe, identity)
+
+        return _versions.setdefault(identity, 0)
+
+
+def dataframe_version(dataframe):
+    """
+    Returns the data version of a DataFrame (the number of declared modifications),
+    None if the DataFrame is not tracked (see track_dataframe_version).
+    """
+    with _lock:
+        return _versions.get(id(dataframe))
+
+
+def dataframe_fingerprint(dataframe):
+    """
+    Returns a cheap fingerprint of a DataFrame identity and version.
+    """
+    return (
+        id(dataframe),
+        dataframe.shape,
+        tuple(dataframe.columns),
+        id(dataframe.index),
+        dataframe_version(dataframe),
+    )
+
+
+def obtain_dataframe_cache(dataframe):
+    """
+    Returns the cache dict of a DataFrame (created empty if needed).
+
+    Each kind of derived data should use its own key in the dict.
+    """
+    identity = id(dataframe)
+    fingerprint = dataframe_fingerprint(dataframe)
+
+    with _lock:
+        entry = _caches.get(identity)
+
+        if entry is None or entry[0] != fingerprint:
+            entry = (fingerprint, {})
+            _caches[identity] = entry
+
+            _register_finalizer(dataframe, identity)
+
+        return entry[1]
+
+
+def peek_dataframe_cache(dataframe):
+    """
+    Returns the cache dict of a DataFrame if it exists and is up to date, None otherwise.
+    """
+    with _lock:
+        entry = _caches.get(id(dataframe))
+
+    if entry is None or entry[0] != dataframe_fingerprint(dataframe):
+        return None
+
+    return entry[1]
+
+
+def invalidate_dataframe_cache(dataframe):
+    """
+    Drops all the cached data of a DataFrame and bumps its data version (if it is tracked).
+
+    It has to be called after in-place modifications of a DataFrame with cached data.
+    """
+    identity = id(dataframe)
+
+    with _lock:
+        entry = _caches.pop(identity, None)
+
+        if identity in _versions:
+            _versions[identity] += 1
+
+    if entry is not None:
+        logger.debug("Cache of dataframe %s invalidated", identity)
+
+
+def _register_finalizer(dataframe, identity):
+    if identity not in _finalized:
+        weakref.finalize(dataframe, _discard, identity)
+        _finalized.add(identity)
+
+
+def _discard(identity):
+    with _lock:
+        _caches.pop(identity, None)
+        _versions.pop(identity, None)
+        _finalized.discard(identity)
@@ -0,0 +1,191 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Case-table filters.
+
+A case table is a sheet with a table of cases: each filled cell of a line is
+an AND operand (column == value) and the lines are ORed. Empty cells impose no
+condition.
+
+Instead of expanding the table into one dict per line, lines are grouped by
+the columns they fill and each group is evaluated as one hash semi-join over
+those columns (see dataframe_join.semi_join_mask), so tens of thousands of
+cases cost a few hash lookups per row. Values are matched by equality.
+
+Case tables are loaded once and cached by file modification time (see
+case_table_cache): editing the file reloads it on the next use.
+
+E.g.:
+
+    cases = case_table_cache.load("compliance.xlsx", sheet="Cases")
+
+    research[cases.mask(research)]
+"""
+import logging
+import os
+from collections import OrderedDict
+from threading import Lock
+
+import numpy
+
+from pydatastudio.data.dataframe_join import semi_join_mask
+from pydatastudio.data.dataframe_sheet import obtain_dataframe_from_workbook
+
+logger = logging.getLogger(__name__)
+
+CASE_TABLE_CACHE_SIZE = 32
+
+
+class CaseTableException(Exception):
+    pass
+
+
+class CaseTable(object):
+    """
+    Table of cases compiled into one semi-join per group of filled columns.
+    """
+
+    def __init__(self, cases):
+        """
+        :param cases: DataFrame with one case per row (missing values and "" are empty cells)
+        """
+        self.columns = list(cases.columns)
+        self.size = cases.shape[0]
+
+        # (key columns, distinct cases of the group)
+        self.groups = []
+
+        filled = (cases.notna() & (cases != "")).to_numpy(dtype=bool)
+
+        patterns, inverse = numpy.unique(filled, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        for group, pattern in enumerate(patterns):
+            keys = [column for column, is_filled in zip(self.columns, pattern) if is_filled]
+
+            if not keys:
+                # Lines without any filled cell select nothing
+                continue
+
+            group_cases = cases.loc[inverse == group, keys].drop_duplicates()
+
+            self.groups.append((keys, group_cases))
+
+        logger.debug(
+            "Case table of %s cases compiled into %s semi-joins", self.size, len(self.groups)
+        )
+
+    @property
+    def keys(self):
+        """
+        Columns used by at least one case.
+        """
+        used = {key for keys, _ in self.groups for key in keys}
+
+        return [column for column in self.columns if column in used]
+
+    def mask(self, dataframe, positions=None, parallel=False):
+        """
+        Returns the numpy bool mask of the rows of dataframe matching any case.
+
+        :param positions: Row positions of dataframe to be evaluated (all if None)
+        :param parallel: If True, rows are probed by a pool of threads (see semi_join_mask)
+        """
+        keys = self.keys
+
+        missing = [key for key in keys if key not in dataframe.columns]
+
+        if missing:
+            raise CaseTableException(f"Case table columns {missing} not included in dataframe")
+
+        probe = dataframe[keys] if positions is None else dataframe[keys].iloc[positions]
+
+        result = numpy.zeros(probe.shape[0], dtype=bool)
+
+        for group_keys, group_cases in self.groups:
+            result |= semi_join_mask(probe, group_cases, group_keys, parallel=parallel)
+
+        return result
+
+    def filter(self, dataframe, parallel=False):
+        return dataframe[self.mask(dataframe, parallel=parallel)]
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return f"CaseTable(cases={self.size}, groups={len(self.groups)})"
+
+
+class CaseTableCache(object):
+    """
+    Case tables loaded from files, cached by path, sheet and file modification time.
+    """
+
+    def __init__(self, max_size=CASE_TABLE_CACHE_SIZE):
+        self.max_size = max_size
+
+        self._tables = OrderedDict()
+        self._lock = Lock()
+
+    def load(self, filename, sheet=None):
+        """
+        Returns the CaseTable of a sheet of an Excel file (the first row is the header).
+
+        :param sheet: Sheet name (the active sheet if None)
+        :rtype: CaseTable
+        """
+        path = os.path.abspath(filename)
+
+        try:
+            status = os.stat(path)
+
+        except OSError as e:
+            raise CaseTableException(f"Case table file {filename} not available: {e}") from e
+
+        key = (path, sheet)
+        version = (status.st_mtime_ns, status.st_size)
+
+        with self._lock:
+            cached = self._tables.get(key)
+
+            if cached is not None and cached[0] == version:
+                self._tables.move_to_end(key)
+
+                return cached[1]
+
+        logger.info("Loading case table %s (sheet %s)", filename, sheet)
+
+        table = CaseTable(_read_cases(path, sheet))
+
+        with self._lock:
+            self._tables[key] = (version, table)
+            self._tables.move_to_end(key)
+
+            while len(self._tables) > self.max_size:
+                self._tables.popitem(last=False)
+
+        return table
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __repr__(self):
+        return f"CaseTableCache(tables={len(self._tables)}, max_size={self.max_size})"
+
+
+case_table_cache = CaseTableCache()
+
+
+def _read_cases(path, sheet):
+    try:
+        return obtain_dataframe_from_workbook(path, sheet)
+
+    except KeyError as e:
+        raise CaseTableException(f"Sheet {sheet} not included in case table {path}") from e
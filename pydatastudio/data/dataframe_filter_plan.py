@@ -0,0 +1,1717 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Compiled filter plans for the dict filter syntax used by data_filter_by_dict.
+
+A filter (dict or list of dicts) is parsed once into an immutable FilterPlan.
+The plan keeps precompiled regular expressions and pre-parsed comparisons, and
+evaluates against any DataFrame as a single NumPy boolean mask.
+
+E.g.:
+
+    plan = compile_filter({"Name": "Bobby", "Score": "> 50"})
+
+    mask = plan.mask(dataframe)        # numpy.ndarray of bool
+    filtered = plan.filter(dataframe)  # dataframe.loc[mask]
+"""
+import ast
+import logging
+import operator
+import re
+import time
+from collections import Counter, OrderedDict
+from datetime import date
+from threading import Lock
+
+import numpy
+from pandas import Timestamp, factorize, isna
+from pandas.api.types import (
+    CategoricalDtype,
+    is_object_dtype,
+    is_scalar,
+    is_string_dtype,
+)
+from pandas.core.series import Series
+
+from pydatastudio.data.dataframe_bitmap import BitmapMask
+from pydatastudio.data.dataframe_cache import dataframe_version
+from pydatastudio.data.dataframe_filter_profile import (
+    PATH_INDEX,
+    PATH_SCAN,
+    PATH_SHARED,
+    PATH_ZONE_MAP,
+    FilterProfile,
+)
+from pydatastudio.data.dataframe_indexes import (
+    HASH_INDEX,
+    SORTED_INDEX,
+    obtain_dataframe_index,
+    obtain_monotonic_index,
+)
+from pydatastudio.data.dataframe_normalization import (
+    normalize_text,
+    obtain_normalized_column,
+    split_match_mode,
+)
+from pydatastudio.data.dataframe_statistics import (
+    obtain_dataframe_statistics,
+    peek_dataframe_statistics,
+)
+
+logger = logging.getLogger(__name__)
+
+EMPTY_TAG = "--EMPTY--"
+EMPTY_PATTERN = "^\\s+$"
+
+COMPARISON_PREFIX = re.compile("^[<>=]|^!=")
+COMPARISON_EXPRESSION = re.compile(r"^\s*(==|!=|<=|>=|<|>)\s*(.+?)\s*$", re.DOTALL)
+
+COMPOUND_COMPARISON_SEPARATOR = re.compile(r"\s+(?:and|&)\s+")
+
+COMPARISON_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+NUMPY_COMPARISONS = {
+    "==": numpy.equal,
+    "!=": numpy.not_equal,
+    "<": numpy.less,
+    "<=": numpy.less_equal,
+    ">": numpy.greater,
+    ">=": numpy.greater_equal,
+}
+
+# numpy dtype kinds compared directly: bool, integer, unsigned, float and (naive) datetime
+NUMPY_COMPARISON_KINDS = "biufM"
+
+_NOT_TYPED = object()
+
+OPERATOR_IN = "in"
+OPERATOR_NOT_IN = "not in"
+OPERATOR_BETWEEN = "between"
+OPERATOR_IS_NULL = "is null"
+OPERATOR_NOT_NULL = "not null"
+
+PLAN_CACHE_SIZE = 512
+
+# Zone maps (see dataframe_statistics) are used to prune blocks on DataFrames with at least this number of rows
+ZONE_MAP_MIN_ROWS = 65536
+ZONE_MAP_OPERATORS = ("==", "<", "<=", ">", ">=")
+
+# Later predicates of an AND (or OR) are evaluated over row positions once the
+# rows still to be decided are below this fraction of the current rows
+NARROW_RATIO = 0.3
+
+REGEX_METACHARACTERS = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+# Regexps are evaluated per distinct value when the sampled ratio of distinct values is below this limit
+REGEX_UNIQUE_RATIO = 0.5
+UNIQUE_SAMPLE_SIZE = 1024
+
+VECTORIZED_PREDICATE_ATTRIBUTE = "__vectorized_predicate__"
+VECTORIZED_ON_FRAME = "frame"
+VECTORIZED_ON_COLUMN = "column"
+
+
+class FilterException(Exception):
+    pass
+
+
+class _EvaluationContext(object):
+    """
+    Evaluation state shared by all the predicates of a plan for one DataFrame.
+
+    A context may be restricted to a subset of row positions of the base
+    DataFrame. Columns are looked up (and gathered for the subset) once per
+    context and reused by every predicate; the subset DataFrame itself is only
+    materialized when a predicate needs the whole frame.
+    """
+
+    def __init__(self, dataframe, positions=None, shared=None):
+        self.base = dataframe
+        self.positions = positions
+        self.size = dataframe.shape[0] if positions is None else len(positions)
+        self.empty = self.size == 0 or dataframe.shape[1] == 0
+
+        # Data of the base DataFrame shared by the context and all its subsets
+        self._shared = (
+            {
+                "columns": {},
+                "indexes": {},
+                "masks": None,
+                "profile": None,
+                # Derived data is only created automatically for tracked DataFrames (see dataframe_cache)
+                "tracked": dataframe_version(dataframe) is not None,
+            }
+            if shared is None
+            else shared
+        )
+        self._base_columns = self._shared["columns"]
+        self._columns = {}
+        self._dataframe = dataframe if positions is None else None
+
+    @property
+    def profile(self):
+        return self._shared["profile"]
+
+    @property
+    def dataframe(self):
+        if self._dataframe is None:
+            self._dataframe = self.base.iloc[self.positions]
+
+        return self._dataframe
+
+    def base_column(self, key):
+        result = self._base_columns.get(key)
+
+        if result is None:
+            column, mode = split_match_mode(key)
+
+            if mode is not None and column in self.base.columns:
+                result = obtain_normalized_column(
+                    self.base, column, mode, cache=self._shared["tracked"]
+                )
+
+            elif key not in self.base.columns and key == self.index_name():
+                # Keys may also refer to the (named) index, as in DataFrame.eval
+                result = Series(self.base.index, copy=False)
+
+            else:
+                result = self.base[key]
+
+            self._base_columns[key] = result
+
+        return result
+
+    def column(self, key):
+        if self.positions is None:
+            return self.base_column(key)
+
+        result = self._columns.get(key)
+
+        if result is None:
+            result = self.base_column(key).iloc[self.positions]
+            self._columns[key] = result
+
+        return result
+
+    def statistics(self):
+        """
+        Returns the statistics catalog of the base DataFrame, or None when it is too small to benefit from it.
+        """
+        if self.base.shape[0] < ZONE_MAP_MIN_ROWS:
+            return None
+
+        if not self._shared["tracked"]:
+            # In-place modifications may not be declared: only catalogs created explicitly
+            return peek_dataframe_statistics(self.base)
+
+        return obtain_dataframe_statistics(self.base)
+
+    def index(self, key, kind):
+        """
+        Returns the secondary index (see dataframe_indexes) of a column, None if it has not been created.
+        Sorted columns of large tracked DataFrames are used as implicit sorted indexes.
+        """
+        indexes = self._shared["indexes"]
+
+        if (key, kind) not in indexes:
+            index = obtain_dataframe_index(self.base, key, kind)
+
+            if index is None and kind == SORTED_INDEX and self._shared["tracked"]:
+                index = obtain_monotonic_index(self.base, key)
+
+            indexes[(key, kind)] = index
+
+        return indexes[(key, kind)]
+
+    def shared_mask(self, predicate):
+        """
+        Returns the mask of a predicate shared by several filters of a batch (see
+        evaluate_filters) for the rows of this context, or None if it is not shared.
+        The shared mask is evaluated once over the whole base DataFrame.
+        """
+        masks = self._shared["masks"]
+
+        if masks is None:
+            return None
+
+        signature = predicate.signature()
+
+        if signature not in masks:
+            return None
+
+        base_mask = masks[signature]
+
+        if base_mask is None:
+            root = _EvaluationContext(self.base, None, self._shared)
+
+            base_mask = _evaluate_unshared_predicate(predicate, root)
+            masks[signature] = base_mask
+
+        return self.take(base_mask)
+
+    def index_name(self):
+        return self.base.index.name
+
+    def index_values(self):
+        index = self.base.index
+
+        if self.positions is not None:
+            index = index[self.positions]
+
+        return Series(index, copy=False)
+
+    def subset(self, positions):
+        """
+        Returns a context restricted to positions (relative to this context).
+        """
+        if self.positions is not None:
+            positions = self.positions[positions]
+
+        return _EvaluationContext(self.base, positions, self._shared)
+
+    def take(self, base_mask):
+        """
+        Returns the values of a mask of the base DataFrame for the rows of this context.
+        """
+        if self.positions is None:
+            return base_mask
+
+        return base_mask[self.positions]
+
+
+def _to_mask(result, na=False):
+    """
+    Converts a predicate result (Series, BitmapMask, array or scalar) into a writable numpy bool array.
+    """
+    if isinstance(result, BitmapMask):
+        result = result.to_mask()
+
+    elif isinstance(result, Series):
+        if result.dtype == bool:
+            result = result.to_numpy()
+        else:
+            result = result.fillna(na).to_numpy(dtype=bool)
+
+    else:
+        result = numpy.asarray(result, dtype=bool)
+
+    if not result.flags.writeable:
+        result = result.copy()
+
+    return result
+
+
+class _Predicate(object):
+    """
+    Base class of the atomic and compound predicates of a plan.
+
+    Each predicate evaluates against an evaluation context and returns a numpy
+    bool array with one element per context row.
+    """
+
+    __slots__ = ("key",)
+
+    # Relative cost per row and expected fraction of selected rows. They are used to order ANDs.
+    COST = 1.0
+    SELECTIVITY = 0.5
+
+    # Row-wise predicates are always evaluated over the selected rows only
+    ROW_WISE = False
+
+    # Results of deterministic predicates only depend on the DataFrame (they can be cached)
+    DETERMINISTIC = True
+
+    # Compound predicates (AND / OR) are not profiled themselves, only their atomic predicates
+    COMPOUND = False
+
+    def evaluate(self, context):
+        raise NotImplementedError
+
+    def cost(self):
+        return self.COST
+
+    def selectivity(self):
+        return self.SELECTIVITY
+
+    def rank(self):
+        """
+        Cheap and selective predicates have lower ranks and are evaluated first.
+        """
+        return self.cost() / max(1.0 - self.selectivity(), 0.01)
+
+    def evaluate_indexed(self, context):
+        """
+        Evaluates the predicate by means of the secondary indexes of the DataFrame.
+        Returns None when no index can be used.
+        """
+        return None
+
+    def bounds(self):
+        """
+        Returns the (key, operator, constant) conditions ANDed by the predicate that
+        can be checked against zone maps, or None.
+        """
+        return None
+
+    def deterministic(self):
+        return self.DETERMINISTIC
+
+    def atoms(self):
+        """
+        Yields the atomic predicates of the predicate (the predicate itself if it is atomic).
+        """
+        yield self
+
+    def signature(self):
+        """
+        Returns a hashable identity of the predicate: atomic deterministic predicates
+        with the same signature return the same mask. None if it can not be shared.
+        """
+        if not self.deterministic():
+            return None
+
+        return (type(self).__name__, self.describe())
+
+    def describe(self):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return self.describe()
+
+
+class _EqualityPredicate(_Predicate):
+    __slots__ = ("value",)
+
+    SELECTIVITY = 0.1
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+
+    def evaluate(self, context):
+        return _to_mask(context.column(self.key) == self.value)
+
+    def evaluate_indexed(self, context):
+        index = context.index(self.key, HASH_INDEX)
+
+        if index is None:
+            return None
+
+        return context.take(index.mask([self.value]))
+
+    def bounds(self):
+        return ((self.key, "==", self.value),)
+
+    def describe(self):
+        return f"{self.key} == {self.value!r}"
+
+
+class _ComparisonPredicate(_Predicate):
+    """
+    Comparison against a constant parsed at compile time.
+
+    Columns with numeric or naive datetime numpy dtypes are compared directly with
+    numpy. The constant is converted once per column dtype (e.g. date strings are
+    parsed into datetime64 only once). Other columns use the pandas operators.
+
+    When the column has a sorted index (see dataframe_indexes.create_dataframe_index)
+    or is sorted in a large tracked DataFrame (e.g. date-ordered transactions, see
+    dataframe_indexes.obtain_monotonic_index) the comparison is solved by searchsorted.
+    """
+
+    __slots__ = ("operator", "constant", "typed_constants")
+
+    def __init__(self, key, operator_symbol, constant):
+        self.key = key
+        self.operator = operator_symbol
+        self.constant = constant
+        self.typed_constants = {}
+
+    def evaluate(self, context, out=None):
+        column = context.column(self.key)
+        values = _numpy_values(column)
+
+        if values is not None:
+            constant = self._typed_constant(values.dtype)
+
+            if constant is not _NOT_TYPED:
+                return NUMPY_COMPARISONS[self.operator](values, constant, out=out)
+
+        result = _to_mask(COMPARISON_OPERATORS[self.operator](column, self.constant))
+
+        if out is not None:
+            out[:] = result
+            result = out
+
+        return result
+
+    def evaluate_indexed(self, context):
+        return _evaluate_sorted_indexes(context, (self,))
+
+    def bounds(self):
+        return ((self.key, self.operator, self.constant),)
+
+    def _typed_constant(self, dtype):
+        result = self.typed_constants.get(dtype, None)
+
+        if result is None:
+            result = _obtain_typed_constant(self.constant, dtype)
+            self.typed_constants[dtype] = result
+
+        return result
+
+    def describe(self):
+        return f"{self.key} {self.operator} {self.constant!r}"
+
+
+def _numpy_values(column):
+    """
+    Returns the numpy array of a column when it can be compared directly, None otherwise.
+    """
+    dtype = column.dtype
+
+    if isinstance(dtype, numpy.dtype) and dtype.kind in NUMPY_COMPARISON_KINDS:
+        return column.to_numpy()
+
+    return None
+
+
+def _obtain_typed_constant(constant, dtype):
+    """
+    Converts a constant to be compared with a numpy array of dtype.
+    Returns _NOT_TYPED when the comparison has to be done by pandas.
+    """
+    result = _NOT_TYPED
+
+    if dtype.kind == "M":
+        if isinstance(constant, (str, date, numpy.datetime64)):
+            try:
+                timestamp = Timestamp(constant)
+
+                if timestamp.tzinfo is None:
+                    result = timestamp.to_datetime64()
+
+            except (ValueError, TypeError):
+                pass
+
+    elif isinstance(constant, (int, float, numpy.number)):
+        result = constant
+
+    return result
+
+
+class _ComparisonGroupPredicate(_Predicate):
+    """
+    Several comparisons of the same AND evaluated in one pass over a single mask
+    buffer (e.g. "> 5 and < 10" or {">=": 1, "<": 10}).
+    """
+
+    __slots__ = ("comparisons",)
+
+    def cost(self):
+        return sum(c.cost() for c in self.comparisons)
+
+    def selectivity(self):
+        return 0.5 ** len(self.comparisons)
+
+    def __init__(self, comparisons):
+        self.comparisons = tuple(comparisons)
+        self.key = ", ".join(dict.fromkeys(str(c.key) for c in self.comparisons))
+
+    def evaluate(self, context):
+        result = numpy.empty(context.size, dtype=bool)
+        buffer = numpy.empty(context.size, dtype=bool)
+
+        self.comparisons[0].evaluate(context, out=result)
+
+        for comparison in self.comparisons[1:]:
+            result &= comparison.evaluate(context, out=buffer)
+
+        return result
+
+    def evaluate_indexed(self, context):
+        return _evaluate_sorted_indexes(context, self.comparisons)
+
+    def bounds(self):
+        return tuple(c.bounds()[0] for c in self.comparisons)
+
+    def describe(self):
+        return " AND ".join(c.describe() for c in self.comparisons)
+
+
+class _MembershipPredicate(_Predicate):
+    """
+    Membership ("in" / "not in") with the semantics of Series.isin.
+
+    Hash indexes do not index missing values, so lists including a missing value
+    (None, NaN, NaT...) are always evaluated with isin.
+    """
+
+    __slots__ = ("values", "negate", "missing")
+
+    COST = 1.5
+
+    def selectivity(self):
+        result = min(1.0, 0.1 * len(self.values))
+
+        return 1.0 - result if self.negate else result
+
+    def __init__(self, key, values, negate=False):
+        self.key = key
+        self.values = tuple(values)
+        self.negate = negate
+        self.missing = any(is_scalar(value) and isna(value) for value in self.values)
+
+    def evaluate(self, context):
+        result = _to_mask(context.column(self.key).isin(self.values))
+
+        if self.negate:
+            numpy.logical_not(result, out=result)
+
+        return result
+
+    def evaluate_indexed(self, context):
+        if self.missing:
+            return None
+
+        index = context.index(self.key, HASH_INDEX)
+
+        if index is None:
+            return None
+
+        result = context.take(index.mask(self.values))
+
+        if self.negate:
+            result = ~result
+
+        return result
+
+    def describe(self):
+        operator_symbol = OPERATOR_NOT_IN if self.negate else OPERATOR_IN
+
+        return f"{self.key} {operator_symbol} {list(self.values)!r}"
+
+
+class _BetweenPredicate(_Predicate):
+    """
+    Inclusive range: lower <= value <= upper.
+    """
+
+    __slots__ = ("lower", "upper", "comparisons")
+
+    COST = 2.0
+    SELECTIVITY = 0.25
+
+    def __init__(self, key, lower, upper):
+        self.key = key
+        self.lower = lower
+        self.upper = upper
+        self.comparisons = (
+            _ComparisonPredicate(key, ">=", lower),
+            _ComparisonPredicate(key, "<=", upper),
+        )
+
+    def evaluate(self, context):
+        result = self.comparisons[0].evaluate(context)
+        result &= self.comparisons[1].evaluate(context)
+
+        return result
+
+    def evaluate_indexed(self, context):
+        return _evaluate_sorted_indexes(context, self.comparisons)
+
+    def bounds(self):
+        return tuple(c.bounds()[0] for c in self.comparisons)
+
+    def describe(self):
+        return f"{self.key} between {self.lower!r} and {self.upper!r}"
+
+
+class _NullPredicate(_Predicate):
+    __slots__ = ("is_null",)
+
+    COST = 0.5
+
+    def selectivity(self):
+        return 0.1 if self.is_null else 0.9
+
+    def __init__(self, key, is_null):
+        self.key = key
+        self.is_null = is_null
+
+    def evaluate(self, context):
+        result = context.column(self.key).isna().to_numpy()
+
+        if self.is_null:
+            return result.copy()
+
+        return ~result
+
+    def describe(self):
+        operator_symbol = OPERATOR_IS_NULL if self.is_null else OPERATOR_NOT_NULL
+
+        return f"{self.key} {operator_symbol}"
+
+
+class _ExpressionPredicate(_Predicate):
+    """
+    Comparison expressions that can not be pre-parsed (e.g. "> Other Column").
+    They are evaluated with DataFrame.eval, as the original filter engine did.
+    """
+
+    __slots__ = ("expression",)
+
+    COST = 20.0
+
+    def __init__(self, key, value):
+        self.key = key
+
+        query_key = key
+
+        if " " in query_key:
+            query_key = "`" + key + "`"
+
+        self.expression = query_key + value
+
+    def evaluate(self, context):
+        return _to_mask(context.dataframe.eval(self.expression))
+
+    def describe(self):
+        return f"eval({self.expression})"
+
+
+class _RegexPredicate(_Predicate):
+    """
+    Anchored regular expression match ("^value$").
+
+    With a match mode (see dataframe_normalization) the key reads the normalized
+    column, literals and prefixes are normalized and the pattern ignores case.
+
+    Plain literals are rewritten as a hash membership test and simple prefixes
+    ("ES.*") as startswith. Real regular expressions are evaluated once per
+    distinct value (categories or factorized values) and broadcast back to the
+    rows, unless the column has mostly distinct values.
+    """
+
+    __slots__ = ("pattern", "na", "literal", "prefix")
+
+    def cost(self):
+        if self.literal is not None:
+            return 1.5
+
+        return 5.0 if self.prefix is not None else 10.0
+
+    def selectivity(self):
+        if self.literal is not None:
+            return 0.1
+
+        return 0.3 if self.prefix is not None else 0.5
+
+    def __init__(self, key, value, mode=None):
+        self.key = key
+
+        self.literal = None
+        self.prefix = None
+
+        flags = 0 if mode is None else re.IGNORECASE
+
+        if EMPTY_TAG not in value:
+            if not REGEX_METACHARACTERS.search(value):
+                self.literal = normalize_text(value, mode)
+
+            elif value.endswith(".*") and not REGEX_METACHARACTERS.search(value[:-2]):
+                self.prefix = normalize_text(value[:-2], mode)
+
+        # Included to manage exact match (if no specifically defined by regexp)
+        value = "^" + value + "$"
+
+        self.na = EMPTY_TAG in value
+        self.pattern = re.compile(value.replace(EMPTY_TAG, EMPTY_PATTERN, 1), flags)
+
+    def evaluate(self, context):
+        if self.key == context.index_name():
+            values = context.index_values()
+            na = False
+
+        else:
+            values = context.column(self.key)
+            na = self.na
+
+        if isinstance(values.dtype, CategoricalDtype):
+            result = self._evaluate_categorical(values, na)
+
+        else:
+            if not (is_object_dtype(values.dtype) or is_string_dtype(values.dtype)):
+                raise AttributeError("Can only use .str accessor with string values!")
+
+            if self.literal is not None:
+                # "$" also matches before a trailing new line
+                result = _to_mask(values.isin([self.literal, self.literal + "\n"]))
+
+            elif self._unique_ratio(context, values) <= REGEX_UNIQUE_RATIO:
+                result = self._evaluate_unique_values(values, na)
+
+            elif self.prefix is not None:
+                result = self._evaluate_prefix(values)
+
+            else:
+                result = _to_mask(values.str.match(self.pattern, na=na), na)
+
+        return result
+
+    def evaluate_indexed(self, context):
+        if self.literal is None or self.key == context.index_name():
+            return None
+
+        index = context.index(self.key, HASH_INDEX)
+
+        if index is None or not (
+            is_object_dtype(index.uniques.dtype) or is_string_dtype(index.uniques.dtype)
+        ):
+            return None
+
+        return context.take(index.mask([self.literal, self.literal + "\n"]))
+
+    def _unique_ratio(self, context, values):
+        statistics = context.statistics()
+
+        if statistics is not None and self.key != context.index_name():
+            column_statistics = statistics.column(self.key)
+
+            if column_statistics is not None and column_statistics.size > 0:
+                return column_statistics.distinct_estimate / column_statistics.size
+
+        return _estimate_unique_ratio(values)
+
+    def _match(self, value, na):
+        if isinstance(value, str):
+            return self.pattern.match(value) is not None
+
+        return na
+
+    def _evaluate_categorical(self, values, na):
+        categories = values.cat.categories
+        codes = values.cat.codes.to_numpy()
+
+        lookup = numpy.empty(len(categories) + 1, dtype=bool)
+
+        if self.literal is not None:
+            # Normalized columns are categorical: literals and prefixes are also normalized
+            lookup[:-1] = _to_mask(categories.isin([self.literal, self.literal + "\n"]))
+
+        elif self.prefix is not None and is_string_dtype(categories.dtype):
+            lookup[:-1] = self._evaluate_prefix(Series(categories, copy=False))
+
+        else:
+            lookup[:-1] = [self._match(category, na) for category in categories]
+
+        lookup[-1] = na
+
+        return lookup[codes]
+
+    def _evaluate_unique_values(self, values, na):
+        codes, uniques = factorize(values)
+
+        lookup = numpy.empty(len(uniques) + 1, dtype=bool)
+        lookup[:-1] = [self._match(unique, na) for unique in uniques]
+        lookup[-1] = na
+
+        return lookup[codes]
+
+    def _evaluate_prefix(self, values):
+        result = _to_mask(values.str.startswith(self.prefix, na=False))
+
+        # ".*" does not match new lines, so candidates containing them are checked with the regexp
+        positions = numpy.flatnonzero(result)
+        candidates = values.iloc[positions]
+
+        new_lines = numpy.flatnonzero(
+            _to_mask(candidates.str.contains("\n", regex=False, na=False))
+        )
+
+        for position in new_lines:
+            result[positions[position]] = self._match(candidates.iat[position], False)
+
+        return result
+
+    def describe(self):
+        if self.literal is not None:
+            result = f"{self.key} in {[self.literal]!r}"
+
+        elif self.prefix is not None:
+            result = f"{self.key} startswith {self.prefix!r}"
+
+        else:
+            result = f"{self.key} matches {self.pattern.pattern!r}"
+
+        return result
+
+
+def _estimate_unique_ratio(values):
+    """
+    Estimates the ratio of distinct values of a column from a strided sample.
+    """
+    size = len(values)
+
+    if size == 0:
+        return 0.0
+
+    step = max(1, size // UNIQUE_SAMPLE_SIZE)
+    sample = values.iloc[::step]
+
+    return sample.nunique(dropna=False) / len(sample)
+
+
+class _CallablePredicate(_Predicate):
+    """
+    Callable evaluated row by row (one call per row of the DataFrame).
+    """
+
+    __slots__ = ("function",)
+
+    COST = 1000.0
+
+    ROW_WISE = True
+    DETERMINISTIC = False
+
+    def __init__(self, key, function):
+        self.key = key
+        self.function = function
+
+    def evaluate(self, context):
+        if context.size == 0:
+            return numpy.ones(0, dtype=bool)
+
+        return _to_mask(context.dataframe.apply(self.function, axis=1))
+
+    def describe(self):
+        name = getattr(self.function, "__name__", repr(self.function))
+
+        return f"{self.key} -> {name}(row)"
+
+
+class _VectorizedCallablePredicate(_Predicate):
+    """
+    Callable marked with vectorized_predicate. It is called once with the whole
+    DataFrame (or the whole column of the key) and returns a bool mask.
+    """
+
+    __slots__ = ("function", "on_column")
+
+    COST = 5.0
+
+    DETERMINISTIC = False
+
+    def __init__(self, key, function, on_column):
+        self.key = key
+        self.function = function
+        self.on_column = on_column
+
+    def evaluate(self, context):
+        if self.on_column:
+            argument = context.column(self.key)
+        else:
+            argument = context.dataframe
+
+        result = _to_mask(self.function(argument))
+
+        if result.shape != (context.size,):
+            raise ValueError(
+                f"Vectorized predicate returned {result.shape} values for {context.size} rows"
+            )
+
+        return result
+
+    def describe(self):
+        name = getattr(self.function, "__name__", repr(self.function))
+        argument = "column" if self.on_column else "frame"
+
+        return f"{self.key} -> {name}({argument})"
+
+
+def _evaluate_predicate(predicate, context):
+    """
+    Evaluates a predicate. In a batch, predicates shared by several filters are
+    only evaluated once.
+
+    When the context is profiled (see FilterPlan.explain), the path, rows and
+    elapsed time of every atomic predicate are recorded.
+    """
+    profile = context.profile
+
+    if profile is None or predicate.COMPOUND:
+        result = context.shared_mask(predicate)
+
+        if result is None:
+            result = _evaluate_unshared_predicate(predicate, context)
+
+        return result
+
+    start = time.perf_counter()
+
+    result = context.shared_mask(predicate)
+
+    if result is not None:
+        path, scanned = PATH_SHARED, 0
+
+    else:
+        path, scanned, result = _evaluate_with_path(predicate, context)
+
+    profile.record(
+        predicate.key,
+        predicate.describe(),
+        path,
+        context.size,
+        int(numpy.count_nonzero(result)),
+        scanned,
+        time.perf_counter() - start,
+    )
+
+    return result
+
+
+def _evaluate_unshared_predicate(predicate, context):
+    """
+    Evaluates a predicate by means of the secondary indexes of the DataFrame when
+    available. Otherwise, the zone map blocks that can not match its bounds are skipped.
+    """
+    return _evaluate_with_path(predicate, context)[2]
+
+
+def _evaluate_with_path(predicate, context):
+    """
+    Returns the evaluation path, the number of rows scanned and the mask of a predicate.
+    """
+    result = predicate.evaluate_indexed(context)
+
+    if result is not None:
+        return PATH_INDEX, 0, result
+
+    bounds = predicate.bounds()
+
+    if bounds is not None:
+        rows = _zone_map_candidates(context, bounds)
+
+        if rows is not None:
+            result = numpy.zeros(context.size, dtype=bool)
+
+            if len(rows) > 0:
+                result[rows] = predicate.evaluate(context.subset(rows))
+
+            return PATH_ZONE_MAP, len(rows), result
+
+    return PATH_SCAN, context.size, predicate.evaluate(context)
+
+
+def _evaluate_sorted_indexes(context, comparisons):
+    """
+    Evaluates ANDed comparisons by means of sorted indexes: the comparisons of each
+    indexed column are merged into a single slice of its sorted values. Comparisons
+    without index are evaluated as usual. Returns None when no index can be used.
+    """
+    ranges = {}
+    remaining = []
+
+    for comparison in comparisons:
+        index = None
+        constant = _NOT_TYPED
+
+        if comparison.operator in ZONE_MAP_OPERATORS:
+            index = context.index(comparison.key, SORTED_INDEX)
+
+        if index is not None:
+            constant = comparison._typed_constant(index.values.dtype)
+
+        if constant is _NOT_TYPED:
+            remaining.append(comparison)
+
+        else:
+            start, stop = ranges.get(comparison.key, (index, 0, None))[1:]
+
+            ranges[comparison.key] = (index,) + index.range_bounds(
+                comparison.operator, constant, start, stop
+            )
+
+    if not ranges:
+        return None
+
+    result = None
+
+    for index, start, stop in ranges.values():
+        if index.positions is None and context.positions is not None:
+            # Presorted column: the slice is a range of row positions
+            mask = (context.positions >= start) & (context.positions < stop)
+
+        else:
+            mask = context.take(index.mask(start, stop))
+
+        if result is None:
+            result = mask
+
+        else:
+            result &= mask
+
+    for comparison in remaining:
+        result &= comparison.evaluate(context)
+
+    return result
+
+
+def _zone_map_candidates(context, bounds):
+    """
+    Returns the positions (relative to context) of the rows in blocks whose
+    min / max may satisfy all the bounds, or None if no block can be skipped.
+    """
+    statistics = context.statistics()
+
+    if statistics is None:
+        return None
+
+    selected_blocks = None
+
+    for key, operator_symbol, constant in bounds:
+        if operator_symbol not in ZONE_MAP_OPERATORS:
+            continue
+
+        column_statistics = statistics.column(key)
+
+        if column_statistics is None or not column_statistics.has_zone_map:
+            continue
+
+        block_min = column_statistics.block_min
+        block_max = column_statistics.block_max
+
+        constant = _obtain_typed_constant(constant, block_min.dtype)
+
+        if constant is _NOT_TYPED:
+            continue
+
+        if operator_symbol == "==":
+            blocks = (block_min <= constant) & (block_max >= constant)
+
+        elif operator_symbol in (">", ">="):
+            blocks = NUMPY_COMPARISONS[operator_symbol](block_max, constant)
+
+        else:
+            blocks = NUMPY_COMPARISONS[operator_symbol](block_min, constant)
+
+        if selected_blocks is None:
+            selected_blocks = blocks
+
+        else:
+            selected_blocks &= blocks
+
+    if selected_blocks is None or selected_blocks.all():
+        return None
+
+    block_size = statistics.block_size
+
+    if context.positions is None:
+        blocks = numpy.flatnonzero(selected_blocks)
+
+        rows = (blocks[:, None] * block_size + numpy.arange(block_size)).ravel()
+        result = rows[rows < context.size]
+
+    else:
+        result = numpy.flatnonzero(selected_blocks[context.positions // block_size])
+
+    return result
+
+
+class _AllPredicate(_Predicate):
+    """
+    AND of the pairs of a filter dict.
+
+    Predicates are ordered by estimated cost and selectivity (cheap equality
+    and range checks first, regexps and callables last). Evaluation stops as
+    soon as no row is selected and, once the selection is small enough, later
+    predicates are only evaluated over the selected row positions.
+
+    Row-wise callables are only evaluated over the rows that remain selected,
+    so they never see rows already discarded by other keys.
+    """
+
+    __slots__ = ("predicates", "source")
+
+    COMPOUND = True
+
+    def __init__(self, predicates, source, key=None):
+        self.key = key
+        self.predicates = tuple(sorted(predicates, key=lambda p: p.rank()))
+        self.source = source
+
+    def cost(self):
+        return sum(p.cost() for p in self.predicates)
+
+    def selectivity(self):
+        result = 1.0
+
+        for predicate in self.predicates:
+            result *= predicate.selectivity()
+
+        return result
+
+    def evaluate(self, context):
+        result = numpy.ones(context.size, dtype=bool)
+
+        if context.empty:
+            return result
+
+        current = context
+        positions = None
+        selected = context.size
+        remaining = len(self.predicates)
+
+        for predicate in self.predicates:
+            remaining -= 1
+
+            try:
+                if predicate.ROW_WISE and current.size > selected:
+                    positions = numpy.flatnonzero(result)
+                    current = context.subset(positions)
+
+                mask = _evaluate_predicate(predicate, current)
+
+            except FilterException:
+                raise
+
+            except Exception as e:
+                message = f"Key {predicate.key} for filter {self.source} not valid. Error: {e}"
+                logger.error(message)
+
+                raise FilterException(message) from e
+
+            if positions is None:
+                result &= mask
+                selected = numpy.count_nonzero(result)
+
+            else:
+                result[positions[~mask]] = False
+                selected = numpy.count_nonzero(mask)
+
+            if selected == 0:
+                break
+
+            if remaining > 0 and selected <= NARROW_RATIO * current.size:
+                positions = numpy.flatnonzero(result)
+                current = context.subset(positions)
+
+        return result
+
+    def deterministic(self):
+        return all(p.deterministic() for p in self.predicates)
+
+    def atoms(self):
+        for predicate in self.predicates:
+            yield from predicate.atoms()
+
+    def signature(self):
+        return None
+
+    def describe(self):
+        return "(" + " AND ".join(p.describe() for p in self.predicates) + ")"
+
+
+class _AnyPredicate(_Predicate):
+    """
+    OR of the elements of a filter list.
+
+    Evaluation stops as soon as every row is selected and, once few rows are
+    left unselected, later elements are only evaluated over those rows.
+    """
+
+    __slots__ = ("predicates",)
+
+    COMPOUND = True
+
+    def __init__(self, key, predicates):
+        self.key = key
+        self.predicates = tuple(predicates)
+
+    def cost(self):
+        return sum(p.cost() for p in self.predicates)
+
+    def selectivity(self):
+        result = 1.0
+
+        for predicate in self.predicates:
+            result *= 1.0 - predicate.selectivity()
+
+        return 1.0 - result
+
+    def evaluate(self, context):
+        result = numpy.zeros(context.size, dtype=bool)
+
+        current = context
+        positions = None
+        remaining = len(self.predicates)
+
+        for predicate in self.predicates:
+            remaining -= 1
+
+            mask = _evaluate_predicate(predicate, current)
+
+            if positions is None:
+                result |= mask
+                unselected = context.size - numpy.count_nonzero(result)
+
+            else:
+                result[positions[mask]] = True
+                unselected = current.size - numpy.count_nonzero(mask)
+
+            if unselected == 0:
+                break
+
+            if remaining > 0 and unselected <= NARROW_RATIO * current.size:
+                positions = numpy.flatnonzero(~result)
+                current = context.subset(positions)
+
+        return result
+
+    def deterministic(self):
+        return all(p.deterministic() for p in self.predicates)
+
+    def atoms(self):
+        for predicate in self.predicates:
+            yield from predicate.atoms()
+
+    def signature(self):
+        return None
+
+    def describe(self):
+        return "(" + " OR ".join(p.describe() for p in self.predicates) + ")"
+
+
+class FilterPlan(object):
+    """
+    Immutable compiled version of a dict filter (or a list of dict filters).
+
+    It should be obtained by means of compile_filter.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self, root):
+        object.__setattr__(self, "_root", root)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FilterPlan is immutable")
+
+    def __reduce__(self):
+        return (FilterPlan, (self._root,))
+
+    def mask(self, dataframe, positions=None):
+        """
+        Returns a numpy bool array with the rows of dataframe matching the filter.
+
+        If positions (numpy array of row positions) is provided, only those rows are
+        evaluated and the array has one element per position.
+        """
+        return self._root.evaluate(_EvaluationContext(dataframe, positions))
+
+    def explain(self, dataframe, positions=None):
+        """
+        Evaluates the plan recording the evaluation path, rows in / out and elapsed time
+        of every atomic predicate. Caches of masks are not used.
+
+        :return: Profile of the evaluation (the mask is kept in its mask attribute)
+        :rtype: FilterProfile
+        """
+        context = _EvaluationContext(dataframe, positions)
+
+        profile = FilterProfile(self.describe(), context.size)
+        context._shared["profile"] = profile
+
+        start = time.perf_counter()
+
+        profile.mask = self._root.evaluate(context)
+
+        profile.elapsed = time.perf_counter() - start
+        profile.selected = int(numpy.count_nonzero(profile.mask))
+
+        return profile
+
+    def bitmap(self, dataframe):
+        """
+        Returns a BitmapMask with the rows of dataframe matching the filter.
+        """
+        return BitmapMask.from_mask(self.mask(dataframe))
+
+    def selection(self, dataframe):
+        """
+        Returns a bool Series aligned with the dataframe index.
+        """
+        return Series(self.mask(dataframe), index=dataframe.index, copy=False)
+
+    def filter(self, dataframe):
+        """
+        Returns the rows of dataframe matching the filter, taken in a single selection.
+        """
+        logger.debug("Applying filter plan %s", self)
+
+        return dataframe.loc[self.mask(dataframe)]
+
+    def deterministic(self):
+        """
+        Returns True if the result of the plan only depends on the DataFrame
+        (the plan has no callables), so its masks can be cached.
+        """
+        return self._root.deterministic()
+
+    def describe(self):
+        return self._root.describe()
+
+    def __repr__(self):
+        return f"FilterPlan{self.describe()}"
+
+
+def vectorized_predicate(function=None, on_column=False):
+    """
+    Marks a callable as a vectorized filter predicate.
+
+    A vectorized predicate is called once with the whole DataFrame (or, with
+    on_column=True, with the Series of the filter key) and returns a bool mask
+    (Series, array or list) with one value per row. Unmarked callables are
+    called once per row.
+
+    It can be used as a decorator (with or without arguments) or called directly:
+
+        @vectorized_predicate
+        def recent(df):
+            return df["Date"] > "2023-01-01"
+
+        {"Amount": vectorized_predicate(lambda s: s.abs() > 100, on_column=True)}
+
+    :param function: Callable to be marked
+    :param on_column: If True, the callable receives the column of the filter key
+    :return: The same callable, marked
+    """
+
+    def mark(marked_function):
+        setattr(
+            marked_function,
+            VECTORIZED_PREDICATE_ATTRIBUTE,
+            VECTORIZED_ON_COLUMN if on_column else VECTORIZED_ON_FRAME,
+        )
+
+        return marked_function
+
+    if function is None:
+        return mark
+
+    return mark(function)
+
+
+def is_vectorized_predicate(function):
+    """
+    Returns True if function has been marked with vectorized_predicate.
+    """
+    return getattr(function, VECTORIZED_PREDICATE_ATTRIBUTE, None) is not None
+
+
+def _compile_value(key, value):
+    _, mode = split_match_mode(key)
+
+    if callable(value):
+        vectorized = getattr(value, VECTORIZED_PREDICATE_ATTRIBUTE, None)
+
+        if vectorized is None:
+            result = _CallablePredicate(key, value)
+
+        else:
+            result = _VectorizedCallablePredicate(
+                key, value, vectorized == VECTORIZED_ON_COLUMN
+            )
+
+    elif isinstance(value, str):
+        if COMPARISON_PREFIX.match(value):
+            result = _compile_comparison(key, value)
+
+        else:
+            result = _RegexPredicate(key, value, mode)
+
+    elif isinstance(value, list):
+        result = _compile_list(key, value)
+
+    elif isinstance(value, dict):
+        result = _compile_operators(key, value)
+
+    else:
+        result = _EqualityPredicate(key, normalize_text(value, mode))
+
+    return result
+
+
+def _compile_operators(key, value):
+    """
+    Compiles an operator dict, e.g. {"in": ["EUR", "USD"]} or {">=": 1, "<": 10}.
+    All the operators of the dict are ANDed.
+    """
+    predicates = []
+
+    for operator_symbol, operand in value.items():
+        predicates.append(_compile_operator(key, operator_symbol, operand))
+
+    predicates = _group_comparisons(predicates)
+
+    if len(predicates) == 1:
+        result = predicates[0]
+
+    else:
+        result = _AllPredicate(predicates, str({key: value}), key)
+
+    return result
+
+
+def _compile_operator(key, operator_symbol, operand):
+    _, mode = split_match_mode(key)
+
+    if operator_symbol in COMPARISON_OPERATORS:
+        result = _ComparisonPredicate(key, operator_symbol, normalize_text(operand, mode))
+
+    elif operator_symbol in (OPERATOR_IN, OPERATOR_NOT_IN):
+        if isinstance(operand, (str, bytes)) or not hasattr(operand, "__iter__"):
+            operand = [operand]
+
+        operand = [normalize_text(value, mode) for value in operand]
+
+        result = _MembershipPredicate(key, operand, operator_symbol == OPERATOR_NOT_IN)
+
+    elif operator_symbol == OPERATOR_BETWEEN:
+        lower, upper = operand
+
+        result = _BetweenPredicate(key, lower, upper)
+
+    elif operator_symbol in (OPERATOR_IS_NULL, OPERATOR_NOT_NULL):
+        result = _NullPredicate(key, bool(operand) == (operator_symbol == OPERATOR_IS_NULL))
+
+    else:
+        raise FilterException(f"Operator {operator_symbol} for key {key} not valid")
+
+    return result
+
+
+def _compile_comparison(key, value):
+    """
+    Parses comparison strings ("> 100", "<= '2023-01-01'", "> 5 and < 10") into
+    (operator, constant) predicates. Expressions that can not be parsed (e.g.
+    comparisons with other columns) are kept for DataFrame.eval.
+    """
+    comparisons = []
+
+    for part in COMPOUND_COMPARISON_SEPARATOR.split(value):
+        comparison = _parse_comparison(key, part)
+
+        if comparison is None:
+            return _ExpressionPredicate(key, value)
+
+        comparisons.append(comparison)
+
+    if len(comparisons) == 1:
+        return comparisons[0]
+
+    return _ComparisonGroupPredicate(comparisons)
+
+
+def _parse_comparison(key, value):
+    result = None
+
+    expression = COMPARISON_EXPRESSION.match(value)
+
+    if expression is not None:
+        try:
+            constant = ast.literal_eval(expression.group(2))
+            constant = normalize_text(constant, split_match_mode(key)[1])
+
+            result = _ComparisonPredicate(key, expression.group(1), constant)
+
+        except (ValueError, SyntaxError):
+            pass
+
+    return result
+
+
+def _group_comparisons(predicates):
+    """
+    Replaces the comparisons (and ranges) of an AND by a single group evaluated
+    in one pass. The group takes the place of the first comparison.
+    """
+    comparisons = []
+
+    for predicate in predicates:
+        if isinstance(predicate, _ComparisonPredicate):
+            comparisons.append(predicate)
+
+        elif isinstance(predicate, _BetweenPredicate):
+            comparisons.extend(predicate.comparisons)
+
+        elif isinstance(predicate, _ComparisonGroupPredicate):
+            comparisons.extend(predicate.comparisons)
+
+    if len(comparisons) < 2:
+        return predicates
+
+    result = []
+    grouped = False
+
+    for predicate in predicates:
+        if isinstance(
+            predicate,
+            (_ComparisonPredicate, _BetweenPredicate, _ComparisonGroupPredicate),
+        ):
+            if not grouped:
+                result.append(_ComparisonGroupPredicate(comparisons))
+                grouped = True
+
+        else:
+            result.append(predicate)
+
+    return result
+
+
+def _compile_dict(data_filter):
+    predicates = []
+
+    for key, value in data_filter.items():
+        try:
+            predicates.append(_compile_value(key, value))
+
+        except FilterException:
+            raise
+
+        except Exception as e:
+            message = f"Key {key} for filter {str(data_filter)} not valid. Error: {e}"
+            logger.error(message)
+
+            raise FilterException(message) from e
+
+    return _AllPredicate(_group_comparisons(predicates), str(data_filter))
+
+
+def _compile_list(key, data_filter):
+    predicates = []
+
+    for base_data_filter in data_filter:
+        if isinstance(base_data_filter, list):
+            predicates.append(_compile_list(key, base_data_filter))
+
+        else:
+            predicates.append(_compile_dict(base_data_filter))
+
+    return _AnyPredicate(key, predicates)
+
+
+def _freeze_filter(data_filter):
+    """
+    Returns a hashable representation of a filter, or raises TypeError when
+    the filter contains unhashable values.
+    """
+    if isinstance(data_filter, dict):
+        result = (
+            "dict",
+            tuple((key, _freeze_filter(value)) for key, value in data_filter.items()),
+        )
+
+    elif isinstance(data_filter, list):
+        result = ("list", tuple(_freeze_filter(value) for value in data_filter))
+
+    else:
+        hash(data_filter)
+        result = (type(data_filter), data_filter)
+
+    return result
+
+
+_plan_cache = OrderedDict()
+_plan_cache_lock = Lock()
+
+
+def compile_filter(data_filter):
+    """
+    Returns the FilterPlan for a filter dict or a list of filter dicts.
+
+    The filter syntax is the one described in data_filter_by_dict. Plans are
+    cached, so compiling the same filter configuration again is a lookup.
+
+    :param data_filter: Data Filter
+    :type  data_filter: Dict, List or FilterPlan
+    :return: Compiled filter
+    :rtype: FilterPlan
+    """
+    if isinstance(data_filter, FilterPlan):
+        return data_filter
+
+    try:
+        cache_key = _freeze_filter(data_filter)
+
+    except TypeError:
+        cache_key = None
+
+    if cache_key is not None:
+        with _plan_cache_lock:
+            result = _plan_cache.get(cache_key)
+
+            if result is not None:
+                _plan_cache.move_to_end(cache_key)
+                return result
+
+    if isinstance(data_filter, list):
+        result = FilterPlan(_compile_list(None, data_filter))
+
+    else:
+        result = FilterPlan(_compile_dict(data_filter))
+
+    if cache_key is not None:
+        with _plan_cache_lock:
+            _plan_cache[cache_key] = result
+
+            if len(_plan_cache) > PLAN_CACHE_SIZE:
+                _plan_cache.popitem(last=False)
+
+    return result
+
+
+def evaluate_filters(data_filters, dataframe):
+    """
+    Evaluates a set of named filters over the same DataFrame.
+
+    Atomic predicates repeated across the filters (e.g. the same currency or the
+    same date range) are evaluated only once over the whole DataFrame; each
+    filter then combines the shared masks with its own predicates.
+
+    :param data_filters: Dict of name -> Data Filter (dict, list or FilterPlan)
+    :param dataframe: DataFrame
+    :return: Dict of name -> numpy bool mask
+    :rtype: dict
+    """
+    plans = {name: compile_filter(data_filter) for name, data_filter in data_filters.items()}
+
+    counts = Counter()
+
+    for plan in plans.values():
+        signatures = {atom.signature() for atom in plan._root.atoms()}
+        signatures.discard(None)
+
+        counts.update(signatures)
+
+    context = _EvaluationContext(dataframe)
+    context._shared["masks"] = {
+        signature: None for signature, count in counts.items() if count > 1
+    }
+
+    logger.debug(
+        "Evaluating %s filters with %s shared predicates",
+        len(plans),
+        len(context._shared["masks"]),
+    )
+
+    return {name: plan._root.evaluate(context) for name, plan in plans.items()}
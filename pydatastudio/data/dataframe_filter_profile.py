@@ -0,0 +1,191 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Explain / profile reports of the filter engine.
+
+A FilterProfile records, for every atomic predicate of a filter evaluation,
+the evaluation path chosen by the engine, the rows it had to decide (rows in),
+the rows it selected (rows out), the rows it actually scanned and the elapsed
+time. DataFrames are never rendered: only counts and predicate descriptions
+are kept.
+
+E.g.:
+
+    profile = explain_filter_by_dict({"ISIN": "ES.*", "Amount": "> 1000"}, research)
+
+    print(profile.report())
+    profile.to_dataframe()
+
+Profiles of several researches can be aggregated with a FilterProfiler (the
+students record their output filters in filter_profiler when the filter info
+includes "profile: True").
+"""
+import logging
+from threading import Lock
+
+from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+# Evaluation paths of a predicate
+PATH_SHARED = "shared"
+PATH_INDEX = "index"
+PATH_ZONE_MAP = "zone map"
+PATH_SCAN = "scan"
+
+PROFILE_COLUMNS = [
+    "key",
+    "predicate",
+    "path",
+    "rows_in",
+    "rows_out",
+    "rows_scanned",
+    "elapsed",
+]
+
+
+class PredicateProfile(object):
+    """
+    Profile of one evaluation of an atomic predicate.
+    """
+
+    __slots__ = PROFILE_COLUMNS
+
+    def __init__(self, key, predicate, path, rows_in, rows_out, rows_scanned, elapsed):
+        self.key = key
+        self.predicate = predicate
+        self.path = path
+        self.rows_in = rows_in
+        self.rows_out = rows_out
+        self.rows_scanned = rows_scanned
+        self.elapsed = elapsed
+
+    @property
+    def selectivity(self):
+        return self.rows_out / self.rows_in if self.rows_in else 0.0
+
+    def to_dict(self):
+        return {column: getattr(self, column) for column in PROFILE_COLUMNS}
+
+    def __repr__(self):
+        return (
+            f"PredicateProfile({self.predicate}, path={self.path}, rows_in={self.rows_in}, "
+            f"rows_out={self.rows_out}, elapsed={self.elapsed:.6f})"
+        )
+
+
+class FilterProfile(object):
+    """
+    Report of the evaluation of a filter: one PredicateProfile per atomic predicate
+    evaluated, in evaluation order, plus the totals of the filter.
+    """
+
+    def __init__(self, description, rows=0):
+        self.description = description
+        self.rows = rows
+        self.selected = 0
+        self.elapsed = 0.0
+        self.predicates = []
+        self.mask = None
+
+    def record(self, key, predicate, path, rows_in, rows_out, rows_scanned, elapsed):
+        self.predicates.append(
+            PredicateProfile(key, predicate, path, rows_in, rows_out, rows_scanned, elapsed)
+        )
+
+    def slowest(self, count=5):
+        """
+        Returns the count PredicateProfiles with the highest elapsed time.
+        """
+        return sorted(self.predicates, key=lambda p: p.elapsed, reverse=True)[:count]
+
+    def to_dataframe(self):
+        return DataFrame(
+            [predicate.to_dict() for predicate in self.predicates], columns=PROFILE_COLUMNS
+        )
+
+    def report(self):
+        """
+        Returns the profile as a text table.
+        """
+        lines = [
+            f"Filter: {self.description}",
+            f"Rows: {self.rows} -> {self.selected} in {self.elapsed:.6f}s",
+        ]
+
+        for predicate in self.predicates:
+            lines.append(
+                f"  {predicate.elapsed:10.6f}s  {predicate.path:<8}  "
+                f"{predicate.rows_in:>10} -> {predicate.rows_out:<10}  {predicate.predicate}"
+            )
+
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return (
+            f"FilterProfile(rows={self.rows}, selected={self.selected}, "
+            f"predicates={len(self.predicates)}, elapsed={self.elapsed:.6f})"
+        )
+
+
+class FilterProfiler(object):
+    """
+    Aggregates the FilterProfiles of several researches.
+    """
+
+    def __init__(self):
+        self.profiles = {}
+        self._lock = Lock()
+
+    def add(self, research_name, profile):
+        with self._lock:
+            self.profiles.setdefault(research_name, []).append(profile)
+
+    def clear(self):
+        with self._lock:
+            self.profiles.clear()
+
+    def summary(self):
+        """
+        Returns a DataFrame with the calls, rows and elapsed time of every predicate of every
+        research (sorted by elapsed time, slowest first).
+        """
+        records = []
+
+        with self._lock:
+            for research_name, profiles in self.profiles.items():
+                for profile in profiles:
+                    for predicate in profile.predicates:
+                        record = predicate.to_dict()
+                        record["research"] = research_name
+
+                        records.append(record)
+
+        columns = ["research"] + PROFILE_COLUMNS
+
+        if not records:
+            return DataFrame(columns=columns[:4] + ["calls"] + columns[4:])
+
+        result = (
+            DataFrame(records, columns=columns)
+            .groupby(["research", "key", "predicate", "path"], sort=False, dropna=False)
+            .agg(
+                calls=("elapsed", "size"),
+                rows_in=("rows_in", "sum"),
+                rows_out=("rows_out", "sum"),
+                rows_scanned=("rows_scanned", "sum"),
+                elapsed=("elapsed", "sum"),
+            )
+            .reset_index()
+            .sort_values("elapsed", ascending=False, ignore_index=True)
+        )
+
+        return result
+
+    def __repr__(self):
+        return f"FilterProfiler(researches={len(self.profiles)})"
+
+
+filter_profiler = FilterProfiler()
@@ -0,0 +1,296 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Secondary indexes for DataFrames that are filtered repeatedly.
+
+Two kinds of index can be created (opt-in) over a column:
+
+- hash: value -> row positions. Used by equality, "in" / "not in" and literal filters.
+- sorted: row positions ordered by value. Used by comparisons and ranges by means of searchsorted.
+
+Sorted indexes over columns already sorted (e.g. the dates of date-ordered
+transactions) are created without sorting or copying positions: comparisons
+are solved by searchsorted over the column itself. Sorted columns do not need
+an explicit index on large DataFrames whose version is tracked (see
+dataframe_cache): they are detected once per DataFrame version (see
+obtain_monotonic_index).
+
+Indexes are cached with the DataFrame (see dataframe_cache) and are used
+automatically by the filter engine (data_filter_by_dict / data_selection_by_dict)
+when present. They are dropped when the DataFrame is collected, when
+invalidate_dataframe_cache is called (e.g. after in-place modifications), or
+when the DataFrame is replaced in the knowledge of a DataStudio.
+
+E.g.:
+
+    create_dataframe_index(research, "ISIN")
+    create_dataframe_index(research, "Date", SORTED_INDEX)
+
+    data_filter_by_dict({"ISIN": "ES0000012345", "Date": "> '2023-01-01'"}, research)
+"""
+import logging
+
+import numpy
+from pandas import DatetimeIndex, Index, factorize, to_datetime
+
+from pydatastudio.data.dataframe_cache import (
+    obtain_dataframe_cache,
+    peek_dataframe_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEXES_CACHE_KEY = "indexes"
+
+HASH_INDEX = "hash"
+SORTED_INDEX = "sorted"
+MONOTONIC_INDEX = "monotonic"
+
+# Sorted columns are only detected on DataFrames with at least this number of rows
+MONOTONIC_MIN_ROWS = 65536
+
+# numpy dtype kinds that can be sorted: bool, integer, unsigned, float and datetime
+SORTED_INDEX_KINDS = "biufM"
+
+
+class DataFrameIndexException(Exception):
+    pass
+
+
+class HashIndex(object):
+    """
+    Hash index of a column: maps every distinct value to its row positions.
+    """
+
+    def __init__(self, values):
+        self.size = len(values)
+
+        codes, uniques = factorize(values)
+
+        self.uniques = Index(uniques)
+
+        # Positions grouped by value (missing values, code -1, are not indexed)
+        indexed = codes >= 0
+
+        self.positions = numpy.flatnonzero(indexed)[
+            numpy.argsort(codes[indexed], kind="stable")
+        ]
+
+        counts = numpy.bincount(codes[indexed], minlength=len(uniques))
+
+        self.offsets = numpy.zeros(len(uniques) + 1, dtype=numpy.int64)
+        numpy.cumsum(counts, out=self.offsets[1:])
+
+    def lookup(self, values):
+        """
+        Returns the row positions (sorted) of the rows equal to any of values.
+        """
+        targets = list(values)
+
+        if isinstance(self.uniques, DatetimeIndex):
+            targets = to_datetime(targets, errors="coerce")
+
+        codes = self.uniques.get_indexer(Index(targets))
+        codes = numpy.unique(codes[codes >= 0])
+
+        segments = [
+            self.positions[self.offsets[code] : self.offsets[code + 1]]
+            for code in codes
+        ]
+
+        if not segments:
+            return numpy.zeros(0, dtype=numpy.int64)
+
+        result = numpy.concatenate(segments)
+        result.sort()
+
+        return result
+
+    def mask(self, values):
+        """
+        Returns a bool array with the rows equal to any of values.
+        """
+        result = numpy.zeros(self.size, dtype=bool)
+        result[self.lookup(values)] = True
+
+        return result
+
+    def __repr__(self):
+        return f"HashIndex(size={self.size}, distinct={len(self.uniques)})"
+
+
+class SortedIndex(object):
+    """
+    Sorted index of a numeric or datetime column (missing values are not indexed).
+
+    If the values are already sorted (presorted), they are used as they are and
+    row positions are the positions in the sorted values.
+    """
+
+    def __init__(self, values, presorted=False):
+        self.size = len(values)
+
+        if presorted:
+            self.positions = None
+            self.values = values
+
+            return
+
+        if values.dtype.kind in "fM":
+            indexed = numpy.flatnonzero(~numpy.isnan(values))
+            order = indexed[numpy.argsort(values[indexed], kind="stable")]
+
+        else:
+            order = numpy.argsort(values, kind="stable")
+
+        self.positions = order
+        self.values = values[order]
+
+    def range_bounds(self, operator_symbol, constant, start=0, stop=None):
+        """
+        Narrows the [start, stop) slice of the sorted values to the values satisfying
+        "value <operator_symbol> constant" (==, <, <=, > or >=).
+        """
+        if stop is None:
+            stop = len(self.values)
+
+        values = self.values
+
+        if operator_symbol in (">", ">=", "=="):
+            side = "right" if operator_symbol == ">" else "left"
+            start = max(start, values.searchsorted(constant, side=side))
+
+        if operator_symbol in ("<", "<=", "=="):
+            side = "left" if operator_symbol == "<" else "right"
+            stop = min(stop, values.searchsorted(constant, side=side))
+
+        return start, max(start, stop)
+
+    def lookup(self, start, stop):
+        """
+        Returns the row positions (sorted) of the [start, stop) slice of the sorted values.
+        """
+        if self.positions is None:
+            return numpy.arange(start, stop)
+
+        result = self.positions[start:stop].copy()
+        result.sort()
+
+        return result
+
+    def mask(self, start, stop):
+        result = numpy.zeros(self.size, dtype=bool)
+
+        if self.positions is None:
+            result[start:stop] = True
+
+        else:
+            result[self.positions[start:stop]] = True
+
+        return result
+
+    def __repr__(self):
+        return f"SortedIndex(size={self.size}, presorted={self.positions is None})"
+
+
+def create_dataframe_index(dataframe, columns, kind=HASH_INDEX):
+    """
+    Creates (and caches with the DataFrame) indexes over one or several columns.
+
+    :param dataframe: DataFrame to be indexed
+    :param columns: Column name or list of column names
+    :param kind: HASH_INDEX (equality / membership) or SORTED_INDEX (comparisons / ranges).
+                 Sorted indexes over columns already sorted do not sort them again
+    :return: Index of the last column
+    :rtype: HashIndex or SortedIndex
+    """
+    if not isinstance(columns, (list, tuple)):
+        columns = [columns]
+
+    indexes = obtain_dataframe_cache(dataframe).setdefault(INDEXES_CACHE_KEY, {})
+
+    result = None
+
+    for column in columns:
+        values = dataframe[column]
+
+        if kind == HASH_INDEX:
+            result = HashIndex(values)
+
+        elif kind == SORTED_INDEX:
+            if not (
+                isinstance(values.dtype, numpy.dtype)
+                and values.dtype.kind in SORTED_INDEX_KINDS
+            ):
+                raise DataFrameIndexException(
+                    f"Sorted index not available for column {column} of type {values.dtype}"
+                )
+
+            # Sorted columns (without missing values) are used as they are
+            result = SortedIndex(values.to_numpy(), presorted=values.is_monotonic_increasing)
+
+        else:
+            raise DataFrameIndexException(f"Index kind {kind} not valid")
+
+        logger.debug("Index %s created for column %s", kind, column)
+
+        indexes[(column, kind)] = result
+
+    return result
+
+
+def obtain_dataframe_index(dataframe, column, kind=HASH_INDEX):
+    """
+    Returns the index of a column if it has been created, None otherwise.
+    """
+    cache = peek_dataframe_cache(dataframe)
+
+    if cache is None:
+        return None
+
+    return cache.get(INDEXES_CACHE_KEY, {}).get((column, kind))
+
+
+def obtain_monotonic_index(dataframe, column):
+    """
+    Returns a presorted SortedIndex over a numeric or datetime column when its values
+    are monotonic increasing (without missing values), None otherwise.
+
+    The check is done once per DataFrame version (see dataframe_cache), and only for
+    DataFrames with at least MONOTONIC_MIN_ROWS rows.
+    """
+    if dataframe.shape[0] < MONOTONIC_MIN_ROWS or column not in dataframe.columns:
+        return None
+
+    indexes = obtain_dataframe_cache(dataframe).setdefault(INDEXES_CACHE_KEY, {})
+
+    if (column, MONOTONIC_INDEX) not in indexes:
+        values = dataframe[column]
+
+        result = None
+
+        if (
+            values.ndim == 1
+            and isinstance(values.dtype, numpy.dtype)
+            and values.dtype.kind in SORTED_INDEX_KINDS
+            and values.is_monotonic_increasing
+        ):
+            logger.debug("Column %s is sorted: comparisons solved by searchsorted", column)
+
+            result = SortedIndex(values.to_numpy(), presorted=True)
+
+        indexes[(column, MONOTONIC_INDEX)] = result
+
+    return indexes[(column, MONOTONIC_INDEX)]
+
+
+def drop_dataframe_indexes(dataframe):
+    """
+    Drops all the indexes of a DataFrame.
+    """
+    cache = peek_dataframe_cache(dataframe)
+
+    if cache is not None:
+        cache.pop(INDEXES_CACHE_KEY, None)
@@ -0,0 +1,1039 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Join engines for DataFrames.
+
+Semi-join: selects the rows of a DataFrame whose key columns match any row of
+a (usually much smaller) filter DataFrame. Instead of building a MultiIndex on
+both sides, the distinct values of each key column of the filter side are
+hashed and every key of the probe side is looked up, giving one integer code
+per column. Codes are combined into a single int64 code per row and probed
+against the combined codes of the filter rows. The probe side is processed by
+chunks of rows, so the temporary memory does not depend on its size.
+
+Merge: declarative merges (MergeSpec) of a second DataFrame into a first one
+by equality keys (hash join), range conditions and tolerances, with optional
+aggregation of the matches of each row.
+
+As-of and interval merges: the value of each row of the first DataFrame is
+matched to the nearest value (or the containing interval) of the second one,
+optionally within groups of equal keys. Both sides are sorted together once by
+(group, value), so they scale to millions of rows without per-row lookups.
+"""
+import logging
+import operator
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+from pandas import DataFrame, Index, Series, Timedelta, concat, factorize
+
+logger = logging.getLogger(__name__)
+
+SEMI_JOIN_CHUNK_ROWS = 1000000
+MERGE_CHUNK_ROWS = 100000
+
+FIRST_POSITION = "__first_position__"
+SECOND_POSITION = "__second_position__"
+
+COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# Combined codes are re-encoded before they can overflow an int64
+MAX_COMBINED_CODE = 2**62
+
+
+class DataFrameJoinException(Exception):
+    pass
+
+
+class _SemiJoinKeys(object):
+    """
+    Hashed keys of the filter side of a semi-join.
+
+    Missing values (None, NaN, NaT...) of both sides get the same reserved code
+    of their column (the number of distinct values), or no code when the filter
+    column has no missing values.
+    """
+
+    def __init__(self, dataframe_filter, keys):
+        self.keys = keys
+        self.uniques = []
+        self.missing_codes = []
+
+        # Steps of the combination: (radix, re-encoding index or None) for each key
+        self.steps = []
+
+        combined = None
+        size = 1
+
+        for key in keys:
+            codes, uniques = factorize(dataframe_filter[key])
+
+            self.uniques.append(Index(uniques))
+
+            missing_code = len(uniques) if (codes < 0).any() else -1
+            radix = max(1, len(uniques) + (missing_code >= 0))
+            codes = numpy.where(codes < 0, missing_code, codes)
+
+            self.missing_codes.append(missing_code)
+
+            recode = None
+
+            if combined is not None and size * radix >= MAX_COMBINED_CODE:
+                combined, recode_uniques = factorize(combined)
+                recode = Index(recode_uniques)
+                size = len(recode_uniques)
+
+            self.steps.append((radix, recode))
+
+            if combined is None:
+                combined = codes.astype(numpy.int64)
+
+            else:
+                combined = combined * radix + codes
+
+            size *= radix
+
+        self.codes = Index(numpy.unique(combined))
+
+    def probe(self, dataframe, start, stop):
+        """
+        Returns the mask of the rows [start, stop) of dataframe matching any key of the filter side.
+        """
+        combined = None
+
+        for key, uniques, missing_code, (radix, recode) in zip(
+            self.keys, self.uniques, self.missing_codes, self.steps
+        ):
+            values = dataframe[key].iloc[start:stop]
+
+            codes = numpy.where(
+                values.isna().to_numpy(), missing_code, uniques.get_indexer(values)
+            )
+
+            if combined is None:
+                combined = codes.astype(numpy.int64)
+                continue
+
+            if recode is not None:
+                combined = numpy.where(combined >= 0, recode.get_indexer(combined), -1)
+
+            combined = numpy.where(
+                (combined >= 0) & (codes >= 0), combined * radix + codes, -1
+            )
+
+        if len(self.keys) == 1:
+            return combined >= 0
+
+        return (combined >= 0) & (self.codes.get_indexer(combined) >= 0)
+
+
+def semi_join_mask(
+    dataframe, dataframe_filter, keys=None, chunk_size=SEMI_JOIN_CHUNK_ROWS, parallel=False
+):
+    """
+    Returns a numpy bool array with the rows of dataframe whose keys match any row of dataframe_filter.
+
+    Missing values match missing values, as in MultiIndex.isin.
+
+    :param dataframe: DataFrame to be filtered (probe side)
+    :param dataframe_filter: DataFrame with the keys to be selected
+    :param keys: Key columns (all the columns of dataframe_filter if None)
+    :param chunk_size: Number of rows of dataframe probed at once
+    :param parallel: If True, chunks are probed by a pool of threads
+    """
+    if keys is None:
+        keys = list(dataframe_filter.columns)
+
+    if not keys:
+        raise DataFrameJoinException("Semi-join requires at least one key column")
+
+    missing = [key for key in keys if key not in dataframe.columns]
+
+    if missing:
+        raise KeyError(f"Keys {missing} not included in dataframe")
+
+    size = dataframe.shape[0]
+
+    if size == 0 or dataframe_filter.shape[0] == 0:
+        return numpy.zeros(size, dtype=bool)
+
+    hashed_keys = _SemiJoinKeys(dataframe_filter, keys)
+
+    bounds = [(start, min(size, start + chunk_size)) for start in range(0, size, chunk_size)]
+
+    logger.debug(
+        "Semi-join of %s rows with %s filter keys in %s chunks",
+        size,
+        len(hashed_keys.codes),
+        len(bounds),
+    )
+
+    if parallel and len(bounds) > 1:
+        with ThreadPoolExecutor() as executor:
+            masks = list(
+                executor.map(lambda bound: hashed_keys.probe(dataframe, *bound), bounds)
+            )
+
+    else:
+        masks = [hashed_keys.probe(dataframe, start, stop) for start, stop in bounds]
+
+    return numpy.concatenate(masks)
+
+
+class MergeSpec(object):
+    """
+    Declarative merge of a second DataFrame into a first one.
+
+    Rows of the second DataFrame match a row of the first one when:
+
+    - on: equality keys (a column name, a list of names or a dict first column -> second column)
+    - conditions: (first column, operator, second column) with operator ==, !=, <, <=, > or >=
+    - tolerances: dict first column -> (second column, tolerance): abs(first - second) <= tolerance
+
+    The columns of the second DataFrame (all but the keys if None) are added to
+    the first one. Without aggregation, each row of the first DataFrame is
+    repeated once per matching row (rows without match are kept with missing
+    values, as a left join). With aggregation (a function name such as "first",
+    "last", "sum", "max" or "count", or a dict column -> function), the matches
+    of each row are aggregated and the first DataFrame keeps its rows (rows
+    without match get missing values).
+
+    E.g. price of each position on its date, from the prices of its ISIN:
+
+        MergeSpec(
+            on="ISIN",
+            conditions=[("Date", ">=", "Price Date")],
+            columns=["Price"],
+            aggregation="last",
+        )
+
+    Equality keys are evaluated as a hash join; conditions and tolerances are
+    then applied to the matching pairs only. Without equality keys, the second
+    DataFrame is sorted by the column of a tolerance or of a range condition and
+    the candidates of each row are found by binary search (see _RangeWindows);
+    specs without keys, range conditions nor tolerances are not valid.
+    """
+
+    OPERATORS = ("==", "!=", "<", "<=", ">", ">=")
+
+    def __init__(
+        self,
+        on=None,
+        conditions=None,
+        tolerances=None,
+        columns=None,
+        aggregation=None,
+        suffix="_y",
+    ):
+        self.on = _obtain_key_pairs(on)
+        self.conditions = [tuple(condition) for condition in (conditions or [])]
+        self.tolerances = dict(tolerances or {})
+        self.columns = columns
+        self.aggregation = aggregation
+        self.suffix = suffix
+
+        for condition in self.conditions:
+            if len(condition) != 3 or condition[1] not in MergeSpec.OPERATORS:
+                raise DataFrameJoinException(f"Merge condition {condition} not valid")
+
+        for column, tolerance in self.tolerances.items():
+            if not isinstance(tolerance, (list, tuple)) or len(tolerance) != 2:
+                raise DataFrameJoinException(
+                    f"Merge tolerance for {column} not valid: {tolerance}"
+                )
+
+    def __repr__(self):
+        return (
+            f"MergeSpec(on={self.on}, conditions={self.conditions}, tolerances={self.tolerances}, "
+            f"columns={self.columns}, aggregation={self.aggregation})"
+        )
+
+
+def merge_dataframes_by_spec(
+    first_dataframe, second_dataframe, merge_spec, chunk_size=MERGE_CHUNK_ROWS
+):
+    """
+    Merges second_dataframe into first_dataframe as described by a MergeSpec.
+
+    Rows of the first DataFrame are processed by chunks, so the matching pairs kept in memory
+    (before conditions and aggregation) are bounded by the chunk.
+
+    :param first_dataframe: DataFrame to be enriched
+    :param second_dataframe: DataFrame with the data to be added
+    :param merge_spec: MergeSpec
+    :param chunk_size: Number of rows of the first DataFrame joined at once
+    :return: first_dataframe with the columns of second_dataframe
+    :rtype: DataFrame
+    """
+    spec = merge_spec
+
+    columns = spec.columns
+
+    if columns is None:
+        columns = [
+            column for column in second_dataframe.columns if column not in spec.on.values()
+        ]
+
+    first_columns = list(spec.on.keys())
+    first_columns += [condition[0] for condition in spec.conditions]
+    first_columns += list(spec.tolerances.keys())
+
+    second_columns = list(spec.on.values())
+    second_columns += [condition[2] for condition in spec.conditions]
+    second_columns += [tolerance[0] for tolerance in spec.tolerances.values()]
+
+    first_data = _merge_side(first_dataframe, first_columns, "first")
+    second_data = _merge_side(second_dataframe, second_columns, "second")
+
+    first_keys = [_merge_name("first", first_columns.index(key)) for key in spec.on.keys()]
+    second_keys = [_merge_name("second", second_columns.index(key)) for key in spec.on.values()]
+
+    if not spec.on:
+        first_column, operator_symbol, second_column, tolerance = _obtain_range_condition(spec)
+
+        windows = _RangeWindows(
+            second_data,
+            _merge_name("second", second_columns.index(second_column)),
+            operator_symbol,
+            tolerance,
+        )
+        first_range = _merge_name("first", first_columns.index(first_column))
+
+    first_positions = []
+    second_positions = []
+
+    for start in range(0, max(1, first_dataframe.shape[0]), chunk_size):
+        chunk = first_data.iloc[start : start + chunk_size]
+
+        if spec.on:
+            pairs = chunk.merge(
+                second_data, left_on=first_keys, right_on=second_keys, how="inner"
+            )
+
+        else:
+            pairs = windows.pairs(chunk, first_range)
+
+        selected = numpy.ones(pairs.shape[0], dtype=bool)
+
+        for first_column, operator_symbol, second_column in spec.conditions:
+            first_values = pairs[_merge_name("first", first_columns.index(first_column))]
+            second_values = pairs[_merge_name("second", second_columns.index(second_column))]
+
+            selected &= _compare(first_values, operator_symbol, second_values)
+
+        for first_column, (second_column, tolerance) in spec.tolerances.items():
+            first_values = pairs[_merge_name("first", first_columns.index(first_column))]
+            second_values = pairs[_merge_name("second", second_columns.index(second_column))]
+
+            selected &= _compare((first_values - second_values).abs(), "<=", tolerance)
+
+        first_positions.append(pairs[FIRST_POSITION].to_numpy()[selected])
+        second_positions.append(pairs[SECOND_POSITION].to_numpy()[selected])
+
+    first_positions = numpy.concatenate(first_positions)
+    second_positions = numpy.concatenate(second_positions)
+
+    logger.debug("Merge %s: %s matching pairs", spec, len(first_positions))
+
+    return _merge_result(
+        first_dataframe, second_dataframe, columns, spec, first_positions, second_positions
+    )
+
+
+def _obtain_range_condition(spec):
+    """
+    Returns the (first column, operator, second column, tolerance) used to find the candidate
+    pairs of a merge without equality keys: a tolerance, an equality or a range condition.
+    """
+    if spec.tolerances:
+        first_column, (second_column, tolerance) = next(iter(spec.tolerances.items()))
+
+        return first_column, None, second_column, tolerance
+
+    conditions = [condition for condition in spec.conditions if condition[1] == "=="]
+    conditions += [condition for condition in spec.conditions if condition[1] not in ("==", "!=")]
+
+    if not conditions:
+        raise DataFrameJoinException(
+            f"Merge {spec} needs equality keys, a range condition or a tolerance"
+        )
+
+    first_column, operator_symbol, second_column = conditions[0]
+
+    return first_column, operator_symbol, second_column, None
+
+
+class _RangeWindows(object):
+    """
+    Sorted values of a column of the second side of a merge without equality keys.
+
+    The rows of the second side matching a value by a range condition (or a tolerance) are a
+    window of the sorted values, found with two binary searches. Rows with missing values
+    never match (as the comparisons of the conditions).
+    """
+
+    def __init__(self, second_data, column, operator_symbol, tolerance):
+        values, missing = _obtain_range_values(second_data[column])
+
+        positions = numpy.flatnonzero(~missing)
+        positions = positions[numpy.argsort(values[positions], kind="stable")]
+
+        self.second_data = second_data
+        self.positions = positions
+        self.values = values[positions]
+        self.operator_symbol = operator_symbol
+        self.tolerance = _obtain_tolerance(tolerance, second_data[column])
+
+    def pairs(self, chunk, column):
+        """
+        Returns the candidate pairs (columns of both sides) of the rows of a chunk of the first side.
+        """
+        values, missing = _obtain_range_values(chunk[column])
+
+        rows = numpy.flatnonzero(~missing)
+        values = values[rows]
+
+        begin, stop = self._windows(values)
+
+        lengths = numpy.maximum(stop - begin, 0)
+        total = int(lengths.sum())
+
+        pair_first = numpy.repeat(rows, lengths)
+        pair_second = numpy.repeat(begin - numpy.cumsum(lengths) + lengths, lengths)
+        pair_second += numpy.arange(total)
+
+        return concat(
+            [
+                chunk.iloc[pair_first].reset_index(drop=True),
+                self.second_data.iloc[self.positions[pair_second]].reset_index(drop=True),
+            ],
+            axis=1,
+        )
+
+    def _windows(self, values):
+        sorted_values = self.values
+
+        if self.tolerance is not None:
+            tolerance = self.tolerance
+
+            if values.dtype.kind == "f":
+                # Windows are widened by the rounding errors: pairs are then compared exactly
+                tolerance = tolerance + 4 * numpy.spacing(numpy.abs(values) + abs(tolerance))
+
+            return (
+                numpy.searchsorted(sorted_values, values - tolerance, side="left"),
+                numpy.searchsorted(sorted_values, values + tolerance, side="right"),
+            )
+
+        start = numpy.zeros(len(values), dtype=numpy.int64)
+        end = numpy.full(len(values), len(sorted_values), dtype=numpy.int64)
+
+        # Conditions are first value <operator> second value
+        if self.operator_symbol == "==":
+            return (
+                numpy.searchsorted(sorted_values, values, side="left"),
+                numpy.searchsorted(sorted_values, values, side="right"),
+            )
+
+        if self.operator_symbol == ">":
+            return start, numpy.searchsorted(sorted_values, values, side="left")
+
+        if self.operator_symbol == ">=":
+            return start, numpy.searchsorted(sorted_values, values, side="right")
+
+        if self.operator_symbol == "<":
+            return numpy.searchsorted(sorted_values, values, side="right"), end
+
+        return numpy.searchsorted(sorted_values, values, side="left"), end
+
+
+def _obtain_range_values(values):
+    """
+    Returns the sortable numpy values of a column and the mask of its missing values
+    (numeric and datetime columns as _obtain_asof_values, other columns as objects).
+    """
+    dtype = values.dtype
+
+    if dtype.kind in "biufmM" or str(dtype).startswith("datetime64"):
+        return _obtain_asof_values(values)
+
+    missing = values.isna().to_numpy()
+
+    return values.to_numpy(dtype=object), missing
+
+
+def _merge_name(side, position):
+    return f"__{side}_{position}__"
+
+
+def _merge_side(dataframe, columns, side):
+    """
+    Returns the columns of a side of a merge with internal names and the row positions.
+    """
+    data = {_merge_name(side, i): dataframe[column].array for i, column in enumerate(columns)}
+    data[FIRST_POSITION if side == "first" else SECOND_POSITION] = numpy.arange(dataframe.shape[0])
+
+    return DataFrame(data)
+
+
+def _compare(first_values, operator_symbol, second_values):
+    result = COMPARISONS[operator_symbol](first_values, second_values)
+
+    return result.to_numpy(dtype=bool, na_value=False)
+
+
+def _merge_result(
+    first_dataframe, second_dataframe, columns, spec, first_positions, second_positions
+):
+    """
+    Builds the merged DataFrame from the matching (first position, second position) pairs.
+    """
+    names = {
+        column: column + spec.suffix if column in first_dataframe.columns else column
+        for column in columns
+    }
+
+    matches = second_dataframe[columns].iloc[second_positions].rename(columns=names)
+    matches.index = first_positions
+
+    if spec.aggregation is not None:
+        aggregation = spec.aggregation
+
+        if isinstance(aggregation, dict):
+            aggregation = {
+                names.get(column, column): function for column, function in aggregation.items()
+            }
+
+        aggregated = matches.groupby(level=0, sort=True).agg(aggregation)
+        aggregated = aggregated.reindex(numpy.arange(first_dataframe.shape[0]))
+        aggregated.index = first_dataframe.index
+
+        return concat([first_dataframe, aggregated], axis=1)
+
+    # Left join: pairs in the order of the first DataFrame (and of the second one for each row)
+    unmatched = numpy.setdiff1d(numpy.arange(first_dataframe.shape[0]), first_positions)
+
+    positions = numpy.concatenate([first_positions, unmatched])
+    order = numpy.lexsort(
+        (numpy.concatenate([second_positions, numpy.full(len(unmatched), -1)]), positions)
+    )
+
+    result = first_dataframe.iloc[positions[order]]
+
+    matches = matches.reset_index(drop=True).reindex(numpy.arange(len(positions)))
+    matches = matches.iloc[order]
+    matches.index = result.index
+
+    return concat([result, matches], axis=1)
+
+
+ASOF_BACKWARD = "backward"
+ASOF_FORWARD = "forward"
+ASOF_NEAREST = "nearest"
+
+INTERVAL_CLOSED = ("both", "left", "right", "neither")
+
+
+def merge_dataframes_asof(
+    first_dataframe,
+    second_dataframe,
+    on,
+    by=None,
+    direction=ASOF_BACKWARD,
+    tolerance=None,
+    allow_exact_matches=True,
+    columns=None,
+    suffix="_y",
+):
+    """
+    Adds to each row of first_dataframe the columns of the row of second_dataframe with the
+    nearest value (e.g. the price, FX rate or tax bracket valid at the date of each transaction).
+
+    Unlike pandas.merge_asof, the DataFrames do not need to be sorted, and the rows and index of
+    first_dataframe are kept. Rows without match get missing values.
+
+    :param on: Column with the values (a name, or a (first column, second column) tuple)
+    :param by: Optional equality keys (a name, a list of names or a dict first column -> second column)
+    :param direction: "backward" (last value <= row value), "forward" (first value >= row value) or "nearest"
+    :param tolerance: Maximum distance between values (e.g. a number or pandas.Timedelta("5D"))
+    :param allow_exact_matches: If False, equal values do not match (< and > are used)
+    :param columns: Columns of second_dataframe to be added (all but on / by if None)
+    :param suffix: Suffix of the added columns already included in first_dataframe
+    :rtype: DataFrame
+    """
+    if direction not in (ASOF_BACKWARD, ASOF_FORWARD, ASOF_NEAREST):
+        raise DataFrameJoinException(f"As-of direction {direction} not valid")
+
+    first_on, second_on = on if isinstance(on, (list, tuple)) else (on, on)
+    by = _obtain_key_pairs(by)
+
+    positions = _asof_positions(
+        first_dataframe,
+        second_dataframe,
+        first_on,
+        second_on,
+        by,
+        direction,
+        tolerance,
+        allow_exact_matches,
+    )
+
+    if columns is None:
+        columns = [
+            column
+            for column in second_dataframe.columns
+            if column != second_on and column not in by.values()
+        ]
+
+    return _add_matched_columns(first_dataframe, second_dataframe, columns, positions, suffix)
+
+
+def merge_dataframes_by_interval(
+    first_dataframe,
+    second_dataframe,
+    on,
+    start,
+    end,
+    by=None,
+    closed="both",
+    columns=None,
+    suffix="_y",
+):
+    """
+    Adds to each row of first_dataframe the columns of the row of second_dataframe whose
+    interval [start, end] contains its value (e.g. the tax bracket of an amount or the
+    validity period of a rate).
+
+    When the intervals of a group do not overlap, each row matches at most one interval
+    and the rows and index of first_dataframe are kept (rows without match get missing values).
+    Overlapping intervals are merged as a join: rows are repeated once per containing interval.
+
+    :param on: Column of first_dataframe with the values
+    :param start: Column of second_dataframe with the start of the intervals
+    :param end: Column of second_dataframe with the end of the intervals
+    :param by: Optional equality keys (a name, a list of names or a dict first column -> second column)
+    :param closed: Interval bounds included: "both", "left", "right" or "neither"
+    :param columns: Columns of second_dataframe to be added (all but start / end / by if None)
+    :param suffix: Suffix of the added columns already included in first_dataframe
+    :rtype: DataFrame
+    """
+    if closed not in INTERVAL_CLOSED:
+        raise DataFrameJoinException(f"Interval closed {closed} not valid")
+
+    by = _obtain_key_pairs(by)
+
+    if columns is None:
+        columns = [
+            column
+            for column in second_dataframe.columns
+            if column not in (start, end) and column not in by.values()
+        ]
+
+    left_closed = closed in ("both", "left")
+    right_closed = closed in ("both", "right")
+
+    if _intervals_overlap(second_dataframe, start, end, list(by.values()), closed):
+        logger.debug("Overlapping intervals in %s: merged as a join", start)
+
+        first_positions, second_positions = _interval_pairs(
+            first_dataframe, second_dataframe, on, start, end, by, left_closed, right_closed
+        )
+
+        spec = MergeSpec(on=by, columns=columns, suffix=suffix)
+
+        return _merge_result(
+            first_dataframe, second_dataframe, columns, spec, first_positions, second_positions
+        )
+
+    # Without overlaps, the only candidate is the last interval started before the value
+    positions = _asof_positions(
+        first_dataframe,
+        second_dataframe,
+        on,
+        start,
+        by,
+        ASOF_BACKWARD,
+        None,
+        left_closed,
+    )
+
+    matched = positions >= 0
+
+    values, first_missing = _obtain_asof_values(first_dataframe[on])
+    ends, end_missing = _obtain_asof_values(second_dataframe[end])
+
+    candidate_ends = ends[positions[matched]]
+
+    if right_closed:
+        contained = values[matched] <= candidate_ends
+    else:
+        contained = values[matched] < candidate_ends
+
+    contained &= ~end_missing[positions[matched]]
+
+    positions[numpy.flatnonzero(matched)[~contained]] = -1
+
+    return _add_matched_columns(first_dataframe, second_dataframe, columns, positions, suffix)
+
+
+def _obtain_key_pairs(on):
+    """
+    Returns a dict first column -> second column from a column name, a list of names or a dict.
+    """
+    if on is None:
+        return {}
+
+    if isinstance(on, str):
+        return {on: on}
+
+    if isinstance(on, dict):
+        return dict(on)
+
+    return {key: key for key in on}
+
+
+def _obtain_asof_values(values):
+    """
+    Returns the numpy values of a numeric or datetime column (datetimes as int64 nanoseconds)
+    and the mask of its missing values.
+    """
+    dtype = values.dtype
+
+    if dtype.kind == "M" or str(dtype).startswith("datetime64"):
+        array = values.to_numpy(dtype="datetime64[ns]")
+        missing = numpy.isnat(array)
+
+        return array.view(numpy.int64), missing
+
+    if dtype.kind == "m":
+        array = values.to_numpy(dtype="timedelta64[ns]")
+        missing = numpy.isnat(array)
+
+        return array.view(numpy.int64), missing
+
+    array = values.to_numpy(dtype=numpy.float64, na_value=numpy.nan)
+
+    return array, numpy.isnan(array)
+
+
+def _obtain_tolerance(tolerance, values):
+    """
+    Returns the tolerance in the units of _obtain_asof_values (nanoseconds for datetimes).
+    """
+    if tolerance is None:
+        return None
+
+    if values.dtype.kind in "mM" or str(values.dtype).startswith("datetime64"):
+        return Timedelta(tolerance).value
+
+    return tolerance
+
+
+def _obtain_group_codes(first_dataframe, second_dataframe, by):
+    """
+    Returns the group codes (shared by both sides) of the equality keys.
+    """
+    first_codes = numpy.zeros(first_dataframe.shape[0], dtype=numpy.int64)
+    second_codes = numpy.zeros(second_dataframe.shape[0], dtype=numpy.int64)
+
+    for first_key, second_key in by.items():
+        values = concat(
+            [first_dataframe[first_key], second_dataframe[second_key]], ignore_index=True
+        )
+
+        codes, uniques = factorize(values, use_na_sentinel=False)
+
+        first_codes, second_codes = (
+            first_codes * len(uniques) + codes[: first_dataframe.shape[0]],
+            second_codes * len(uniques) + codes[first_dataframe.shape[0] :],
+        )
+
+        # Codes are compressed after each key, so they never overflow
+        combined, _ = factorize(numpy.concatenate([first_codes, second_codes]))
+        first_codes = combined[: first_dataframe.shape[0]]
+        second_codes = combined[first_dataframe.shape[0] :]
+
+    return first_codes, second_codes
+
+
+def _asof_positions(
+    first_dataframe,
+    second_dataframe,
+    first_on,
+    second_on,
+    by,
+    direction,
+    tolerance,
+    allow_exact_matches,
+):
+    """
+    Returns, for each row of first_dataframe, the position of the matching row of
+    second_dataframe (-1 if there is no match).
+    """
+    first_values, first_missing = _obtain_asof_values(first_dataframe[first_on])
+    second_values, second_missing = _obtain_asof_values(second_dataframe[second_on])
+
+    first_groups, second_groups = _obtain_group_codes(first_dataframe, second_dataframe, by)
+
+    tolerance = _obtain_tolerance(tolerance, first_dataframe[first_on])
+
+    if second_values.size == 0:
+        return numpy.full(first_values.size, -1, dtype=numpy.int64)
+
+    if direction == ASOF_NEAREST:
+        backward = _asof_scan(
+            first_values, second_values, first_groups, second_groups,
+            first_missing, second_missing, ASOF_BACKWARD, allow_exact_matches,
+        )
+        forward = _asof_scan(
+            first_values, second_values, first_groups, second_groups,
+            first_missing, second_missing, ASOF_FORWARD, allow_exact_matches,
+        )
+
+        backward_distance = numpy.where(
+            backward >= 0, first_values - second_values[backward], numpy.inf
+        )
+        forward_distance = numpy.where(
+            forward >= 0, second_values[forward] - first_values, numpy.inf
+        )
+
+        result = numpy.where(forward_distance < backward_distance, forward, backward)
+
+    else:
+        result = _asof_scan(
+            first_values, second_values, first_groups, second_groups,
+            first_missing, second_missing, direction, allow_exact_matches,
+        )
+
+    if tolerance is not None:
+        matched = result >= 0
+
+        distance = numpy.abs(first_values[matched] - second_values[result[matched]])
+
+        result[numpy.flatnonzero(matched)[distance > tolerance]] = -1
+
+    return result
+
+
+def _asof_scan(
+    first_values,
+    second_values,
+    first_groups,
+    second_groups,
+    first_missing,
+    second_missing,
+    direction,
+    allow_exact_matches,
+):
+    """
+    Returns the position of the last (backward) or next (forward) row of second_values of the
+    group of each first value.
+
+    Second rows are sorted once by (group, value rank), combined into a single int64 key, and
+    each first row is located with a single binary search of its (group, value rank) key.
+    """
+    result = numpy.full(len(first_values), -1, dtype=numpy.int64)
+
+    second_positions = numpy.flatnonzero(~second_missing)
+
+    if second_positions.size == 0:
+        return result
+
+    values = numpy.unique(second_values[second_positions])
+    second_ranks = numpy.searchsorted(values, second_values[second_positions])
+
+    # Stable sort: equal values keep the order of the second rows (last one backward, first one forward)
+    order = numpy.lexsort((second_ranks, second_groups[second_positions]))
+    second_positions = second_positions[order]
+
+    span = len(values) + 1
+
+    keys = second_groups[second_positions] * span + second_ranks[order]
+
+    backward = direction == ASOF_BACKWARD
+    side = "right" if backward == allow_exact_matches else "left"
+
+    # Binary searches of sorted needles are much faster (cache friendly) than random ones
+    first_positions = numpy.flatnonzero(~first_missing)
+    first_positions = first_positions[
+        numpy.argsort(first_values[first_positions])
+    ]
+
+    first_ranks = numpy.searchsorted(values, first_values[first_positions], side=side)
+    first_keys = first_groups[first_positions] * span + first_ranks
+
+    order = numpy.argsort(first_keys)
+    first_positions = first_positions[order]
+    first_keys = first_keys[order]
+
+    if backward:
+        found = numpy.searchsorted(keys, first_keys, side="left") - 1
+        valid = found >= 0
+
+    else:
+        found = numpy.searchsorted(keys, first_keys, side="left")
+        valid = found < len(keys)
+
+    found = found[valid]
+    first_positions = first_positions[valid]
+
+    same_group = second_groups[second_positions[found]] == first_groups[first_positions]
+
+    result[first_positions[same_group]] = second_positions[found[same_group]]
+
+    return result
+
+
+def _intervals_overlap(dataframe, start, end, by, closed):
+    """
+    Returns True if any value can be contained in two intervals of the same group.
+    """
+    if dataframe.shape[0] < 2:
+        return False
+
+    starts, _ = _obtain_asof_values(dataframe[start])
+    ends, _ = _obtain_asof_values(dataframe[end])
+
+    _, groups = _obtain_group_codes(dataframe.iloc[:0], dataframe, {key: key for key in by})
+
+    order = numpy.lexsort((starts, groups))
+
+    starts = starts[order]
+    groups = groups[order]
+
+    # Greatest end of the previous intervals of each group
+    ends = Series(ends[order]).groupby(groups).cummax().to_numpy()
+
+    same_group = groups[1:] == groups[:-1]
+
+    if closed == "both":
+        overlap = starts[1:] <= ends[:-1]
+
+    else:
+        overlap = starts[1:] < ends[:-1]
+
+    return bool((same_group & overlap).any())
+
+
+def _interval_pairs(
+    first_dataframe,
+    second_dataframe,
+    on,
+    start,
+    end,
+    by,
+    left_closed,
+    right_closed,
+    chunk_size=MERGE_CHUNK_ROWS,
+):
+    """
+    Returns the (first position, second position) pairs of the values of first_dataframe
+    contained in the (possibly overlapping) intervals of second_dataframe of their group.
+
+    Intervals are sorted by (group, start), so the intervals of the group started before a
+    value are a range ending at a binary search of the value. The greatest end of the
+    previous intervals of the group is monotonic, so a second binary search skips the
+    intervals ended before the value. Only the intervals of the remaining range are checked.
+    """
+    values, first_missing = _obtain_asof_values(first_dataframe[on])
+    starts, start_missing = _obtain_asof_values(second_dataframe[start])
+    ends, end_missing = _obtain_asof_values(second_dataframe[end])
+
+    first_groups, second_groups = _obtain_group_codes(first_dataframe, second_dataframe, by)
+
+    # Intervals with missing bounds do not contain any value
+    second_positions = numpy.flatnonzero(~(start_missing | end_missing))
+    first_positions = numpy.flatnonzero(~first_missing)
+
+    if second_positions.size == 0 or first_positions.size == 0:
+        return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+
+    second_positions = second_positions[
+        numpy.lexsort((starts[second_positions], second_groups[second_positions]))
+    ]
+
+    groups = second_groups[second_positions]
+    starts = starts[second_positions]
+    ends = ends[second_positions]
+    max_ends = Series(ends).groupby(groups).cummax().to_numpy()
+
+    # (group, rank) keys, sorted like the intervals
+    start_values = numpy.unique(starts)
+    end_values = numpy.unique(max_ends)
+
+    start_keys = groups * (len(start_values) + 1) + numpy.searchsorted(start_values, starts)
+    end_keys = groups * (len(end_values) + 1) + numpy.searchsorted(end_values, max_ends)
+
+    result_first = []
+    result_second = []
+
+    for chunk_start in range(0, first_positions.size, chunk_size):
+        positions = first_positions[chunk_start : chunk_start + chunk_size]
+        chunk_values = values[positions]
+        chunk_groups = first_groups[positions]
+
+        # Intervals started before (or at) the value: [..., stop)
+        ranks = numpy.searchsorted(
+            start_values, chunk_values, side="right" if left_closed else "left"
+        )
+        stop = numpy.searchsorted(
+            start_keys, chunk_groups * (len(start_values) + 1) + ranks, side="left"
+        )
+
+        # Intervals of the group whose previous ends are all before the value: [group start, begin)
+        ranks = numpy.searchsorted(
+            end_values, chunk_values, side="left" if right_closed else "right"
+        )
+        begin = numpy.searchsorted(
+            end_keys, chunk_groups * (len(end_values) + 1) + ranks, side="left"
+        )
+
+        lengths = numpy.maximum(stop - begin, 0)
+        total = int(lengths.sum())
+
+        if total == 0:
+            continue
+
+        pair_first = numpy.repeat(positions, lengths)
+        pair_second = numpy.repeat(begin - numpy.cumsum(lengths) + lengths, lengths)
+        pair_second += numpy.arange(total)
+
+        pair_values = values[pair_first]
+
+        if right_closed:
+            contained = ends[pair_second] >= pair_values
+        else:
+            contained = ends[pair_second] > pair_values
+
+        result_first.append(pair_first[contained])
+        result_second.append(second_positions[pair_second[contained]])
+
+    if not result_first:
+        return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64)
+
+    return numpy.concatenate(result_first), numpy.concatenate(result_second)
+
+
+def _add_matched_columns(first_dataframe, second_dataframe, columns, positions, suffix):
+    """
+    Returns first_dataframe with the columns of the rows of second_dataframe at positions (-1 for no match).
+    """
+    names = {
+        column: column + suffix if column in first_dataframe.columns else column
+        for column in columns
+    }
+
+    matches = second_dataframe[columns].reset_index(drop=True).reindex(positions)
+    matches = matches.rename(columns=names)
+    matches.index = first_dataframe.index
+
+    return concat([first_dataframe, matches], axis=1)
@@ -12,6 +12,10 @@ from re import match
 
 import logging
 
+from pydatastudio.data.dataframe_bitmap import BitmapMask
+from pydatastudio.data.dataframe_filter_plan import compile_filter, is_vectorized_predicate
+from pydatastudio.data.dataframe_sheet import obtain_dataframe_from_rows, obtain_dataframe_from_workbook
+
 class DataFrameManager(object):
     '''
     Utility class for managing and manipulating Pandas DataFrame objects.
@@ -31,9 +35,27 @@ class DataFrameManager(object):
         :rtype: DataFrameManager
 
         '''
-        data = ws.values
-        columns = next(data)[0:]
-        dataframe = pd.DataFrame(data, columns=columns)
+        dataframe = obtain_dataframe_from_rows(ws.values)
+        return cls(dataframe, strip_str)
+
+    @classmethod
+    def obtain_dataframe_manager_from_workbook(cls, filename, sheet=None, strip_str=False):
+        '''
+        Create a DataFrameManager instance from a sheet of an Excel file.
+
+        The workbook is opened in read-only, values-only mode and closed once the sheet is loaded.
+
+        :param filename: Excel file.
+        :type filename: str
+        :param sheet: Sheet name (the active sheet if None).
+        :type sheet: str
+        :param strip_str: Flag to indicate if string columns should be stripped.
+        :type strip_str: bool
+        :return: DataFrameManager instance.
+        :rtype: DataFrameManager
+
+        '''
+        dataframe = obtain_dataframe_from_workbook(filename, sheet, strip_str=False)
         return cls(dataframe, strip_str)
 
     def __init__(self, dataframe, strip_str=False):
@@ -68,7 +90,13 @@ class DataFrameManager(object):
 
         The dictionary represents an AND condition for all key-value pairs (column name and value).
         The value can be a regular expression, an equality expression (=), inequality expressions (<, >),
-        or a callable function with a DataFrame as the only parameter.
+        or a callable function with a DataFrame as the only parameter (returning a bool mask or a BitmapMask).
+
+        Operator dicts ({"in": [...]}, {"not in": [...]}, {"between": [lower, upper]}, {"is null": True},
+        {"not null": True}, {"!=": value}, ...) are evaluated as in data_filter_by_dict.
+
+        Callables marked with vectorized_predicate (see dataframe_filter_plan) are evaluated by the
+        compiled filter engine, so they behave as in data_filter_by_dict (including column predicates).
 
         :param data_filter: Data filter.
         :type data_filter: dict or list
@@ -94,16 +122,24 @@ class DataFrameManager(object):
 
                 if not dataframe.empty:
                     if callable(value):
-                        result = dataframe.loc[value]
+                        if is_vectorized_predicate(value):
+                            result = dataframe.loc[compile_filter({key: value}).mask(dataframe)]
+
+                        else:
+                            selection = value(dataframe)
+
+                            if isinstance(selection, BitmapMask):
+                                selection = selection.to_mask()
+
+                            result = dataframe.loc[selection]
+
+                    elif isinstance(value, dict):
+                        result = dataframe.loc[compile_filter({key: value}).mask(dataframe)]
 
                     elif isinstance(value, str):
-                        if match("^[<>=]", str(value)):
-                            query_key = key
-                            
-                            if " " in query_key:
-                                query_key = f"`{key}`"
-                            
-                            result = dataframe.query(f"{query_key} {value}")
+                        if match("^[<>=]|^!=", str(value)):
+                            # Comparisons are parsed once by the compiled filter engine
+                            result = dataframe.loc[compile_filter({key: value}).mask(dataframe)]
                         
                         else:
                             value = f"^{value}$"
@@ -116,7 +152,8 @@ class DataFrameManager(object):
                     else:
                         result = dataframe[(dataframe[key] == value)]
                     
-                    self.logger.debug(f"Filtered data for {key}: {result}")
+                    # Only the size is logged: rendering the DataFrame is expensive even with DEBUG disabled
+                    self.logger.debug("Filtered data for %s: %s rows", key, len(result))
 
 
         return result
\ No newline at end of file
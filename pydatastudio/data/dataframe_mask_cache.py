@@ -0,0 +1,235 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+LRU cache of filter masks.
+
+The same filter is usually applied to the same research many times (output
+filters of several researches, level filters of the editors...). Masks are
+cached by DataFrame (see dataframe_cache) and by a canonical version of the
+filter, so pairs of a filter dict in a different order share their entry.
+
+The cache is opt-in (filter_mask_cache.enabled = True). It pays off for
+DataFrames that live across many filters, such as the researches kept in the
+knowledge of a DataStudio; research results built on every call are new
+objects and never hit.
+
+Memory is bounded by a budget in bytes: least recently used masks are evicted
+first. Masks of a DataFrame are dropped when the DataFrame is collected, when
+invalidate_dataframe_cache is called or when the DataFrame is replaced in the
+knowledge of a DataStudio. In-place modifications can not be detected, so
+invalidate_dataframe_cache has to be called after them (see dataframe_cache).
+
+Filters with callables are not cached, since their result may depend on
+something else than the DataFrame.
+"""
+import logging
+import weakref
+from collections import OrderedDict
+from threading import RLock
+
+from pydatastudio.data.dataframe_cache import obtain_dataframe_cache
+from pydatastudio.data.dataframe_filter_plan import FilterPlan, compile_filter
+from pydatastudio.data.dataframe_parallel import obtain_parallel_executor
+
+logger = logging.getLogger(__name__)
+
+MASK_CACHE_KEY = "masks"
+
+DEFAULT_MASK_CACHE_BUDGET = 64 * 1024 * 1024
+
+
+class _NotCacheable(Exception):
+    pass
+
+
+class _MaskCacheToken(object):
+    """
+    Identifies the masks of a DataFrame version. It lives in the DataFrame cache,
+    so it is collected (and its masks dropped) together with that cache.
+    """
+
+    __slots__ = ("__weakref__",)
+
+
+class FilterMaskCache(object):
+    """
+    LRU cache of filter masks bounded by a memory budget (in bytes).
+    """
+
+    def __init__(self, budget=DEFAULT_MASK_CACHE_BUDGET, enabled=True):
+        self.budget = budget
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+
+        self._entries = OrderedDict()
+        self._token_keys = {}
+        self._lock = RLock()
+
+    def mask(self, data_filter, dataframe, parallel=False):
+        """
+        Returns the (read-only) numpy bool mask of the rows of dataframe matching the filter.
+
+        :param data_filter: Data Filter
+        :type  data_filter: Dict, List or FilterPlan
+        :param parallel: If True, masks not cached are evaluated by chunks in a process pool
+        """
+        plan = compile_filter(data_filter)
+
+        filter_key = canonical_filter(data_filter, plan) if self.enabled else None
+
+        if filter_key is None or self.budget <= 0:
+            return _evaluate(data_filter, plan, dataframe, parallel)
+
+        token = self._obtain_token(dataframe)
+        entry_key = (id(token), filter_key)
+
+        with self._lock:
+            result = self._entries.get(entry_key)
+
+            if result is not None:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+
+                return result
+
+            self.misses += 1
+
+        result = _evaluate(data_filter, plan, dataframe, parallel)
+        result.flags.writeable = False
+
+        self._store(token, entry_key, result)
+
+        return result
+
+    def clear(self):
+        """
+        Drops all the cached masks (counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._token_keys.clear()
+            self.nbytes = 0
+
+    def reset_statistics(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self):
+        """
+        Returns a dict with the hits, misses, evictions, entries, nbytes and budget of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "budget": self.budget,
+            }
+
+    def _obtain_token(self, dataframe):
+        cache = obtain_dataframe_cache(dataframe)
+
+        with self._lock:
+            token = cache.get(MASK_CACHE_KEY)
+
+            if token is None:
+                token = _MaskCacheToken()
+                cache[MASK_CACHE_KEY] = token
+
+                self._token_keys[id(token)] = set()
+                weakref.finalize(token, self._drop_token, id(token))
+
+        return token
+
+    def _store(self, token, entry_key, mask):
+        if mask.nbytes > self.budget:
+            return
+
+        with self._lock:
+            keys = self._token_keys.get(id(token))
+
+            # The DataFrame has been invalidated while the mask was computed
+            if keys is None or entry_key in self._entries:
+                return
+
+            self._entries[entry_key] = mask
+            keys.add(entry_key)
+            self.nbytes += mask.nbytes
+
+            while self.nbytes > self.budget:
+                evicted_key, evicted = self._entries.popitem(last=False)
+
+                self._token_keys[evicted_key[0]].discard(evicted_key)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+
+    def _drop_token(self, token_id):
+        with self._lock:
+            for key in self._token_keys.pop(token_id, ()):
+                mask = self._entries.pop(key, None)
+
+                if mask is not None:
+                    self.nbytes -= mask.nbytes
+
+    def __repr__(self):
+        return (
+            f"FilterMaskCache(entries={len(self._entries)}, nbytes={self.nbytes}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+
+def _evaluate(data_filter, plan, dataframe, parallel):
+    if parallel:
+        return obtain_parallel_executor().mask(data_filter, dataframe)
+
+    return plan.mask(dataframe)
+
+
+def canonical_filter(data_filter, plan=None):
+    """
+    Returns a hashable canonical version of a filter (pairs of dicts sorted by key),
+    or None when the filter can not be cached (callables or unhashable values).
+    """
+    if isinstance(data_filter, FilterPlan):
+        return ("plan", data_filter) if data_filter.deterministic() else None
+
+    if plan is not None and not plan.deterministic():
+        return None
+
+    try:
+        return _canonical_value(data_filter)
+
+    except (_NotCacheable, TypeError):
+        return None
+
+
+def _canonical_value(value):
+    if isinstance(value, dict):
+        items = [(key, _canonical_value(item)) for key, item in value.items()]
+        items.sort(key=lambda item: repr(item[0]))
+
+        return ("dict", tuple(items))
+
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(_canonical_value(item) for item in value))
+
+    if callable(value):
+        raise _NotCacheable()
+
+    hash(value)
+
+    return (type(value), value)
+
+
+# Used by data_filter_by_dict and data_selection_by_dict. Disabled by default
+filter_mask_cache = FilterMaskCache(enabled=False)
@@ -0,0 +1,135 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Case-insensitive and whitespace-normalized matching of text columns.
+
+A match mode is selected in the dict filter syntax with a suffix in the key:
+
+    {"Description~i": "acme corp.*"}      case-insensitive
+    {"Description~n": "acme corp"}        normalized: case-insensitive, stripped
+                                          and with inner whitespace collapsed
+
+The normalized version of a column is computed once per DataFrame version
+(see dataframe_cache) and reused by all the later equality, membership and
+regex filters over the same column. For DataFrames whose version is not
+tracked (see dataframe_cache) the filter engine only reuses normalized columns
+created explicitly with obtain_normalized_column. It is kept as a categorical:
+distinct values are normalized only once and regular expressions are evaluated
+once per category.
+
+Constants of the filter (equality values, literals, prefixes and "in" lists)
+are normalized the same way; regular expressions are matched against the
+normalized text ignoring case.
+"""
+import logging
+import re
+
+import numpy
+from pandas import Categorical, Index, factorize
+from pandas.api.types import CategoricalDtype, is_object_dtype, is_string_dtype
+from pandas.core.series import Series
+
+from pydatastudio.data.dataframe_cache import (
+    obtain_dataframe_cache,
+    peek_dataframe_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+MATCH_MODE_SEPARATOR = "~"
+
+CASE_INSENSITIVE = "i"
+NORMALIZED = "n"
+
+MATCH_MODES = (CASE_INSENSITIVE, NORMALIZED)
+
+NORMALIZED_CACHE_KEY = "normalized"
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def split_match_mode(key):
+    """
+    Returns the column and the match mode of a filter key ("Description~i" -> ("Description", "i")).
+    The mode is None for plain keys.
+    """
+    if isinstance(key, str):
+        column, separator, mode = key.rpartition(MATCH_MODE_SEPARATOR)
+
+        if separator and column and mode in MATCH_MODES:
+            return column, mode
+
+    return key, None
+
+
+def normalize_text(value, mode):
+    """
+    Returns the normalized version of a value (values other than str are returned as they are).
+    """
+    if not isinstance(value, str) or mode is None:
+        return value
+
+    if mode == NORMALIZED:
+        value = WHITESPACE.sub(" ", value).strip()
+
+    return value.lower()
+
+
+def obtain_normalized_column(dataframe, column, mode, cache=True):
+    """
+    Returns the normalized version of a text column of a DataFrame, cached with the DataFrame.
+    Columns that are not text are returned as they are.
+
+    :param column: Column name
+    :param mode: CASE_INSENSITIVE or NORMALIZED
+    :param cache: If False, a column not cached yet is normalized without caching it
+    :rtype: Series
+    """
+    if cache:
+        normalized_columns = obtain_dataframe_cache(dataframe).setdefault(NORMALIZED_CACHE_KEY, {})
+
+    else:
+        normalized_columns = (peek_dataframe_cache(dataframe) or {}).get(NORMALIZED_CACHE_KEY, {})
+
+    result = normalized_columns.get((column, mode))
+
+    if result is None:
+        result = _normalize_column(dataframe[column], mode)
+
+        if cache:
+            normalized_columns[(column, mode)] = result
+
+    return result
+
+
+def _normalize_column(values, mode):
+    """
+    Returns the normalized column as a categorical: its distinct values are normalized
+    once and filters over it are evaluated once per category.
+    """
+    if isinstance(values.dtype, CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        uniques = values.cat.categories
+
+    elif is_object_dtype(values.dtype) or is_string_dtype(values.dtype):
+        codes, uniques = factorize(values)
+
+    else:
+        return values
+
+    logger.debug("Normalizing column %s (%s distinct values)", values.name, len(uniques))
+
+    # Different values may have the same normalized version
+    normalized_codes, categories = factorize(
+        numpy.array([normalize_text(unique, mode) for unique in uniques], dtype=object)
+    )
+
+    lookup = numpy.append(normalized_codes, -1)
+
+    return Series(
+        Categorical.from_codes(lookup[codes], categories=Index(categories, dtype=object)),
+        index=values.index,
+        name=values.name,
+    )
@@ -0,0 +1,246 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Parallel evaluation of filters over large DataFrames.
+
+The DataFrame is split into row chunks evaluated by a persistent pool of
+processes (regexps and string predicates hold the GIL, so threads do not
+help). Numeric, bool and datetime columns are placed once in shared memory
+and read by the workers without serializing them; other columns are sent to
+the worker of each chunk, so every row is shipped only once. The masks of the
+chunks are concatenated in order.
+
+By default a DataFrame is split in CHUNKS_PER_WORKER chunks per worker, each
+of at least MIN_CHUNK_ROWS rows, and DataFrames with less than
+PARALLEL_MIN_ROWS rows are evaluated in the current process, since below
+that size the cost of shipping the data is higher than the gain.
+
+E.g.:
+
+    data_filter_by_dict({"ISIN": "ES.*", "Amount": "> 1000"}, research, parallel=True)
+"""
+import logging
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from threading import Lock
+
+import numpy
+from pandas import DataFrame
+
+from pydatastudio.data.dataframe_filter_plan import compile_filter
+
+logger = logging.getLogger(__name__)
+
+PARALLEL_MIN_ROWS = 1000000
+MIN_CHUNK_ROWS = 200000
+CHUNKS_PER_WORKER = 2
+
+# numpy dtype kinds placed in shared memory: bool, integer, unsigned, float and datetime
+SHARED_MEMORY_KINDS = "biufM"
+
+
+class ParallelFilterExecutor(object):
+    """
+    Evaluates filters by row chunks in a persistent pool of processes (created on first use).
+    """
+
+    def __init__(
+        self,
+        max_workers=None,
+        min_rows=PARALLEL_MIN_ROWS,
+        min_chunk_rows=MIN_CHUNK_ROWS,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_rows = min_rows
+        self.min_chunk_rows = min_chunk_rows
+
+        self._pool = None
+        self._lock = Lock()
+
+    def mask(self, data_filter, dataframe):
+        """
+        Returns the numpy bool mask of the rows of dataframe matching the filter.
+
+        The filter is evaluated in the current process when the DataFrame is too small,
+        when there is a single worker or when the filter can not be sent to the workers
+        (e.g. it includes lambdas).
+        """
+        bounds = self.chunk_bounds(dataframe.shape[0])
+
+        payload = None
+
+        if len(bounds) > 1 and dataframe.columns.is_unique:
+            try:
+                payload = pickle.dumps(data_filter)
+
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                logger.debug("Filter can not be evaluated in parallel: %s", e)
+
+        if payload is None:
+            return compile_filter(data_filter).mask(dataframe)
+
+        logger.debug(
+            "Evaluating filter in %s chunks of dataframe %s", len(bounds), id(dataframe)
+        )
+
+        blocks = []
+
+        try:
+            shared_columns = {}
+
+            for column in dataframe.columns:
+                values = dataframe[column]
+
+                if (
+                    isinstance(values.dtype, numpy.dtype)
+                    and values.dtype.kind in SHARED_MEMORY_KINDS
+                ):
+                    shared_columns[column] = _share_array(values.to_numpy(), blocks)
+
+            pool = self._obtain_pool()
+
+            futures = []
+
+            for start, stop in bounds:
+                local_columns = {
+                    column: dataframe[column].iloc[start:stop].array
+                    for column in dataframe.columns
+                    if column not in shared_columns
+                }
+
+                futures.append(
+                    pool.submit(
+                        _evaluate_chunk,
+                        payload,
+                        list(dataframe.columns),
+                        shared_columns,
+                        local_columns,
+                        dataframe.index[start:stop],
+                        start,
+                        stop,
+                    )
+                )
+
+            return numpy.concatenate([future.result() for future in futures])
+
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def chunk_bounds(self, size):
+        """
+        Returns the [start, stop) row bounds of the chunks of a DataFrame of size rows.
+        """
+        if size < self.min_rows or self.max_workers <= 1:
+            return [(0, size)]
+
+        chunks = min(self.max_workers * CHUNKS_PER_WORKER, max(1, size // self.min_chunk_rows))
+
+        limits = numpy.linspace(0, size, chunks + 1).astype(numpy.int64)
+
+        return list(zip(limits[:-1].tolist(), limits[1:].tolist()))
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _obtain_pool(self):
+        with self._lock:
+            if self._pool is None:
+                logger.info("Starting filter process pool of %s workers", self.max_workers)
+
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+            return self._pool
+
+    def __repr__(self):
+        return f"ParallelFilterExecutor(max_workers={self.max_workers}, min_rows={self.min_rows})"
+
+
+_executor = None
+_executor_lock = Lock()
+
+
+def obtain_parallel_executor():
+    """
+    Returns the ParallelFilterExecutor shared by the whole process.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ParallelFilterExecutor()
+
+        return _executor
+
+
+def _share_array(values, blocks):
+    """
+    Copies a numpy array to a new shared memory block. Returns the (name, dtype, length) to attach it.
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(1, values.nbytes))
+    blocks.append(block)
+
+    numpy.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+
+    return (block.name, values.dtype.str, len(values))
+
+
+def _attach_shared_memory(name):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # The block is owned (and unlinked) by the parent process. Before Python 3.13 attaching
+    # a block registers it in the resource tracker, so registration is skipped in the worker
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+
+    try:
+        return shared_memory.SharedMemory(name=name)
+
+    finally:
+        resource_tracker.register = register
+
+
+def _shared_array(block, dtype, length):
+    return numpy.ndarray((length,), dtype=numpy.dtype(dtype), buffer=block.buf)
+
+
+def _evaluate_chunk(payload, columns, shared_columns, local_columns, index, start, stop):
+    """
+    Evaluates a filter over a chunk of rows (in a worker process).
+    """
+    data = {}
+    blocks = []
+
+    try:
+        for column in columns:
+            if column in shared_columns:
+                name, dtype, length = shared_columns[column]
+
+                block = _attach_shared_memory(name)
+                blocks.append(block)
+
+                data[column] = _shared_array(block, dtype, length)[start:stop]
+
+            else:
+                data[column] = local_columns[column]
+
+        # Data is copied, so the shared memory blocks can be closed
+        dataframe = DataFrame(data, index=index, columns=columns, copy=True)
+
+        return compile_filter(pickle.loads(payload)).mask(dataframe)
+
+    finally:
+        data.clear()
+
+        for block in blocks:
+            block.close()
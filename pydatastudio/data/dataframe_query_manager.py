@@ -65,7 +65,10 @@ class DataframeQueryManager(object):
     The pre-filter is applied to the entire goal, and specific filters override the default filters for specific elements.
     Elements are identified by unique names within each goal.
 
-    All filters are defined using the same format as the data_filter_by_dict method of the DataFrame class.
+    All filters are defined using the same format as the data_filter_by_dict method of the DataFrame class,
+    including operator dicts (e.g. currency: {"in": [EUR, USD]} or amount: {"between": [1, 100]}).
+    The filters of many elements can be applied at once with data_filter_by_dicts, which evaluates
+    the conditions shared by several filters only once.
     '''
     
     @classmethod
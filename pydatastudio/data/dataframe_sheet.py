@@ -0,0 +1,145 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Column-wise loading of worksheets.
+
+Building a DataFrame from ws.values keeps every row of the sheet as a tuple
+(and, for regular workbooks, the whole cell object model) until the DataFrame
+is created. Here rows are streamed in blocks of SHEET_BLOCK_ROWS: each block is
+transposed into its columns and every column is converted to a typed array
+(int64, float64, datetime64, str...) before the next block is read, so only
+one block of Python row tuples is alive at once. The DataFrame is built from
+the concatenated columns, with the same dtypes as DataFrame(rows).
+
+Workbooks are opened in read-only, values-only mode (cached values of the
+formulas) and closed as soon as the sheet has been read:
+
+    research = obtain_dataframe_from_workbook("positions.xlsx", sheet="Positions")
+"""
+import logging
+from itertools import islice, zip_longest
+
+from openpyxl import load_workbook
+from pandas import DataFrame, Index, RangeIndex, Series, concat
+
+logger = logging.getLogger(__name__)
+
+SHEET_BLOCK_ROWS = 65536
+
+
+def obtain_dataframe_from_rows(rows, columns=None, start=0, block_rows=SHEET_BLOCK_ROWS):
+    """
+    Returns a DataFrame built column by column from an iterable of row tuples.
+
+    Rows shorter than the header are completed with missing values and values beyond
+    the header are ignored.
+
+    :param rows: Iterable of row tuples (e.g. ws.values)
+    :param columns: Column names. If None, the first row is the header
+    :param start: First value of the RangeIndex of the result
+    :param block_rows: Number of rows transposed at once
+    """
+    rows = iter(rows)
+
+    if columns is None:
+        columns = next(rows, None)
+
+        if columns is None:
+            return DataFrame()
+
+    columns = list(columns)
+    blocks = [[] for _ in columns]
+    size = 0
+
+    while True:
+        block = list(islice(rows, block_rows))
+
+        if not block:
+            break
+
+        size += len(block)
+
+        width = 0
+
+        for buffer, values in zip(blocks, zip_longest(*block)):
+            buffer.append(Series(values))
+            width += 1
+
+        # Columns beyond the longest row of the block
+        for buffer in blocks[width:]:
+            buffer.append(Series([None] * len(block), dtype=object))
+
+        del block
+
+    data = {position: _concat_column(buffer) for position, buffer in enumerate(blocks)}
+
+    # Columns are built with their default index
+    result = DataFrame(data, index=RangeIndex(size), copy=False)
+    result.index = RangeIndex(start, start + size)
+    result.columns = Index(columns)
+
+    logger.debug("DataFrame of %s rows and %s columns built by columns", size, len(columns))
+
+    return result
+
+
+def obtain_dataframe_from_workbook(filename, sheet=None, strip_str=True, block_rows=SHEET_BLOCK_ROWS):
+    """
+    Returns the DataFrame of a sheet of an Excel file (the first row is the header).
+
+    The workbook is opened in read-only, values-only mode and closed before returning.
+
+    :param sheet: Sheet name (the active sheet if None)
+    :param strip_str: Strip the str columns (see strip_str_columns)
+    """
+    workbook = load_workbook(filename, read_only=True, data_only=True)
+
+    try:
+        worksheet = workbook.active if sheet is None else workbook[sheet]
+
+        result = obtain_dataframe_from_rows(
+            worksheet.iter_rows(values_only=True), block_rows=block_rows
+        )
+
+    finally:
+        workbook.close()
+
+    if strip_str:
+        strip_str_columns(result)
+
+    return result
+
+
+def strip_str_columns(dataframe):
+    """
+    Strips the str columns of a DataFrame and removes the escaped new lines of Excel (_x000D_, _x000A_).
+    """
+    for column in dataframe:
+        try:
+            idx = dataframe[column].first_valid_index()  # Will return None
+            first_valid_value = (
+                dataframe[column].loc[idx] if idx is not None else None
+            )
+
+            if first_valid_value and isinstance(first_valid_value, str):
+                dataframe[column] = dataframe[column].str.strip()
+                dataframe[column] = dataframe[column].str.replace("_x000D_", "")
+                dataframe[column] = dataframe[column].str.replace("_x000A_", "")
+
+        except:
+            logger.error("Column %s is not str" % (column))
+
+
+def _concat_column(blocks):
+    if not blocks:
+        return Series([], dtype=object)
+
+    result = blocks[0] if len(blocks) == 1 else concat(blocks, ignore_index=True)
+
+    if result.dtype == object:
+        # Blocks of different types (e.g. ints and missing values) are inferred as a whole
+        result = result.infer_objects()
+
+    return result
@@ -0,0 +1,485 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+SQLite pushdown of dict filters.
+
+Inputs stored as SQLite extracts do not need to be loaded to be filtered: the
+dict filter syntax of data_filter_by_dict is translated into a parameterized
+SQL WHERE clause, so SQLite (and its indexes) selects the rows and only the
+matching rows are read into pandas.
+
+Translation:
+
+- dict: AND of its pairs. list: OR of its dicts
+- scalars: column = ?
+- comparisons ("> 100", "<= '2023-01-01'", "> 5 and < 10") and operator dicts
+  (in, not in, between, is null, not null, ==, !=, <, <=, >, >=)
+- regular expressions: column REGEXP ? (REGEXP is registered as a Python
+  function). Literals are rewritten as IN and simple prefixes ("ES.*") as a
+  range, so both can use indexes
+
+Pairs of the top level dict that can not be translated (callables, match
+modes, expressions with other columns...) are applied by the filter engine
+(see compile_filter) over the rows returned by SQLite.
+
+E.g.:
+
+    with SQLiteFilterBackend("extract.sqlite") as backend:
+        backend.create_index("transactions", ["ISIN", "Date"])
+
+        data = backend.filter({"ISIN": "ES.*", "Amount": "> 1000"}, "transactions")
+
+Rows are returned in the order of the table. Columns are qualified with the
+table name, so unknown columns raise an error instead of being read as string
+literals by SQLite.
+
+Date and datetime constants are compared as ISO strings ("YYYY-MM-DD HH:MM:SS"),
+the format used by DataFrame.to_sql. String constants compared with date
+columns (declared as TIMESTAMP, DATETIME or DATE) are parsed and written in the
+same format, so "> '2023-01-01'" selects the same rows as in pandas. Constants
+that can not be parsed are applied by the filter engine.
+"""
+import ast
+import logging
+import re
+import sqlite3
+from datetime import date
+from functools import lru_cache
+
+from pandas import NaT, Timestamp, isna, read_sql_query
+from pandas.api.types import is_scalar
+from pandas.errors import DatabaseError
+
+from pydatastudio.data.dataframe_filter_plan import (
+    COMPARISON_EXPRESSION,
+    COMPARISON_PREFIX,
+    COMPOUND_COMPARISON_SEPARATOR,
+    EMPTY_PATTERN,
+    EMPTY_TAG,
+    OPERATOR_BETWEEN,
+    OPERATOR_IN,
+    OPERATOR_IS_NULL,
+    OPERATOR_NOT_IN,
+    OPERATOR_NOT_NULL,
+    REGEX_METACHARACTERS,
+    compile_filter,
+)
+from pydatastudio.data.dataframe_normalization import split_match_mode
+
+logger = logging.getLogger(__name__)
+
+SQL_OPERATORS = {
+    "==": "=",
+    "!=": "<>",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+}
+
+REGEXP_CACHE_SIZE = 256
+
+DATETIME_TYPES = ("TIMESTAMP", "DATETIME")
+DATE_TYPE = "DATE"
+
+
+class SQLiteFilterException(Exception):
+    pass
+
+
+class _NotTranslatable(Exception):
+    pass
+
+
+class SQLiteFilterBackend(object):
+    """
+    Filters tables of a SQLite database with the dict filter syntax.
+
+    The connection is opened on creation and closed by close (or at the end of a with block).
+    """
+
+    def __init__(self, database=":memory:"):
+        """
+        :param database: Path of the SQLite database (":memory:" for a temporary one)
+        """
+        self.database = database
+        self.connection = sqlite3.connect(database)
+        self.connection.create_function(
+            "REGEXP", 2, _regexp, deterministic=True
+        )
+
+    def store(self, dataframe, table, indexes=None, if_exists="replace"):
+        """
+        Stores a DataFrame (without its index) as a table and creates the indexes of the columns provided.
+        """
+        dataframe.to_sql(table, self.connection, if_exists=if_exists, index=False)
+
+        if indexes:
+            self.create_index(table, indexes)
+
+    def create_index(self, table, columns):
+        """
+        Creates (if it does not exist) an index over each column.
+
+        :param columns: Column name or list of column names
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+
+        with self.connection:
+            for column in columns:
+                name = _quote(f"ix_{table}_{column}")
+
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {_quote(table)} ({_quote(column)})"
+                )
+
+        logger.debug("Indexes of table %s created: %s", table, columns)
+
+    def filter(self, data_filter, table, columns=None, parse_dates=None):
+        """
+        Returns a DataFrame with the rows of table matching the filter.
+
+        :param data_filter: Data Filter (dict or list of dicts, see data_filter_by_dict)
+        :param table: Table name
+        :param columns: Columns to be read (all if None)
+        :param parse_dates: Columns to be parsed as datetimes (see pandas.read_sql_query)
+        :rtype: DataFrame
+        """
+        where, parameters, residual = translate_filter(
+            data_filter, table, self.column_types(table)
+        )
+
+        selected = "*" if columns is None else ", ".join(_quote(c) for c in columns)
+        query = f"SELECT {selected} FROM {_quote(table)}"
+
+        if where:
+            query += f" WHERE {where}"
+
+        # Rows selected through an index are returned in index order
+        query += " ORDER BY rowid"
+
+        logger.debug("Filtering table %s: %s", table, query)
+
+        try:
+            result = read_sql_query(
+                query, self.connection, params=parameters, parse_dates=parse_dates
+            )
+
+        except (sqlite3.Error, DatabaseError, ValueError) as e:
+            raise SQLiteFilterException(
+                f"Filter {data_filter} not valid for table {table}. Error: {e}"
+            ) from e
+
+        if residual:
+            logger.debug("Filter %s applied over the rows read from %s", residual, table)
+
+            result = compile_filter(residual).filter(result).reset_index(drop=True)
+
+        return result
+
+    def count(self, data_filter, table):
+        """
+        Returns the number of rows of table matching the translatable part of the filter.
+        """
+        where, parameters, _ = translate_filter(data_filter, table, self.column_types(table))
+
+        query = f"SELECT COUNT(*) FROM {_quote(table)}"
+
+        if where:
+            query += f" WHERE {where}"
+
+        try:
+            return self.connection.execute(query, parameters).fetchone()[0]
+
+        except sqlite3.Error as e:
+            raise SQLiteFilterException(
+                f"Filter {data_filter} not valid for table {table}. Error: {e}"
+            ) from e
+
+    def column_types(self, table):
+        """
+        Returns a dict with the declared type (upper case) of each column of table.
+        """
+        try:
+            columns = self.connection.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+
+        except sqlite3.Error as e:
+            raise SQLiteFilterException(f"Table {table} not available. Error: {e}") from e
+
+        return {column[1]: column[2].upper() for column in columns}
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f"SQLiteFilterBackend(database={self.database!r})"
+
+
+def translate_filter(data_filter, table=None, column_types=None):
+    """
+    Translates a filter into a SQL WHERE clause.
+
+    :param table: Table name used to qualify the columns (not qualified if None)
+    :param column_types: Dict column -> declared SQLite type, used to write the date constants
+    :return: (where clause, parameters, residual dict filter to be applied in pandas).
+             The where clause is empty when nothing can be pushed down.
+    """
+    if isinstance(data_filter, list):
+        try:
+            where, parameters = _translate_list(data_filter, table, column_types)
+
+        except _NotTranslatable:
+            return "", [], data_filter
+
+        return where, parameters, {}
+
+    clauses = []
+    parameters = []
+    residual = {}
+
+    for key, value in data_filter.items():
+        try:
+            clause, clause_parameters = _translate_value(key, value, table, column_types)
+
+        except _NotTranslatable:
+            residual[key] = value
+            continue
+
+        clauses.append(clause)
+        parameters.extend(clause_parameters)
+
+    return " AND ".join(clauses), parameters, residual
+
+
+def _translate_list(data_filter, table, column_types):
+    clauses = []
+    parameters = []
+
+    for element in data_filter:
+        if isinstance(element, list):
+            clause, element_parameters = _translate_list(element, table, column_types)
+
+        else:
+            clause, element_parameters, residual = translate_filter(
+                element, table, column_types
+            )
+
+            if residual:
+                raise _NotTranslatable()
+
+        clauses.append(f"({clause or '1'})")
+        parameters.extend(element_parameters)
+
+    if not clauses:
+        return "1", []
+
+    return "(" + " OR ".join(clauses) + ")", parameters
+
+
+def _translate_value(key, value, table, column_types):
+    if split_match_mode(key)[1] is not None or callable(value):
+        raise _NotTranslatable()
+
+    column = _quote(key) if table is None else f"{_quote(table)}.{_quote(key)}"
+    column_type = None if column_types is None else column_types.get(key)
+
+    if isinstance(value, str):
+        if COMPARISON_PREFIX.match(value):
+            return _translate_comparisons(column, value, column_type)
+
+        return _translate_regex(column, value)
+
+    if isinstance(value, list):
+        clause, parameters = _translate_list(value, table, column_types)
+
+        return clause, parameters
+
+    if isinstance(value, dict):
+        clauses = []
+        parameters = []
+
+        for operator_symbol, operand in value.items():
+            clause, operand_parameters = _translate_operator(
+                column, operator_symbol, operand, column_type
+            )
+
+            clauses.append(clause)
+            parameters.extend(operand_parameters)
+
+        return "(" + " AND ".join(clauses) + ")", parameters
+
+    return f"{column} = ?", [_parameter(value, column_type)]
+
+
+def _translate_comparisons(column, value, column_type):
+    clauses = []
+    parameters = []
+
+    for part in COMPOUND_COMPARISON_SEPARATOR.split(value):
+        expression = COMPARISON_EXPRESSION.match(part)
+
+        if expression is None:
+            raise _NotTranslatable()
+
+        try:
+            constant = ast.literal_eval(expression.group(2))
+
+        except (ValueError, SyntaxError):
+            # Comparisons with other columns or expressions
+            raise _NotTranslatable()
+
+        clause, comparison_parameters = _translate_operator(
+            column, expression.group(1), constant, column_type
+        )
+
+        clauses.append(clause)
+        parameters.extend(comparison_parameters)
+
+    return " AND ".join(clauses), parameters
+
+
+def _translate_operator(column, operator_symbol, operand, column_type=None):
+    if operator_symbol in SQL_OPERATORS:
+        clause = f"{column} {SQL_OPERATORS[operator_symbol]} ?"
+
+        # In pandas, missing values are different from any value
+        if operator_symbol == "!=":
+            clause = f"({clause} OR {column} IS NULL)"
+
+        return clause, [_parameter(operand, column_type)]
+
+    if operator_symbol in (OPERATOR_IN, OPERATOR_NOT_IN):
+        if isinstance(operand, (str, bytes)) or not hasattr(operand, "__iter__"):
+            operand = [operand]
+
+        # Missing values never match in SQL: they are compared with IS NULL (as isin)
+        missing = any(is_scalar(value) and isna(value) for value in operand)
+
+        # As isin, string constants are not parsed as dates
+        operand = [
+            _parameter(value)
+            for value in operand
+            if not (is_scalar(value) and isna(value))
+        ]
+        placeholders = ", ".join("?" * len(operand))
+
+        if operator_symbol == OPERATOR_IN:
+            if missing:
+                return f"({column} IN ({placeholders}) OR {column} IS NULL)", operand
+
+            return f"{column} IN ({placeholders})", operand
+
+        if missing:
+            return f"({column} NOT IN ({placeholders}) AND {column} IS NOT NULL)", operand
+
+        return f"({column} NOT IN ({placeholders}) OR {column} IS NULL)", operand
+
+    if operator_symbol == OPERATOR_BETWEEN:
+        lower, upper = operand
+
+        return f"{column} BETWEEN ? AND ?", [
+            _parameter(lower, column_type),
+            _parameter(upper, column_type),
+        ]
+
+    if operator_symbol in (OPERATOR_IS_NULL, OPERATOR_NOT_NULL):
+        is_null = bool(operand) == (operator_symbol == OPERATOR_IS_NULL)
+
+        return f"{column} IS {'' if is_null else 'NOT '}NULL", []
+
+    raise SQLiteFilterException(f"Operator {operator_symbol} not valid")
+
+
+def _translate_regex(column, value):
+    """
+    Anchored regular expression (as _RegexPredicate): literals as IN, prefixes as a range.
+    """
+    if EMPTY_TAG in value:
+        pattern = "^" + value.replace(EMPTY_TAG, EMPTY_PATTERN, 1) + "$"
+
+        return f"({column} REGEXP ? OR {column} IS NULL)", [pattern]
+
+    if not REGEX_METACHARACTERS.search(value):
+        # "$" also matches before a trailing new line
+        return f"{column} IN (?, ?)", [value, value + "\n"]
+
+    pattern = "^" + value + "$"
+
+    prefix = value[:-2]
+
+    if value.endswith(".*") and prefix and not REGEX_METACHARACTERS.search(prefix):
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+        return (
+            f"({column} >= ? AND {column} < ? AND {column} REGEXP ?)",
+            [prefix, upper, pattern],
+        )
+
+    return f"{column} REGEXP ?", [pattern]
+
+
+def _parameter(value, column_type=None):
+    """
+    Converts a constant to a SQLite parameter (dates as ISO strings, as stored by to_sql).
+
+    :param column_type: Declared type of the column compared with the constant
+    """
+    if column_type in DATETIME_TYPES + (DATE_TYPE,) and isinstance(value, (str, date)):
+        return _date_parameter(value, column_type)
+
+    if isinstance(value, (date, Timestamp)):
+        return str(Timestamp(value))
+
+    if hasattr(value, "item"):
+        # numpy scalars
+        return value.item()
+
+    return value
+
+
+def _date_parameter(value, column_type):
+    try:
+        value = Timestamp(value)
+
+    except ValueError:
+        raise _NotTranslatable()
+
+    if value is NaT:
+        raise _NotTranslatable()
+
+    if column_type == DATE_TYPE:
+        if value != value.normalize():
+            # Dates are stored without time: compared in pandas
+            raise _NotTranslatable()
+
+        return value.date().isoformat()
+
+    return str(value)
+
+
+def _quote(identifier):
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+@lru_cache(maxsize=REGEXP_CACHE_SIZE)
+def _compile_pattern(pattern):
+    return re.compile(pattern)
+
+
+def _regexp(pattern, value):
+    """
+    SQLite REGEXP function ("value REGEXP pattern" calls regexp(pattern, value)).
+    """
+    if value is None or not isinstance(value, str):
+        return False
+
+    return _compile_pattern(pattern).match(value) is not None
@@ -0,0 +1,218 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Column statistics catalog for DataFrames.
+
+For each column it provides (lazily, only when requested):
+
+- null_count: number of missing values
+- distinct_estimate: estimated number of distinct values (from a strided sample)
+- zone map (numeric and datetime columns): min / max of the column and min / max
+  of every block of block_size rows. Blocks without values have NaN / NaT
+  bounds, which never satisfy a comparison.
+
+The catalog is cached with the DataFrame (see dataframe_cache) so it is computed
+once per DataFrame version. The filter engine uses the zone maps to skip blocks
+(or return empty results) when a comparison value falls outside a block range.
+For DataFrames whose version is not tracked (see dataframe_cache) the engine
+only uses catalogs created explicitly with obtain_dataframe_statistics.
+"""
+import logging
+
+import numpy
+
+from pydatastudio.data.dataframe_cache import (
+    obtain_dataframe_cache,
+    peek_dataframe_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+STATISTICS_CACHE_KEY = "statistics"
+
+DEFAULT_BLOCK_SIZE = 16384
+DISTINCT_SAMPLE_SIZE = 4096
+
+# numpy dtype kinds with zone maps: bool, integer, unsigned, float and datetime
+ZONE_MAP_KINDS = "biufM"
+
+
+class ColumnStatistics(object):
+    """
+    Statistics of a DataFrame column. Every statistic is computed on first access.
+    """
+
+    def __init__(self, values, block_size):
+        self._values = values
+        self.block_size = block_size
+        self.size = len(values)
+
+        self._null_count = None
+        self._distinct_estimate = None
+        self._zone_map = None
+
+    @property
+    def null_count(self):
+        if self._null_count is None:
+            self._null_count = int(self._values.isna().sum())
+
+        return self._null_count
+
+    @property
+    def distinct_estimate(self):
+        if self._distinct_estimate is None:
+            self._distinct_estimate = self._estimate_distinct()
+
+        return self._distinct_estimate
+
+    @property
+    def has_zone_map(self):
+        dtype = self._values.dtype
+
+        return isinstance(dtype, numpy.dtype) and dtype.kind in ZONE_MAP_KINDS
+
+    @property
+    def min(self):
+        return self._obtain_zone_map()[0]
+
+    @property
+    def max(self):
+        return self._obtain_zone_map()[1]
+
+    @property
+    def block_min(self):
+        return self._obtain_zone_map()[2]
+
+    @property
+    def block_max(self):
+        return self._obtain_zone_map()[3]
+
+    def _estimate_distinct(self):
+        if self.size == 0:
+            return 0
+
+        step = max(1, self.size // DISTINCT_SAMPLE_SIZE)
+        sample = self._values.iloc[::step]
+
+        distinct = sample.nunique(dropna=False)
+
+        # Few distinct values in the sample: the sample is assumed to contain all of them
+        if distinct < len(sample) / 2:
+            return distinct
+
+        return min(self.size, int(distinct * self.size / len(sample)))
+
+    def _obtain_zone_map(self):
+        if self._zone_map is None:
+            if not self.has_zone_map:
+                self._zone_map = (None, None, None, None)
+
+            else:
+                self._zone_map = _compute_zone_map(
+                    self._values.to_numpy(), self.block_size
+                )
+
+        return self._zone_map
+
+    def __repr__(self):
+        return f"ColumnStatistics(size={self.size}, block_size={self.block_size})"
+
+
+class DataFrameStatistics(object):
+    """
+    Statistics catalog of a DataFrame. It should be obtained by means of obtain_dataframe_statistics.
+    """
+
+    def __init__(self, dataframe, block_size=DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self.size = dataframe.shape[0]
+        self.block_count = -(-self.size // block_size)
+
+        # Only the columns are kept (not the DataFrame) so the cache does not keep the DataFrame alive
+        self._sources = {key: dataframe[key] for key in dataframe.columns}
+        self._columns = {}
+
+    def column(self, key):
+        """
+        Returns the ColumnStatistics of column key (None if the column does not exist).
+        """
+        result = self._columns.get(key)
+
+        if result is None:
+            values = self._sources.get(key)
+
+            if values is None or values.ndim != 1:
+                return None
+
+            result = ColumnStatistics(values, self.block_size)
+            self._columns[key] = result
+
+        return result
+
+    def __repr__(self):
+        return f"DataFrameStatistics(size={self.size}, blocks={self.block_count})"
+
+
+def obtain_dataframe_statistics(dataframe, block_size=None):
+    """
+    Returns the statistics catalog of a DataFrame, cached with the DataFrame.
+
+    :param dataframe: DataFrame
+    :param block_size: Number of rows of the zone map blocks (DEFAULT_BLOCK_SIZE if None)
+    :return: Statistics catalog
+    :rtype: DataFrameStatistics
+    """
+    if block_size is None:
+        block_size = DEFAULT_BLOCK_SIZE
+
+    cache = obtain_dataframe_cache(dataframe)
+
+    result = cache.get(STATISTICS_CACHE_KEY)
+
+    if result is None or result.block_size != block_size:
+        logger.debug("Creating statistics catalog for dataframe %s", id(dataframe))
+
+        result = DataFrameStatistics(dataframe, block_size)
+        cache[STATISTICS_CACHE_KEY] = result
+
+    return result
+
+
+def peek_dataframe_statistics(dataframe):
+    """
+    Returns the statistics catalog of a DataFrame if it has been created for its current version, None otherwise.
+    """
+    cache = peek_dataframe_cache(dataframe)
+
+    if cache is None:
+        return None
+
+    return cache.get(STATISTICS_CACHE_KEY)
+
+
+def _compute_zone_map(values, block_size):
+    """
+    Returns (min, max, block_min, block_max) of a numeric or datetime numpy array.
+    """
+    starts = numpy.arange(0, len(values), block_size)
+
+    if len(values) == 0:
+        return (None, None, values[:0], values[:0])
+
+    if values.dtype.kind in "fM":
+        # fmin / fmax ignore NaN / NaT (blocks without values get NaN / NaT bounds)
+        block_min = numpy.fmin.reduceat(values, starts)
+        block_max = numpy.fmax.reduceat(values, starts)
+
+    else:
+        block_min = numpy.minimum.reduceat(values, starts)
+        block_max = numpy.maximum.reduceat(values, starts)
+
+    return (
+        numpy.fmin.reduce(block_min),
+        numpy.fmax.reduce(block_max),
+        block_min,
+        block_max,
+    )
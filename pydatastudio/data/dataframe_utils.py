@@ -3,170 +3,487 @@ Created on 30 mar. 2021
 
 @author: imoreno
 """
+from itertools import islice
+from pandas import concat, factorize
 from pandas.core.frame import DataFrame
-import logging
-import pandas
-from re import match
 from pandas.core.series import Series
-import traceback
+import logging
+
+import numpy
+
+from pydatastudio.data.dataframe_bitmap import BitmapMask
+from pydatastudio.data.dataframe_case_table import (
+    CaseTable,
+    CaseTableCache,
+    case_table_cache,
+)
+from pydatastudio.data.dataframe_filter_plan import (
+    FilterPlan,
+    compile_filter,
+    evaluate_filters,
+    vectorized_predicate,
+)
+from pydatastudio.data.dataframe_filter_profile import (
+    FilterProfile,
+    FilterProfiler,
+    filter_profiler,
+)
+from pydatastudio.data.dataframe_indexes import (
+    HASH_INDEX,
+    SORTED_INDEX,
+    create_dataframe_index,
+    drop_dataframe_indexes,
+)
+from pydatastudio.data.dataframe_join import (
+    MergeSpec,
+    merge_dataframes_asof,
+    merge_dataframes_by_interval,
+    merge_dataframes_by_spec,
+    semi_join_mask,
+)
+from pydatastudio.data.dataframe_mask_cache import (
+    FilterMaskCache,
+    filter_mask_cache,
+)
+from pydatastudio.data.dataframe_normalization import obtain_normalized_column
+from pydatastudio.data.dataframe_parallel import (
+    ParallelFilterExecutor,
+    obtain_parallel_executor,
+)
+from pydatastudio.data.dataframe_sheet import (
+    obtain_dataframe_from_rows,
+    obtain_dataframe_from_workbook,
+    strip_str_columns,
+)
+from pydatastudio.data.dataframe_sqlite import SQLiteFilterBackend, translate_filter
+from pydatastudio.data.dataframe_view import FilteredView
+from pydatastudio.data.dataframe_statistics import obtain_dataframe_statistics
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHUNK_ROWS = 100000
+
 
 def obtain_dataframe_from_sheet(ws, strip_str=True):
+    """
+    Returns the DataFrame of a worksheet (the first row is the header), built column by
+    column (see dataframe_sheet). To load a sheet from a file, obtain_dataframe_from_workbook
+    opens it in read-only mode and closes it afterwards.
+    """
+    dataframe = obtain_dataframe_from_rows(ws.values)
+
+    if strip_str:
+        strip_str_columns(dataframe)
+
+    return dataframe
+
+
+def obtain_dataframe_chunks_from_sheet(ws, chunk_size=DEFAULT_CHUNK_ROWS, strip_str=True):
+    """
+    Yields the rows of a worksheet as DataFrames of chunk_size rows (the first row is the header).
+
+    Only one chunk is kept in memory at once when ws is a read-only worksheet
+    (openpyxl.load_workbook(filename, read_only=True)). The index of each chunk
+    continues the index of the previous one, as in obtain_dataframe_from_sheet.
+
+    :param ws: Worksheet
+    :param chunk_size: Number of rows of each chunk
+    :param strip_str: Strip the str columns (see obtain_dataframe_from_sheet)
+    """
     data = ws.values
     columns = next(data)[0:]
 
-    dataframe = DataFrame(data, columns=columns)
+    start = 0
 
-    if strip_str:
-        for column in dataframe:
-            try:
-                idx = dataframe[column].first_valid_index()  # Will return None
-                first_valid_value = (
-                    dataframe[column].loc[idx] if idx is not None else None
-                )
+    while True:
+        rows = list(islice(data, chunk_size))
 
-                if first_valid_value and isinstance(first_valid_value, str):
-                    dataframe[column] = dataframe[column].str.strip()
-                    dataframe[column] = dataframe[column].str.replace("_x000D_", "")
-                    dataframe[column] = dataframe[column].str.replace("_x000A_", "")
+        if not rows:
+            break
 
-            except:
-                logger.error("Column %s is not str" % (column))
+        dataframe = obtain_dataframe_from_rows(rows, columns, start)
 
-    return dataframe
+        if strip_str:
+            strip_str_columns(dataframe)
+
+        start += len(rows)
+
+        yield dataframe
 
 
-def data_filter_by_dataframe(dataframe_filter, dataframe):
-    result = dataframe[data_selection_by_dataframe(dataframe_filter, dataframe)]
+def data_filter_by_dataframe(dataframe_filter, dataframe, parallel=False):
+    result = dataframe[data_selection_by_dataframe(dataframe_filter, dataframe, parallel)]
 
     return result
 
 
-def data_selection_by_dataframe(dataframe_filter, dataframe):
-    keys = list(dataframe_filter.columns.values)
+def data_selection_by_dataframe(dataframe_filter, dataframe, parallel=False):
+    """
+    Returns a numpy bool array with the rows of dataframe whose values in the columns of
+    dataframe_filter match any row of dataframe_filter.
+
+    It is evaluated as a hash semi-join (see dataframe_join.semi_join_mask): the keys of
+    dataframe_filter are hashed and dataframe is probed by chunks of rows.
+
+    :param dataframe_filter: DataFrame with the cases to be selected
+    :param parallel: If True, chunks of dataframe are probed by a pool of threads
+    """
+    return semi_join_mask(dataframe, dataframe_filter, parallel=parallel)
+
 
-    i1 = dataframe.set_index(keys).index
-    i2 = dataframe_filter.set_index(keys).index
+def data_filter_by_case_table(filename, dataframe, sheet=None, parallel=False):
+    """
+    Returns the rows of dataframe matching any case of a case table file.
 
-    return i1.isin(i2)
+    Each filled cell of a line of the sheet is an AND operand (column == value) and
+    the lines are ORed. The table is loaded once (cached by file modification time,
+    see case_table_cache) and evaluated as one hash semi-join per group of filled
+    columns, never as a list of dicts.
 
+    If dataframe is a FilteredView, the result is another (lazy) FilteredView.
 
-def data_filter_by_dict(data_filter, dataframe):
+    :param filename: Excel file with the cases (the first row is the header)
+    :param sheet: Sheet name (the active sheet if None)
+    :param parallel: If True, rows are probed by a pool of threads
+    """
+    cases = case_table_cache.load(filename, sheet)
+
+    if isinstance(dataframe, FilteredView):
+        mask = cases.mask(dataframe.base, dataframe.positions, parallel=parallel)
+
+        if dataframe.positions is None:
+            return FilteredView(dataframe.base, numpy.flatnonzero(mask))
+
+        return FilteredView(dataframe.base, dataframe.positions[mask])
+
+    return dataframe[cases.mask(dataframe, parallel=parallel)]
+
+
+def data_filter_by_dict(data_filter, dataframe, parallel=False):
     """
     Returns Data filtered by a dict or a list of dict.
 
     This dict will represent an AND of all pairs Key (column name) and value.
 
-    Each element of a list will represent an OR of all included dicts
+    Each element of a list will represent an OR of all included dicts. The OR is evaluated as a union
+    of masks, so the original index and row order are kept (and identical source rows are not collapsed).
+
+    Each dict value can be a regular expression to match, an equality expression (=), inequality expressions (<, >) or a callable function.
+
+    Each dict value can also be an operator dict. Several operators in the same dict are ANDed:
+
+        {"Currency": {"in": ["EUR", "USD", "GBP"]}}
+        {"Currency": {"not in": ["EUR"]}}
+        {"Amount": {"between": [100, 200]}}        (inclusive)
+        {"Amount": {">=": 100, "<": 200}}          (==, !=, <, <=, >, >=)
+        {"Description": {"is null": True}}
+        {"Description": {"not null": True}}
+
+    A key suffix selects a match mode for text columns (see dataframe_normalization):
+
+        {"Description~i": "acme.*"}                case-insensitive
+        {"Description~n": "acme corp"}             case-insensitive, stripped and whitespace collapsed
+
+    Callables are called once per row (with the row as only parameter), unless they are marked with
+    vectorized_predicate. Vectorized predicates are called once with the whole dataframe (or the column of the key)
+    and return a bool mask.
+
+    The filter is compiled once (see compile_filter) and applied as a single selection.
+    A FilterPlan already compiled can be provided in place of the dict.
+
+    When filter_mask_cache is enabled, masks of filters without callables are cached, so
+    applying the same filter to the same DataFrame again does not scan it.
+
+    If dataframe is a FilteredView, the result is another (lazy) FilteredView.
+
+    With parallel=True, large DataFrames are evaluated by row chunks in a pool of processes
+    (see dataframe_parallel).
+
+    :param data_filter: Data Filter
+    :type  data_filter: Dict, List or FilterPlan
+    :param parallel: Evaluate the filter by chunks in a process pool
+    """
+    if isinstance(data_filter, list) and not data_filter:
+        result = dataframe
+
+    elif isinstance(dataframe, FilteredView):
+        result = dataframe.filter(data_filter)
+
+    else:
+        result = dataframe.loc[filter_mask_cache.mask(data_filter, dataframe, parallel)]
+
+    return result
+
+
+def explain_filter_by_dict(data_filter, dataframe):
+    """
+    Evaluates a filter (without caches) and returns a FilterProfile with the evaluation path,
+    rows in / out and elapsed time of every atomic predicate. DataFrames are not rendered.
+
+    :param data_filter: Data Filter
+    :type  data_filter: Dict, List or FilterPlan
+    :param dataframe: DataFrame or FilteredView
+    :rtype: FilterProfile
+    """
+    plan = compile_filter(data_filter)
+
+    if isinstance(dataframe, FilteredView):
+        return plan.explain(dataframe.base, dataframe.positions)
+
+    return plan.explain(dataframe)
+
+
+def data_view_by_dict(data_filter, dataframe):
+    """
+    Returns a lazy FilteredView with the rows matching the filter. Rows are not copied
+    until the view is materialized (see FilteredView).
+
+    :param data_filter: Data Filter
+    :type  data_filter: Dict, List or FilterPlan
+    :param dataframe: DataFrame or FilteredView
+    """
+    if not isinstance(dataframe, FilteredView):
+        dataframe = FilteredView(dataframe)
+
+    return dataframe.filter(data_filter)
+
+
+def data_selection_by_dict(data_filter, dataframe, parallel=False):
+    """
+    Returns a bool Series (aligned with dataframe index) with the rows matching the filter.
+
+    :param data_filter: Data Filter
+    :type  data_filter: Dict, List or FilterPlan
+    :param parallel: Evaluate the filter by chunks in a process pool
+    """
+    mask = filter_mask_cache.mask(data_filter, dataframe, parallel)
+
+    return Series(mask, index=dataframe.index, copy=True)
+
+
+def stream_data_filter_by_dict(data_filter, chunks):
+    """
+    Yields the rows of each chunk matching the filter (chunks without matching rows are skipped).
+
+    The filter is compiled once and applied to each chunk with the same syntax as data_filter_by_dict,
+    so memory is bounded by the chunk size. Chunks can come from any iterator of DataFrames, e.g.:
+
+        pandas.read_csv(filename, chunksize=500000)
+        obtain_dataframe_chunks_from_sheet(load_workbook(filename, read_only=True)[sheet])
+
+    :param data_filter: Data Filter
+    :type  data_filter: Dict, List or FilterPlan
+    :param chunks: Iterable of DataFrames
+    """
+    plan = None
+
+    if not (isinstance(data_filter, list) and not data_filter):
+        plan = compile_filter(data_filter)
+
+    for chunk in chunks:
+        result = chunk if plan is None else plan.filter(chunk)
+
+        if not result.empty:
+            yield result
+
+
+def data_filter_by_dict_from_chunks(data_filter, chunks, ignore_index=False):
+    """
+    Returns a DataFrame with the rows of all the chunks matching the filter (see stream_data_filter_by_dict).
 
-    Each dict value can be a regular expression to match, an equality expression (=), inequality expressions (<, >) or a callable function with a dataframe as only parameter.
+    Only the matching rows of each chunk are kept, so peak memory is the size of the result plus one chunk.
 
     :param data_filter: Data Filter
-    :type  data_filter: Dict
+    :type  data_filter: Dict, List or FilterPlan
+    :param chunks: Iterable of DataFrames
+    :param ignore_index: If True, the result has a new RangeIndex
     """
-    result = dataframe
+    first = None
 
-    if isinstance(data_filter, list):
-        initial = True
-        for base_data_filter in data_filter:
-            if initial:
-                result = data_filter_by_dict(base_data_filter, dataframe)
-                initial = False
+    def keep_first(iterable):
+        nonlocal first
 
-            else:
-                result = pandas.concat(
-                    [result, data_filter_by_dict(base_data_filter, dataframe)],
-                    ignore_index=True,
-                )
-                result = result.drop_duplicates(ignore_index=True)
+        for chunk in iterable:
+            if first is None:
+                first = chunk.iloc[0:0]
+
+            yield chunk
+
+    results = list(stream_data_filter_by_dict(data_filter, keep_first(chunks)))
+
+    if results:
+        result = concat(results, ignore_index=ignore_index)
+
+    elif first is not None:
+        result = first
 
     else:
-        for key, value in data_filter.items():
-            logger.debug("Applying filter {}: {}".format(str(key), str(value)))
+        result = DataFrame()
 
-            current_filter = {key: value}
+    return result
 
-            selection = data_selection_by_dict(current_filter, result)
 
-            if selection is not None:
-                result = result[selection]
+def data_bitmap_by_dict(data_filter, dataframe):
+    """
+    Returns a BitmapMask (one bit per row) with the rows matching the filter.
 
-            logger.debug("Filtered data for {}: {}".format(str(key), str(result)))
+    It is meant to keep many filter results over the same DataFrame: they can be
+    combined with &, | and ~ and applied with dataframe.iloc[bitmap.to_positions()].
+
+    :param data_filter: Data Filter
+    :type  data_filter: Dict, List or FilterPlan
+    """
+    return BitmapMask.from_mask(filter_mask_cache.mask(data_filter, dataframe))
+
+
+def data_filter_by_dicts(data_filters, dataframe):
+    """
+    Returns a dict with the Data filtered by each one of a dict of named filters.
+
+    Atomic conditions repeated across the filters are evaluated only once (see evaluate_filters),
+    so filtering a whole set of goals / elements / outputs is much cheaper than calling
+    data_filter_by_dict for each one.
+
+    :param data_filters: Dict of name -> Data Filter (dict, list or FilterPlan)
+    :return: Dict of name -> DataFrame
+    """
+    masks = _obtain_masks(data_filters, dataframe)
+
+    return {
+        name: dataframe if mask is None else dataframe.loc[mask]
+        for name, mask in masks.items()
+    }
+
+
+def data_bitmap_by_dicts(data_filters, dataframe):
+    """
+    Returns a dict with the BitmapMask of each one of a dict of named filters
+    (see data_filter_by_dicts and data_bitmap_by_dict).
+
+    :param data_filters: Dict of name -> Data Filter (dict, list or FilterPlan)
+    :return: Dict of name -> BitmapMask
+    """
+    masks = _obtain_masks(data_filters, dataframe)
+
+    return {
+        name: BitmapMask.from_mask(
+            numpy.ones(dataframe.shape[0], dtype=bool) if mask is None else mask
+        )
+        for name, mask in masks.items()
+    }
+
+
+def _obtain_masks(data_filters, dataframe):
+    """
+    Returns the masks of a dict of named filters (None for the empty lists, which do not filter).
+    """
+    result = dict.fromkeys(data_filters)
+
+    masks = evaluate_filters(
+        {
+            name: data_filter
+            for name, data_filter in data_filters.items()
+            if not (isinstance(data_filter, list) and not data_filter)
+        },
+        dataframe,
+    )
+
+    result.update(masks)
 
     return result
 
 
-def data_selection_by_dict(data_filter, dataframe):
-    if isinstance(data_filter, list):
-        result = Series([False] * dataframe.shape[0], dataframe.index)
+def split_research_by(dataframe, levels, lazy=False, sort=True, dropna=True):
+    """
+    Splits a DataFrame into the nested dict of a research, one level per column:
+
+        split_research_by(data, ["Group", "Goal"])
 
-        for base_data_filter in data_filter:
-            result = result | data_selection_by_dict(base_data_filter, dataframe)
+        {"Group 1": {"Goal 1": DataFrame, "Goal 2": DataFrame}, "Group 2": {...}}
+
+    The split is done in a single pass: level columns are factorized into a single group
+    code per row, rows are ordered by group with a counting (radix) sort and the DataFrame
+    is taken once in that order, so every leaf is a slice (rows keep their original order
+    inside each leaf). Only existing combinations are included.
+
+    :param dataframe: DataFrame or FilteredView
+    :param levels: Column name or list of column names (one per level)
+    :param lazy: If True, leaves are FilteredViews (see dataframe_view) instead of DataFrames
+    :param sort: If True, keys of each level are sorted. Otherwise they keep the order of appearance
+    :param dropna: If True, rows with missing values in any level column are not included
+    :return: Nested dict with DataFrames (or FilteredViews) on the leaves
+    :rtype: dict
+    """
+    if isinstance(levels, str):
+        levels = [levels]
+
+    if not levels:
+        raise ValueError("At least one level is required to split a research")
+
+    if isinstance(dataframe, FilteredView):
+        base, positions = dataframe.base, dataframe.positions
 
     else:
-        index_name = dataframe.index.name
+        base, positions = dataframe, None
+
+    rows = numpy.arange(len(dataframe))
 
-        result = Series([True] * dataframe.shape[0], dataframe.index)
+    groups = numpy.zeros(len(rows), dtype=numpy.int64)
+    codes = []
+    keys = []
 
-        for key, value in data_filter.items():
-            try:
-                logger.debug("Selection {}: {}".format(str(key), str(value)))
+    for level in levels:
+        values = base[level] if positions is None else base[level].iloc[positions]
 
-                if not dataframe.empty:
-                    if callable(value):
-                        result = result & dataframe.apply(value, axis=1)
+        level_codes, uniques = factorize(values, sort=sort, use_na_sentinel=dropna)
 
-                    elif isinstance(value, str):
-                        if match("^[<>=]", str(value)):
-                            query_key = key
+        codes.append(level_codes)
+        keys.append(list(uniques))
 
-                            if " " in query_key:
-                                query_key = "`" + key + "`"
+        # Group codes are kept dense (and in level order) after each level
+        groups, _ = factorize(groups * (len(uniques) + 1) + level_codes + 1, sort=True)
 
-                            result = result & dataframe.eval(query_key + value)
+    if dropna:
+        selected = numpy.logical_and.reduce([level_codes >= 0 for level_codes in codes])
 
-                        else:
-                            # Included to manage exact match (if no specifically defined by regexp)
-                            value = "^" + value + "$"
+        if not selected.all():
+            rows = rows[selected]
+            groups, _ = factorize(groups[selected], sort=True)
 
-                            if key == index_name:
-                                result = result & dataframe.index.str.match(value)
+    # Group codes are dense: they are sorted as 16 bit integers (radix sort) when possible
+    group_count = int(groups.max()) + 1 if len(groups) else 0
+    dtype = numpy.uint16 if group_count <= numpy.iinfo(numpy.uint16).max else numpy.int64
 
-                            else:
-                                nan = False
+    rows = rows[numpy.argsort(groups.astype(dtype), kind="stable")]
 
-                                if "--EMPTY--" in value:
-                                    nan = True
+    bounds = numpy.zeros(group_count + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(groups, minlength=group_count), out=bounds[1:])
 
-                                value = value.replace("--EMPTY--", "^\\s+$", 1)
+    logger.debug("Splitting dataframe by %s in %s leaves", levels, group_count)
 
-                                result = result & dataframe[key].str.match(
-                                    value, na=nan
-                                )
+    first_rows = rows[bounds[:-1]]
 
-                    elif isinstance(value, list):
-                        result = result & data_selection_by_dict(value, dataframe)
+    if positions is not None:
+        rows = positions[rows]
 
-                    else:
-                        result = result & (dataframe[key] == value)
+    ordered = None if lazy else base.iloc[rows]
 
-                    logger.debug(
-                        "Filtered data for {}: {}".format(str(key), str(result))
-                    )
+    result = {}
 
-            except:
-                trace = traceback.print_exc()
+    for group, (start, stop) in enumerate(zip(bounds[:-1].tolist(), bounds[1:].tolist())):
+        if lazy:
+            leaf = FilteredView(base, rows[start:stop])
 
-                message = (
-                    f"Key {key} for filter {str(data_filter)} not valid. Trace: {trace}"
-                )
-                logger.error(message)
+        else:
+            leaf = ordered.iloc[start:stop]
 
-                result = Series([False] * dataframe.shape[0], dataframe.index)
+        node = result
+        first_row = first_rows[group]
 
-                raise Exception(message)
+        for level_keys, level_codes in zip(keys[:-1], codes[:-1]):
+            node = node.setdefault(level_keys[level_codes[first_row]], {})
+
+        node[keys[-1][codes[-1][first_row]]] = leaf
 
     return result
 
@@ -178,11 +495,17 @@ def merge_dataframes_by_function(first_dataframe, second_dataframe, merge_functi
     Args:
         first_dataframe (pandas.DataFrame): The first DataFrame.
         second_dataframe (pandas.DataFrame): The second DataFrame.
-        merge_function (callable): A custom function to apply to each row of the first DataFrame.
+        merge_function (callable or MergeSpec): A custom function to apply to each row of the first DataFrame.
 
     Returns:
         pandas.Series: The merged data.
+
+    A MergeSpec can be provided in place of the function: the merge is then evaluated as a join
+    (see merge_dataframes_by_spec), which is much faster than calling a function per row.
     """
+    if isinstance(merge_function, MergeSpec):
+        return merge_dataframes_by_spec(first_dataframe, second_dataframe, merge_function)
+
     logger.debug("Merging dataframes by function %s" % (str(merge_function)))
 
     result = first_dataframe.apply(
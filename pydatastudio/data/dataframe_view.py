@@ -0,0 +1,140 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+
+Lazy filtered views of DataFrames.
+
+A FilteredView keeps the base DataFrame and the positions of the selected rows.
+Filtering a view returns another view (only the selected rows are evaluated)
+and len, shape, empty, columns and index are obtained without copying data.
+The DataFrame is only materialized (once) when the data itself is needed:
+to_dataframe, column access or any other DataFrame attribute.
+
+E.g.:
+
+    view = data_view_by_dict({"Currency": "EUR"}, research)
+    view = view.filter({"Amount": "> 1000"})
+
+    len(view)                # no copy
+    view.to_dataframe()      # research.iloc[positions]
+
+Views are read-only: the base DataFrame should not be modified while views over it are alive.
+"""
+import logging
+
+import numpy
+
+from pydatastudio.data.dataframe_bitmap import BitmapMask
+from pydatastudio.data.dataframe_filter_plan import compile_filter
+
+logger = logging.getLogger(__name__)
+
+
+class FilteredView(object):
+    """
+    Rows of a base DataFrame selected by position, materialized on demand.
+    """
+
+    def __init__(self, base, positions=None):
+        """
+        :param base: Base DataFrame
+        :param positions: numpy array of (sorted) row positions of base. None for all the rows.
+        """
+        self.base = base
+        self.positions = positions
+        self._dataframe = None
+
+    @property
+    def shape(self):
+        return (len(self), self.base.shape[1])
+
+    @property
+    def empty(self):
+        return len(self) == 0 or self.base.shape[1] == 0
+
+    @property
+    def columns(self):
+        return self.base.columns
+
+    @property
+    def index(self):
+        if self.positions is None:
+            return self.base.index
+
+        return self.base.index[self.positions]
+
+    @property
+    def materialized(self):
+        return self._dataframe is not None
+
+    def filter(self, data_filter):
+        """
+        Returns a view with the rows of this view matching the filter (see data_filter_by_dict).
+        Only the rows of this view are evaluated.
+        """
+        if isinstance(data_filter, list) and not data_filter:
+            return self
+
+        mask = compile_filter(data_filter).mask(self.base, self.positions)
+
+        if self.positions is None:
+            positions = numpy.flatnonzero(mask)
+
+        else:
+            positions = self.positions[mask]
+
+        return FilteredView(self.base, positions)
+
+    def bitmap(self):
+        """
+        Returns the rows of the view as a BitmapMask over the base DataFrame.
+        """
+        if self.positions is None:
+            return ~BitmapMask.from_positions([], self.base.shape[0])
+
+        return BitmapMask.from_positions(self.positions, self.base.shape[0])
+
+    def to_dataframe(self):
+        """
+        Returns the rows of the view as a DataFrame (materialized only once).
+        """
+        if self._dataframe is None:
+            if self.positions is None:
+                self._dataframe = self.base
+
+            else:
+                logger.debug(
+                    "Materializing view of %s rows of dataframe %s", len(self), id(self.base)
+                )
+
+                self._dataframe = self.base.iloc[self.positions]
+
+        return self._dataframe
+
+    def __len__(self):
+        if self.positions is None:
+            return self.base.shape[0]
+
+        return len(self.positions)
+
+    def __getitem__(self, key):
+        return self.to_dataframe()[key]
+
+    def __getattr__(self, name):
+        # Any other DataFrame attribute materializes the view
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.to_dataframe(), name)
+
+    def __copy__(self):
+        return FilteredView(self.base, self.positions)
+
+    def __deepcopy__(self, memo):
+        # The base DataFrame is shared: views are read-only
+        return FilteredView(self.base, self.positions)
+
+    def __repr__(self):
+        return f"FilteredView(rows={len(self)}, base_rows={self.base.shape[0]})"
+
@@ -6,6 +6,12 @@ Created on 26 feb. 2021
 from pandas.core.frame import DataFrame
 import logging
 
+from pydatastudio.data.dataframe_cache import (
+    invalidate_dataframe_cache,
+    track_dataframe_version,
+)
+from pydatastudio.data.dataframe_view import FilteredView
+
 logger = logging.getLogger(__name__)
 
 def research_index_max_level (research, level = 0):     
@@ -27,8 +33,7 @@ def research_index_max_level (research, level = 0):
     '''
     if not isinstance(research, dict) or not research: 
         
-        logger.debug(f"Research: {research} has level 0")
-        logger.debug(f"Research type is: {type(research)}")
+        logger.debug("Research of type %s has level 0", type(research))
         
         return level 
     
@@ -39,6 +44,8 @@ def summary_research(research):
     '''
         Returns the number of rows of the dataframe in the 
         
+        Leaves can be DataFrames or FilteredViews (rows are counted without materializing them)
+        
         E.g.:
         
         Input:
@@ -104,5 +111,44 @@ def summary_research(research):
             result.update({key: summary_research(value)})                   
         
         
-    return result     
-    
\ No newline at end of file
+    return result
+
+
+def invalidate_research_caches(research):
+    '''
+        Drops the cached data (statistics, indexes, filter masks...) of every DataFrame of a research
+        (a DataFrame or a dict [of dicts ...] of DataFrames)
+    '''
+    if isinstance(research, DataFrame):
+        invalidate_dataframe_cache(research)
+
+    elif isinstance(research, dict):
+        for value in research.values():
+            invalidate_research_caches(value)
+
+
+def track_research_versions(research):
+    '''
+        Tracks the data version (see dataframe_cache.track_dataframe_version) of every DataFrame
+        of a research (a DataFrame or a dict [of dicts ...] of DataFrames)
+    '''
+    if isinstance(research, DataFrame):
+        track_dataframe_version(research)
+
+    elif isinstance(research, dict):
+        for value in research.values():
+            track_research_versions(value)
+
+
+def materialize_research(research):
+    '''
+        Returns the research (a DataFrame, a FilteredView or a dict [of dicts ...] of them)
+        with every FilteredView materialized as a DataFrame
+    '''
+    if isinstance(research, FilteredView):
+        return research.to_dataframe()
+
+    if isinstance(research, dict):
+        return {key: materialize_research(value) for key, value in research.items()}
+
+    return research
@@ -7,6 +7,10 @@ from abc import abstractmethod
 import logging
 
 from pydatastudio.data.studio.environment.data_studio_environment import DataStudioEnvironment
+from pydatastudio.data.studio.data_research_utils import (
+    invalidate_research_caches,
+    track_research_versions,
+)
 
 import traceback
 
@@ -47,7 +51,7 @@ class DataStudio():
         :param research_name: Name of the research to be added
         :param research: The research data to be added, should be a dictionary.
         """
-        self.knowledge[research_name] = research        
+        self._store_research(research_name, research)
 
     def add_students(self, students):
         """
@@ -106,11 +110,9 @@ class DataStudio():
 
             if not student_name is None:
                 try:
-                    self.knowledge.update(
-                        {
-                            research_name:
-                            self.students[student_name]._research(research_name, **attrs)
-                        }
+                    self._store_research(
+                        research_name,
+                        self.students[student_name]._research(research_name, **attrs)
                     )
 
                 except Exception as e:
@@ -124,10 +126,9 @@ class DataStudio():
                 for studio_student_name, studio_student in self.students.items():
                     try:
                         if studio_student._is_research_provided(research_name):
-                            self.knowledge.update({
-                                    research_name:
-                                    studio_student._research(research_name, **attrs)
-                                }
+                            self._store_research(
+                                research_name,
+                                studio_student._research(research_name, **attrs)
                             )
 
                             # only the first research is performed
@@ -158,9 +159,27 @@ class DataStudio():
         :param research: The research data to be added, should be a dictionary.
         :param **attrs: Additional attributes for the research
         """
-        self.knowledge[research_name] = research
+        self._store_research(research_name, research)
         self.research_finished(research_name, **attrs)
 
+    def _store_research(self, research_name, research):
+        """
+        Stores a research in the knowledge. If it replaces a previous research, the cached data
+        (indexes, statistics, filter masks...) of the replaced DataFrames is dropped and their
+        data version is bumped (the same DataFrames may be stored again after in-place modifications).
+
+        Stored DataFrames are tracked (see dataframe_cache.track_dataframe_version): derived data
+        is created automatically for them.
+        """
+        previous = self.knowledge.get(research_name)
+
+        self.knowledge[research_name] = research
+
+        if previous is not None:
+            invalidate_research_caches(previous)
+
+        track_research_versions(research)
+
     def research_finished(self, research_name, **attrs):
         if research_name in self.research_listeners:
             for listener in self.research_listeners[research_name]:
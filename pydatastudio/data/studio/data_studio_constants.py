@@ -24,4 +24,8 @@ ENVIRONMENT_FILTER_DATA_KEY = "data"
 ENVIRONMENT_LEVEL_KEY = "level"
 ENVIRONMENT_LEVELS_KEY = "levels"
 ENVIRONMENT_SUMMARY_KEY = "summary"
-ENVIRONMENT_DATABASE_KEY = "database"
\ No newline at end of file
+ENVIRONMENT_DATABASE_KEY = "database"
+ENVIRONMENT_FILTER_PARALLEL_KEY = "parallel"
+ENVIRONMENT_FILTER_PROFILE_KEY = "profile"
+ENVIRONMENT_TABLE_KEY = "table"
+ENVIRONMENT_INDEXES_KEY = "indexes"
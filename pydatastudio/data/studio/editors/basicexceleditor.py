@@ -28,6 +28,7 @@ from pydatastudio.data.studio.editors.editorconstants import (
     EXCEL_EDITOR_CONFIGURATION_FILTER_KEY,
 )
 from pydatastudio.data.studio.data_research_utils import research_index_max_level
+from pydatastudio.data.dataframe_view import FilteredView
 
 class BasicExcelEditor(AbstractResearchListener):
     """
@@ -185,10 +186,14 @@ class BasicExcelEditor(AbstractResearchListener):
                 **attrs,
             )
 
+            # Lazy views are materialized only when their data is saved
+            if isinstance(data, FilteredView):
+                data = data.to_dataframe()
+
             if isinstance(data, dict):
                 level_num = research_index_max_level(data)
 
-                self.logger.debug(f"Saving: {data}")
+                self.logger.debug("Saving: %s", list(data))
                 self.logger.debug(f"Level: {level_num}")
 
                 level = levels[
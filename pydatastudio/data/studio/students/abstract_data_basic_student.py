@@ -5,15 +5,20 @@ Created on 15 feb. 2021
 '''
 from typing import Any, Dict, List, Optional, Union
 
+import numpy
 import pandas as pd
 
+import os
 import re
 
 import logging
 from pydatastudio.data.studio.data_studio import AbstractStudent, ResearchNotFoundException, RequiredResearchNotFoundException
-from pydatastudio.data.studio.data_studio_constants import ENVIRONMENT_OUTPUT_FILTER_KEY, ENVIRONMENT_FILTER_DATA_KEY
+from pydatastudio.data.studio.data_studio_constants import ENVIRONMENT_OUTPUT_FILTER_KEY, ENVIRONMENT_FILTER_DATA_KEY, ENVIRONMENT_FILTER_PARALLEL_KEY, ENVIRONMENT_FILTER_PROFILE_KEY,\
+    ENVIRONMENT_INPUT_KEY, ENVIRONMENT_DATABASE_KEY, ENVIRONMENT_FILE_KEY, ENVIRONMENT_TABLE_KEY, ENVIRONMENT_INDEXES_KEY, ENVIRONMENT_FILTER_KEY,\
+    ENVIRONMENT_DIR_KEY, ENVIRONMENT_FILE_NAME_KEY, ENVIRONMENT_SHEET_NAME_KEY
     
-from pydatastudio.data.dataframe_utils import data_filter_by_dataframe, data_filter_by_dict
+from pydatastudio.data.dataframe_utils import data_filter_by_dataframe, data_filter_by_dict, data_filter_by_case_table, explain_filter_by_dict, filter_profiler, SQLiteFilterBackend
+from pydatastudio.data.dataframe_view import FilteredView
 
 class AbstractDataBasicStudent(AbstractStudent):
     '''
@@ -92,6 +97,11 @@ class AbstractDataBasicStudent(AbstractStudent):
             self.performance_logger.info(f"\n ----- STARTED-----\n Research: {research_name}\n Student: {self.name}\n\n -------------- ")
             
             research_method = getattr(self, research_method_name)            
+            
+            if self._has_database_input(research_name):
+                # Rows read from the database input are provided in the "database" attribute
+                attrs = dict(attrs, **{ENVIRONMENT_DATABASE_KEY: self._obtain_database_data(research_name)})
+            
             raw_result = research_method(research_name, **attrs)
                         
             self.performance_logger.info(f"\n ----- FINISHED -----\n Research: {research_name}\n Student: {self.name}\n\n -------------- ")
@@ -156,11 +166,30 @@ class AbstractDataBasicStudent(AbstractStudent):
                 Each field in each line will represent an AND operand.
                 Each file line will be included as an OR.
         
+        Lazy FilteredViews are filtered without being materialized.
+        
+        If the filter info includes "parallel: True", large DataFrames are filtered by chunks in a process pool.
+        
+        If the filter info includes "profile: True", the filter is explained (see explain_filter_by_dict) and
+        its profile is recorded in filter_profiler under the research name.
+        
+        File filters are defined by a path or by a dict with dir, name and sheet:
+        
+            output filter:
+                file:
+                    dir: ./filters
+                    name: cases.xlsx
+                    sheet: Cases
+        
+        The case table is loaded once (cached by file modification time) and applied as a hash
+        semi-join (see data_filter_by_case_table). Empty cells impose no condition.
+        If both kinds are defined, rows have to match both.
+        
         """
-        # Operate on a copy of the input results to avoid unexpected side effects
-        result = data.copy()
+        # Operate on a copy of the input results to avoid unexpected side effects (views are read-only)
+        result = data if isinstance(data, FilteredView) else data.copy()
                         
-        if isinstance(data, pd.DataFrame):
+        if isinstance(data, (pd.DataFrame, FilteredView)):
 
             self.performance_logger.info(f"\n ----- FILTER STARTED-----\n Research: {research_name}\n Student: {self.name}\n\n -------------- ")
                                  
@@ -169,7 +198,19 @@ class AbstractDataBasicStudent(AbstractStudent):
             if (filter_info is not None):                
                 if (ENVIRONMENT_FILTER_DATA_KEY in filter_info):
                     data_filter_info = filter_info[ENVIRONMENT_FILTER_DATA_KEY]
-                    filtered_df = data_filter_by_dict(data_filter_info, filtered_df)
+                    parallel = filter_info.get(ENVIRONMENT_FILTER_PARALLEL_KEY, False)
+                    
+                    if filter_info.get(ENVIRONMENT_FILTER_PROFILE_KEY, False):
+                        filtered_df = self._obtain_profiled_data(research_name, data_filter_info, filtered_df)
+                    
+                    else:
+                        filtered_df = data_filter_by_dict(data_filter_info, filtered_df, parallel)
+                
+                if (ENVIRONMENT_FILE_KEY in filter_info):
+                    filename, sheet = self._obtain_filter_file(filter_info[ENVIRONMENT_FILE_KEY])
+                    parallel = filter_info.get(ENVIRONMENT_FILTER_PARALLEL_KEY, False)
+                    
+                    filtered_df = data_filter_by_case_table(filename, filtered_df, sheet, parallel)
                     
                 result = filtered_df        
             
@@ -177,3 +218,83 @@ class AbstractDataBasicStudent(AbstractStudent):
             
         return result                                                                                           
     
+    def _obtain_filter_file(self, file_info: Union[str, Dict[str, Any]]) -> tuple:
+        """
+        Returns the path and the sheet (None for the active sheet) of a file filter.
+        """
+        if isinstance(file_info, str):
+            return file_info, None
+        
+        filename = os.path.join(file_info.get(ENVIRONMENT_DIR_KEY, ""), file_info[ENVIRONMENT_FILE_NAME_KEY])
+        
+        return filename, file_info.get(ENVIRONMENT_SHEET_NAME_KEY)
+    
+    def _obtain_profiled_data(self, research_name: str, data_filter: Any, data: Union[pd.DataFrame, FilteredView]) -> Union[pd.DataFrame, FilteredView]:
+        """
+        Filters data recording the profile of the filter in filter_profiler.
+        """
+        profile = explain_filter_by_dict(data_filter, data)
+        
+        # The row mask is not kept in filter_profiler (profiles are never discarded)
+        mask = profile.mask
+        profile.mask = None
+        
+        filter_profiler.add(research_name, profile)
+        
+        self.performance_logger.info("Filter profile of research %s:\n%s", research_name, profile.report())
+        
+        if isinstance(data, FilteredView):
+            positions = numpy.flatnonzero(mask) if data.positions is None else data.positions[mask]
+            
+            return FilteredView(data.base, positions)
+        
+        return data.loc[mask]
+
+    def _has_database_input(self, research_name: str) -> bool:
+        """
+        Checks if the input of a research is read from a database (see _obtain_database_data).
+        """
+        input_info = self.configuration.obtain_researches().get(research_name, {}).get(ENVIRONMENT_INPUT_KEY) or {}
+        
+        return ENVIRONMENT_DATABASE_KEY in input_info
+
+    def _obtain_database_data(self, research_name: str) -> pd.DataFrame:
+        """
+        Reads the input of a research from a SQLite database, filtering it in the database.
+        
+        Input configuration of the research:
+        
+            input:
+                database:
+                    file: extract.sqlite
+                    table: transactions
+                    indexes: [ISIN, Date]        (optional, created if they do not exist)
+                    filter: {ISIN: "ES.*"}       (optional, dict filter syntax)
+        
+        Only the rows matching the filter are read into pandas (see SQLiteFilterBackend).
+        
+        The rows are provided to the research method in the "database" attribute:
+        
+            def _research_transactions(self, research_name, **attrs):
+                transactions = attrs["database"]
+        
+        :param research_name: The name of the research.
+        :return: The rows of the table matching the filter.
+        """
+        input_info = self.configuration.obtain_researches().get(research_name, {}).get(ENVIRONMENT_INPUT_KEY) or {}
+        database_info = input_info.get(ENVIRONMENT_DATABASE_KEY)
+        
+        if database_info is None:
+            raise ValueError(f"Research {research_name} has no database input")
+        
+        table = database_info[ENVIRONMENT_TABLE_KEY]
+        
+        with SQLiteFilterBackend(database_info[ENVIRONMENT_FILE_KEY]) as backend:
+            if database_info.get(ENVIRONMENT_INDEXES_KEY):
+                backend.create_index(table, database_info[ENVIRONMENT_INDEXES_KEY])
+            
+            result = backend.filter(database_info.get(ENVIRONMENT_FILTER_KEY) or {}, table)
+        
+        self.logger.debug("Research %s: %s rows read from table %s", research_name, result.shape[0], table)
+        
+        return result
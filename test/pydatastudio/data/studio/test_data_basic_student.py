@@ -10,11 +10,15 @@ from yaml.loader import FullLoader
 import yaml
 
 import os
+import tempfile
 
 from pydatastudio.data.studio.students.abstract_data_basic_student import AbstractDataBasicStudent
 from pydatastudio import resources_manager
 from pydatastudio.data.studio.students.abstract_data_basic_student import AbstractDataBasicStudent, ResearchNotFoundException
-from pydatastudio.data.studio.data_studio_constants import ENVIRONMENT_OUTPUT_FILTER_KEY, ENVIRONMENT_FILTER_DATA_KEY, ENVIRONMENT_RESEARCHES_KEY, ENVIRONMENT_STUDENT_KEY, ENVIRONMENT_INPUT_KEY
+from pydatastudio.data.studio.data_studio_constants import ENVIRONMENT_OUTPUT_FILTER_KEY, ENVIRONMENT_FILTER_DATA_KEY, ENVIRONMENT_RESEARCHES_KEY, ENVIRONMENT_STUDENT_KEY, ENVIRONMENT_INPUT_KEY, ENVIRONMENT_FILTER_PROFILE_KEY,\
+    ENVIRONMENT_DATABASE_KEY, ENVIRONMENT_FILE_KEY, ENVIRONMENT_TABLE_KEY, ENVIRONMENT_INDEXES_KEY, ENVIRONMENT_FILTER_KEY,\
+    ENVIRONMENT_DIR_KEY, ENVIRONMENT_FILE_NAME_KEY, ENVIRONMENT_SHEET_NAME_KEY
+from pydatastudio.data.dataframe_utils import filter_profiler, SQLiteFilterBackend
 from pydatastudio.data.studio.students.data_student_configuration import DataStudentConfiguration
 
 import pandas as pd
@@ -196,6 +200,112 @@ class TestAbstractDataBasicStudent(unittest.TestCase):
         expected_df = pd.DataFrame({'col1': [1, 2, 3], 'col2': ['X', 'Y', 'Z']})
         pd.testing.assert_frame_equal(result, expected_df)
 
+    def test_research_with_profiled_output_filter(self):
+        def mock_test_profiled_research(self, research_name, **attrs):
+            return pd.DataFrame({'col1': ['1', '2', '3', '4'], 'col2': ['A', 'B', 'C', 'A']})
+
+        config_dict = {
+            ENVIRONMENT_STUDENT_KEY: "TestStudent",
+            ENVIRONMENT_RESEARCHES_KEY: {
+                "test_profiled_research": {
+                    ENVIRONMENT_OUTPUT_FILTER_KEY: {
+                        ENVIRONMENT_FILTER_DATA_KEY: {'col1': '^[13]$', 'col2': 'A'},
+                        ENVIRONMENT_FILTER_PROFILE_KEY: True
+                    }
+                }
+            }
+        }
+
+        self.student.configuration = DataStudentConfiguration(config_dict)
+        self.student._research_test_profiled_research = mock_test_profiled_research.__get__(self.student, AbstractDataBasicStudent)
+        self.student._join_studio(self.studio)
+
+        filter_profiler.clear()
+
+        result = self.student._research("test_profiled_research")
+
+        self.assertEqual(result['col1'].tolist(), ['1'])
+
+        summary = filter_profiler.summary()
+
+        self.assertEqual(set(summary['research']), {"test_profiled_research"})
+        self.assertEqual(sorted(summary['key']), ['col1', 'col2'])
+
+        # Row masks are not retained by the profiler
+        self.assertTrue(all(profile.mask is None for profile in filter_profiler.profiles["test_profiled_research"]))
+
+        filter_profiler.clear()
+
+    def test_research_with_database_input(self):
+        def mock_test_database_research(self, research_name, **attrs):
+            return attrs[ENVIRONMENT_DATABASE_KEY].assign(col3=lambda data: data['col1'] * 10)
+
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "extract.sqlite")
+
+            with SQLiteFilterBackend(database) as backend:
+                backend.store(pd.DataFrame({'col1': [1, 2, 3, 4], 'col2': ['A', 'B', 'C', 'A']}), "extract")
+
+            config_dict = {
+                ENVIRONMENT_STUDENT_KEY: "TestStudent",
+                ENVIRONMENT_RESEARCHES_KEY: {
+                    "test_database_research": {
+                        ENVIRONMENT_INPUT_KEY: {
+                            ENVIRONMENT_DATABASE_KEY: {
+                                ENVIRONMENT_FILE_KEY: database,
+                                ENVIRONMENT_TABLE_KEY: "extract",
+                                ENVIRONMENT_INDEXES_KEY: ["col2"],
+                                ENVIRONMENT_FILTER_KEY: {'col2': 'A', 'col1': '> 1'}
+                            }
+                        }
+                    }
+                }
+            }
+
+            self.student.configuration = DataStudentConfiguration(config_dict)
+            self.student._research_test_database_research = mock_test_database_research.__get__(self.student, AbstractDataBasicStudent)
+
+            result = self.student._research("test_database_research")
+
+        expected_df = pd.DataFrame({'col1': [4], 'col2': ['A'], 'col3': [40]})
+        pd.testing.assert_frame_equal(result, expected_df, check_dtype=False)
+
+        with self.assertRaises(ValueError):
+            self.student._obtain_database_data("test_unknown_research")
+
+    def test_research_with_output_file_filter(self):
+        def mock_test_file_research(self, research_name, **attrs):
+            return pd.DataFrame({'col1': ['1', '2', '3', '4'], 'col2': ['A', 'B', 'C', 'A']})
+
+        with tempfile.TemporaryDirectory() as directory:
+            pd.DataFrame({'col1': ['1', None, '3'], 'col2': ['A', 'B', 'A']}).to_excel(
+                os.path.join(directory, "cases.xlsx"), sheet_name="Cases", index=False)
+
+            config_dict = {
+                ENVIRONMENT_STUDENT_KEY: "TestStudent",
+                ENVIRONMENT_RESEARCHES_KEY: {
+                    "test_file_research": {
+                        ENVIRONMENT_OUTPUT_FILTER_KEY: {
+                            ENVIRONMENT_FILTER_DATA_KEY: {'col1': '[1-3]'},
+                            ENVIRONMENT_FILE_KEY: {
+                                ENVIRONMENT_DIR_KEY: directory,
+                                ENVIRONMENT_FILE_NAME_KEY: "cases.xlsx",
+                                ENVIRONMENT_SHEET_NAME_KEY: "Cases"
+                            }
+                        }
+                    }
+                }
+            }
+
+            self.student.configuration = DataStudentConfiguration(config_dict)
+            self.student._research_test_file_research = mock_test_file_research.__get__(self.student, AbstractDataBasicStudent)
+            self.student._join_studio(self.studio)
+
+            result = self.student._research("test_file_research")
+
+        # ('1', 'A') and ('2', 'B') match a case, ('4', 'A') is excluded by the data filter
+        self.assertEqual(result['col1'].tolist(), ['1', '2'])
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testJoinStudio']
     unittest.main()
\ No newline at end of file
@@ -10,6 +10,12 @@ from unittest.mock import patch, Mock
 
 import pandas as pd
 
+from pydatastudio.data.dataframe_cache import dataframe_version
+from pydatastudio.data.dataframe_statistics import (
+    obtain_dataframe_statistics,
+    peek_dataframe_statistics,
+)
+
 class TestDataStudio(unittest.TestCase):
 
     @patch('pydatastudio.data.studio.students.abstract_data_basic_student.AbstractDataBasicStudent')
@@ -56,6 +62,24 @@ class TestDataStudio(unittest.TestCase):
         self.assertEqual(self.studio.knowledge[research_name], updated_data)
         self.assertNotEqual(self.studio.knowledge[research_name], initial_data)
 
+    def test_add_studio_research_tracks_data_version(self):
+        research_name = "tracked_research"
+        data = pd.DataFrame({"col": [1, 2]})
+
+        self.studio.add_studio_research(research_name, {"data": data})
+
+        self.assertEqual(dataframe_version(data), 0)
+
+        statistics = obtain_dataframe_statistics(data)
+
+        # Stored again after an in-place modification
+        data.loc[0, "col"] = 10
+        self.studio.add_studio_research(research_name, {"data": data})
+
+        self.assertEqual(dataframe_version(data), 1)
+        self.assertIsNone(peek_dataframe_statistics(data))
+        self.assertIsNot(obtain_dataframe_statistics(data), statistics)
+
     def testResearchWithOneStudent(self):
         
         self.student_1._is_research_provided = Mock(return_value = False)
@@ -0,0 +1,105 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import unittest
+from unittest.mock import patch
+
+import numpy
+import pandas as pd
+
+from pydatastudio.data import dataframe_bitmap
+from pydatastudio.data.dataframe_bitmap import BitmapMask, BitmapMaskException
+from pydatastudio.data.dataframe_filter_plan import compile_filter, vectorized_predicate
+from pydatastudio.data.dataframe_manager import DataFrameManager
+from pydatastudio.data.dataframe_utils import data_bitmap_by_dict, data_filter_by_dict
+
+
+class TestBitmapMask(unittest.TestCase):
+    def setUp(self):
+        generator = numpy.random.default_rng(2)
+
+        self.first = generator.random(1003) > 0.5
+        self.second = generator.random(1003) > 0.3
+
+    def test_round_trip(self):
+        bitmap = BitmapMask.from_mask(self.first)
+
+        self.assertEqual(len(bitmap), 1003)
+        self.assertEqual(bitmap.nbytes, 126)
+        self.assertEqual(bitmap.to_mask().tolist(), self.first.tolist())
+        self.assertEqual(bitmap.to_positions().tolist(), numpy.flatnonzero(self.first).tolist())
+        self.assertEqual(bitmap.count(), int(self.first.sum()))
+
+    def test_count_without_bitwise_count(self):
+        bitmap = BitmapMask.from_mask(self.first)
+
+        # numpy < 2
+        with patch.object(dataframe_bitmap, "_bitwise_count", None):
+            self.assertEqual(bitmap.count(), int(self.first.sum()))
+            self.assertEqual((~bitmap).count(), 1003 - int(self.first.sum()))
+
+    def test_from_series_with_missing_values(self):
+        bitmap = BitmapMask.from_mask(pd.Series([True, None, False, True], dtype=object))
+
+        self.assertEqual(bitmap.to_mask().tolist(), [True, False, False, True])
+
+    def test_operations(self):
+        first = BitmapMask.from_mask(self.first)
+        second = BitmapMask.from_mask(self.second)
+
+        self.assertEqual((first & second).to_mask().tolist(), (self.first & self.second).tolist())
+        self.assertEqual((first | second).to_mask().tolist(), (self.first | self.second).tolist())
+        self.assertEqual((first ^ self.second).to_mask().tolist(), (self.first ^ self.second).tolist())
+        self.assertEqual((~first).to_mask().tolist(), (~self.first).tolist())
+        self.assertEqual((~first).count(), 1003 - first.count())
+
+    def test_different_sizes(self):
+        with self.assertRaises(BitmapMaskException):
+            BitmapMask.from_mask(self.first) & BitmapMask.from_mask(self.second[:10])
+
+    def test_compress(self):
+        mask = numpy.zeros(100000, dtype=bool)
+        mask[100:5000] = True
+        mask[70000:] = True
+
+        bitmap = BitmapMask.from_mask(mask)
+        compressed = bitmap.compress()
+
+        self.assertTrue(compressed.compressed)
+        self.assertEqual(compressed.nbytes, 16)
+        self.assertEqual(compressed.count(), bitmap.count())
+        self.assertEqual(compressed, bitmap)
+        self.assertEqual((compressed & ~bitmap).count(), 0)
+        self.assertEqual(compressed.decompress().to_mask().tolist(), mask.tolist())
+
+    def test_compress_random_mask_kept_packed(self):
+        bitmap = BitmapMask.from_mask(self.first)
+
+        self.assertIs(bitmap.compress(), bitmap)
+
+    def test_data_bitmap_by_dict(self):
+        data = pd.DataFrame({"Name": ["Alisa", "Bobby", "Cathrine", "Bobby"]})
+
+        bitmap = data_bitmap_by_dict({"Name": "Bobby"}, data)
+
+        self.assertEqual(bitmap.to_positions().tolist(), [1, 3])
+        self.assertEqual(compile_filter({"Name": "Bobby"}).bitmap(data), bitmap)
+
+    def test_predicates_returning_bitmap(self):
+        data = pd.DataFrame({"Score": [65, 42, 52, 78]}, index=[10, 11, 12, 13])
+
+        predicate = vectorized_predicate(lambda s: BitmapMask.from_mask(s > 60), on_column=True)
+
+        self.assertEqual(data_filter_by_dict({"Score": predicate}, data).index.tolist(), [10, 13])
+
+        result = DataFrameManager(data).obtain_filtered_data(
+            {"Callable": lambda df: BitmapMask.from_mask(df["Score"] < 60)}
+        )
+
+        self.assertEqual(result.index.tolist(), [11, 12])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from pydatastudio.data import dataframe_case_table
+from pydatastudio.data.dataframe_case_table import (
+    CaseTable,
+    CaseTableCache,
+    CaseTableException,
+)
+from pydatastudio.data.dataframe_utils import (
+    case_table_cache,
+    data_filter_by_case_table,
+    data_filter_by_dict,
+    data_view_by_dict,
+)
+
+
+class TestCaseTable(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "ISIN": ["ES001", "ES002", "FR001", "DE001", "ES001", None],
+                "Currency": ["EUR", "USD", "EUR", "EUR", "USD", "EUR"],
+                "Amount": [100, 200, 300, 400, 500, 600],
+            }
+        )
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "cases.xlsx")
+
+        case_table_cache.clear()
+
+    def tearDown(self):
+        case_table_cache.clear()
+        self.directory.cleanup()
+
+    def write_cases(self, cases, sheet="Cases"):
+        cases.to_excel(self.filename, sheet_name=sheet, index=False)
+
+    def test_mask(self):
+        cases = pd.DataFrame(
+            {
+                "ISIN": ["ES001", "FR001", None, "ES001"],
+                "Currency": ["EUR", None, "USD", "EUR"],
+            }
+        )
+
+        table = CaseTable(cases)
+
+        # (ISIN, Currency), (ISIN) and (Currency) groups
+        self.assertEqual(len(table.groups), 3)
+        self.assertEqual(table.keys, ["ISIN", "Currency"])
+
+        expected = data_filter_by_dict(
+            [
+                {"ISIN": "ES001", "Currency": "EUR"},
+                {"ISIN": "FR001"},
+                {"Currency": "USD"},
+            ],
+            self.data,
+        )
+
+        pd.testing.assert_frame_equal(table.filter(self.data), expected)
+
+    def test_empty_cases(self):
+        table = CaseTable(pd.DataFrame({"ISIN": [None, ""]}))
+
+        self.assertEqual(table.groups, [])
+        self.assertFalse(table.mask(self.data).any())
+
+    def test_missing_column(self):
+        table = CaseTable(pd.DataFrame({"Unknown": ["A"]}))
+
+        with self.assertRaises(CaseTableException):
+            table.mask(self.data)
+
+    def test_data_filter_by_case_table(self):
+        self.write_cases(pd.DataFrame({"ISIN": [" ES001 ", "DE001"], "Amount": [None, 400]}))
+
+        result = data_filter_by_case_table(self.filename, self.data, "Cases")
+
+        self.assertEqual(result.index.tolist(), [0, 3, 4])
+
+        view = data_view_by_dict({"Currency": "EUR"}, self.data)
+        result = data_filter_by_case_table(self.filename, view, "Cases")
+
+        self.assertEqual(result.index.tolist(), [0, 3])
+
+    def test_cache_by_modification_time(self):
+        self.write_cases(pd.DataFrame({"ISIN": ["ES001"]}))
+
+        with patch.object(
+            dataframe_case_table, "CaseTable", wraps=CaseTable
+        ) as compiled:
+            first = case_table_cache.load(self.filename, "Cases")
+            second = case_table_cache.load(self.filename, "Cases")
+
+            self.assertIs(first, second)
+            self.assertEqual(compiled.call_count, 1)
+
+            self.write_cases(pd.DataFrame({"ISIN": ["ES002", "FR001"]}))
+            status = os.stat(self.filename)
+            os.utime(self.filename, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+
+            third = case_table_cache.load(self.filename, "Cases")
+
+        self.assertIsNot(first, third)
+        self.assertEqual(len(third), 2)
+
+    def test_cache_size(self):
+        cache = CaseTableCache(max_size=1)
+
+        self.write_cases(pd.DataFrame({"ISIN": ["ES001"]}))
+
+        cache.load(self.filename, "Cases")
+        cache.load(self.filename)
+
+        self.assertEqual(len(cache), 1)
+
+    def test_invalid_file(self):
+        with self.assertRaises(CaseTableException):
+            case_table_cache.load(os.path.join(self.directory.name, "missing.xlsx"))
+
+        self.write_cases(pd.DataFrame({"ISIN": ["ES001"]}))
+
+        with self.assertRaises(CaseTableException):
+            case_table_cache.load(self.filename, "Unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,397 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy
+import pandas as pd
+
+from pydatastudio.data.dataframe_filter_plan import (
+    FilterException,
+    FilterPlan,
+    _MembershipPredicate,
+    compile_filter,
+    evaluate_filters,
+    is_vectorized_predicate,
+    vectorized_predicate,
+)
+from pydatastudio.data.dataframe_indexes import create_dataframe_index
+from pydatastudio.data.dataframe_manager import DataFrameManager
+from pydatastudio.data.dataframe_utils import data_view_by_dict, explain_filter_by_dict
+
+BASE_DATAFRAME = pd.DataFrame(
+    {
+        "Name": ["Alisa", "Bobby", "Cathrine", "Alisa", "Bobby", " "],
+        "Subject": [
+            "Mathematics",
+            "Mathematics",
+            "Science",
+            "Science",
+            "Science",
+            "Mathematics",
+        ],
+        "Score": [65, 42, 52, 78, 51, 87],
+        "Previous Score": [62, 47, 55, 74, 31, 77],
+        "Exam Date": [
+            datetime(2019, 1, 24),
+            datetime(2019, 1, 24),
+            datetime(2019, 1, 26),
+            datetime(2019, 5, 14),
+            datetime(2019, 5, 14),
+            datetime(2019, 5, 19),
+        ],
+    },
+    index=[10, 11, 12, 13, 14, 15],
+)
+
+
+class TestDataFrameFilterPlan(unittest.TestCase):
+    def setUp(self):
+        self.data = BASE_DATAFRAME
+
+    def test_compile_returns_plan(self):
+        plan = compile_filter({"Name": "Bobby"})
+
+        self.assertIsInstance(plan, FilterPlan)
+        self.assertIs(compile_filter(plan), plan)
+
+    def test_compile_is_cached(self):
+        self.assertIs(
+            compile_filter({"Name": "Bobby", "Score": "> 50"}),
+            compile_filter({"Name": "Bobby", "Score": "> 50"}),
+        )
+
+    def test_plan_is_immutable(self):
+        plan = compile_filter({"Name": "Bobby"})
+
+        with self.assertRaises(AttributeError):
+            plan._root = None
+
+    def test_mask_is_numpy_bool(self):
+        result = compile_filter({"Subject": "Science", "Score": "> 51"}).mask(self.data)
+
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.tolist(), [False, False, True, True, False, False])
+
+    def test_filter_keeps_index(self):
+        result = compile_filter({"Name": "Bob.*"}).filter(self.data)
+
+        self.assertEqual(result.index.tolist(), [11, 14])
+
+    def test_comparison_with_spaces_in_column(self):
+        result = compile_filter({"Previous Score": ">= 62"}).filter(self.data)
+
+        self.assertEqual(result.index.tolist(), [10, 13, 15])
+
+    def test_comparison_against_column_uses_expression(self):
+        result = compile_filter({"Score": "> `Previous Score`"}).filter(self.data)
+
+        self.assertEqual(result.index.tolist(), [10, 13, 14, 15])
+
+    def test_empty_tag(self):
+        result = compile_filter({"Name": "--EMPTY--"}).filter(self.data)
+
+        self.assertEqual(result.index.tolist(), [15])
+
+    def test_callable_only_sees_selected_rows(self):
+        seen = []
+
+        def check(row):
+            seen.append(row.name)
+            return row["Exam Date"] < datetime(2019, 5, 19)
+
+        result = compile_filter({"Name": "Bobby", "Callable": check}).filter(self.data)
+
+        self.assertEqual(seen, [11, 14])
+        self.assertEqual(result.index.tolist(), [11, 14])
+
+    def test_vectorized_frame_predicate(self):
+        calls = []
+
+        @vectorized_predicate
+        def before_may(df):
+            calls.append(len(df))
+            return df["Exam Date"] < datetime(2019, 5, 1)
+
+        result = compile_filter({"Callable": before_may}).filter(self.data)
+
+        self.assertTrue(is_vectorized_predicate(before_may))
+        self.assertEqual(calls, [6])
+        self.assertEqual(result.index.tolist(), [10, 11, 12])
+
+    def test_vectorized_column_predicate(self):
+        predicate = vectorized_predicate(lambda s: s.between(50, 70), on_column=True)
+
+        result = compile_filter({"Score": predicate}).filter(self.data)
+
+        self.assertEqual(result.index.tolist(), [10, 12, 14])
+
+    def test_vectorized_predicate_wrong_length(self):
+        predicate = vectorized_predicate(lambda df: [True])
+
+        with self.assertRaises(FilterException):
+            compile_filter({"Callable": predicate}).mask(self.data)
+
+    def test_vectorized_predicate_in_dataframe_manager(self):
+        predicate = vectorized_predicate(lambda s: s > 60, on_column=True)
+
+        result = DataFrameManager(self.data).obtain_filtered_data({"Score": predicate})
+
+        self.assertEqual(result.index.tolist(), [10, 13, 15])
+
+    def test_literal_regex_rewrite(self):
+        data = pd.DataFrame({"Currency": ["EUR", "USD", "EUR\n", "EURO", None]})
+
+        plan = compile_filter({"Currency": "EUR"})
+
+        self.assertEqual(plan.describe(), "(Currency in ['EUR'])")
+        self.assertEqual(plan.mask(data).tolist(), [True, False, True, False, False])
+
+    def test_prefix_regex_rewrite(self):
+        data = pd.DataFrame(
+            {"Code": ["ES01", "ES02\n", "ES0\n3", "FR01", None, "XES"] * 200}
+        )
+        data["Code"] = data["Code"] + pd.Series(range(len(data))).astype(str)
+        data.loc[1, "Code"] = "ES02\n"
+
+        plan = compile_filter({"Code": "ES.*"})
+        expected = data["Code"].str.match("^ES.*$", na=False).tolist()
+
+        self.assertEqual(plan.describe(), "(Code startswith 'ES')")
+        self.assertEqual(plan.mask(data).tolist(), expected)
+        self.assertTrue(expected[1])
+
+    def test_regex_per_unique_value(self):
+        data = pd.DataFrame({"Code": ["ES01", "FR01", "ES11", None] * 500})
+
+        result = compile_filter({"Code": "ES[0-9]1"}).mask(data)
+
+        self.assertEqual(result.tolist(), [True, False, True, False] * 500)
+
+    def test_regex_over_categorical(self):
+        data = pd.DataFrame(
+            {"Code": pd.Categorical(["ES01", "FR01", "ES11", None, "ES01"])}
+        )
+
+        result = compile_filter({"Code": "ES[0-9]1"}).mask(data)
+
+        self.assertEqual(result.tolist(), [True, False, True, False, True])
+
+    def test_regex_over_numeric_column(self):
+        with self.assertRaises(FilterException):
+            compile_filter({"Score": "65"}).mask(self.data)
+
+    def test_invalid_operator(self):
+        with self.assertRaises(FilterException):
+            compile_filter({"Score": {"like": 5}})
+
+    def test_operators_in_dataframe_manager(self):
+        result = DataFrameManager(self.data).obtain_filtered_data(
+            {"Name": {"in": ["Bobby", "Cathrine"]}}
+        )
+
+        self.assertEqual(result.index.tolist(), [11, 12, 14])
+
+    def test_date_comparison_parsed_once(self):
+        plan = compile_filter({"Exam Date": ">= '2019-01-26'"})
+
+        self.assertEqual(plan.filter(self.data).index.tolist(), [12, 13, 14, 15])
+        self.assertEqual(plan.filter(self.data.iloc[:3]).index.tolist(), [12])
+
+    def test_compound_comparison(self):
+        plan = compile_filter({"Score": "> 50 and < 70", "Previous Score": "!= 31"})
+
+        self.assertEqual(
+            plan.describe(), "(Score > 50 AND Score < 70 AND Previous Score != 31)"
+        )
+        self.assertEqual(plan.filter(self.data).index.tolist(), [10, 12])
+
+    def test_comparison_with_missing_values(self):
+        data = pd.DataFrame({"A": [1.0, None, 3.0]})
+
+        self.assertEqual(compile_filter({"A": "> 0"}).mask(data).tolist(), [True, False, True])
+        self.assertEqual(compile_filter({"A": "!= 1"}).mask(data).tolist(), [False, True, True])
+
+    def test_comparison_over_nullable_dtype(self):
+        data = pd.DataFrame({"A": pd.array([1, None, 3], dtype="Int64")})
+
+        self.assertEqual(compile_filter({"A": "> 1"}).mask(data).tolist(), [False, False, True])
+
+    def test_comparison_in_dataframe_manager(self):
+        result = DataFrameManager(self.data).obtain_filtered_data({"Previous Score": "> 70"})
+
+        self.assertEqual(result.index.tolist(), [13, 15])
+
+    def test_comparison_over_index_in_dataframe_manager(self):
+        data = pd.DataFrame({"A": [1, 2, 3]}, index=pd.Index([1, 2, 3], name="idx"))
+
+        result = DataFrameManager(data).obtain_filtered_data({"idx": "> 1"})
+
+        self.assertEqual(result.index.tolist(), [2, 3])
+
+    def test_comparison_over_index(self):
+        data = self.data.rename_axis("idx")
+
+        self.assertEqual(
+            compile_filter({"idx": "> 13"}).filter(data).index.tolist(), [14, 15]
+        )
+        self.assertEqual(
+            compile_filter({"idx": 11, "Score": "< 50"}).filter(data).index.tolist(), [11]
+        )
+        self.assertEqual(
+            compile_filter({"Subject": "Science", "idx": {"in": [10, 12, 14]}})
+            .filter(data)
+            .index.tolist(),
+            [12, 14],
+        )
+
+    def test_predicates_ordered_by_cost(self):
+        plan = compile_filter(
+            {"Callable": lambda row: True, "Name": "Bo.*y", "Subject": "Science"}
+        )
+
+        self.assertEqual(
+            plan.describe(),
+            "(Subject in ['Science'] AND Name matches '^Bo.*y$' AND Callable -> <lambda>(row))",
+        )
+
+    def test_short_circuit_when_empty(self):
+        calls = []
+
+        @vectorized_predicate
+        def count(df):
+            calls.append(len(df))
+            return numpy.ones(len(df), dtype=bool)
+
+        result = compile_filter({"Callable": count, "Name": "Nobody"}).mask(self.data)
+
+        self.assertFalse(result.any())
+        self.assertEqual(calls, [])
+
+    def test_later_predicates_see_selected_rows(self):
+        calls = []
+
+        @vectorized_predicate
+        def count(df):
+            calls.append(df.index.tolist())
+            return df["Score"] > 50
+
+        result = compile_filter({"Callable": count, "Name": "Cathrine"}).filter(self.data)
+
+        self.assertEqual(calls, [[12]])
+        self.assertEqual(result.index.tolist(), [12])
+
+    def test_narrowed_evaluation_matches_full_evaluation(self):
+        generator = numpy.random.default_rng(0)
+        data = pd.DataFrame(
+            {
+                "A": generator.integers(0, 10, 1000),
+                "B": generator.choice(["x", "y", "z"], 1000),
+                "C": generator.random(1000),
+            }
+        )
+
+        data_filter = [
+            {"A": {"in": [1, 2]}, "B": "x|y", "C": "> 0.5"},
+            {"A": 3, "C": {"between": [0.1, 0.2]}},
+        ]
+
+        expected = (
+            data["A"].isin([1, 2]) & data["B"].isin(["x", "y"]) & (data["C"] > 0.5)
+        ) | ((data["A"] == 3) & data["C"].between(0.1, 0.2))
+
+        self.assertEqual(compile_filter(data_filter).mask(data).tolist(), expected.tolist())
+
+    def test_evaluate_filters_shares_predicates(self):
+        generator = numpy.random.default_rng(3)
+        data = pd.DataFrame(
+            {
+                "Currency": generator.choice(["EUR", "USD", "GBP"], 2000),
+                "Amount": generator.normal(size=2000),
+                "Desk": generator.choice(["A1", "A2", "B1"], 2000),
+            }
+        )
+
+        data_filters = {
+            "eur": {"Currency": {"in": ["EUR"]}, "Amount": "> 0"},
+            "eur desk A": {"Currency": {"in": ["EUR"]}, "Desk": "A.*"},
+            "eur or usd": [{"Currency": {"in": ["EUR"]}}, {"Currency": "USD", "Amount": "> 0"}],
+            "callable": {"Currency": {"in": ["EUR"]}, "Callable": lambda row: row["Amount"] < 1},
+        }
+
+        expected = {
+            name: compile_filter(data_filter).mask(data).tolist()
+            for name, data_filter in data_filters.items()
+        }
+
+        evaluate = _MembershipPredicate.evaluate
+
+        with patch.object(
+            _MembershipPredicate, "evaluate", autospec=True, side_effect=evaluate
+        ) as membership:
+            result = evaluate_filters(data_filters, data)
+
+        self.assertEqual(membership.call_count, 1)
+        self.assertEqual({name: mask.tolist() for name, mask in result.items()}, expected)
+
+    def test_list_in_key(self):
+        data_filter = {
+            "Any": [{"Name": "Alisa"}, {"Subject": "Mathematics"}],
+            "Score": "< 70",
+        }
+
+        result = compile_filter(data_filter).filter(self.data)
+
+        self.assertEqual(result.index.tolist(), [10, 11])
+
+    def test_invalid_key(self):
+        with self.assertRaises(FilterException):
+            compile_filter({"Unknown": "A"}).mask(self.data)
+
+    def test_empty_dataframe(self):
+        result = compile_filter({"Unknown": "A"}).filter(self.data.iloc[0:0])
+
+        self.assertTrue(result.empty)
+
+    def test_explain(self):
+        data = self.data.copy()
+        create_dataframe_index(data, "Name")
+
+        data_filter = {"Name": "Bobby", "Score": "> 45", "Subject": "Sci.*"}
+
+        with patch.object(pd.DataFrame, "__repr__", side_effect=AssertionError("Rendered")):
+            profile = explain_filter_by_dict(data_filter, data)
+
+        numpy.testing.assert_array_equal(profile.mask, compile_filter(data_filter).mask(data))
+
+        self.assertEqual((profile.rows, profile.selected), (6, 1))
+        self.assertEqual([p.key for p in profile.predicates], ["Name", "Score", "Subject"])
+
+        name, score, subject = profile.predicates
+
+        self.assertEqual((name.path, name.rows_in, name.rows_out, name.rows_scanned), ("index", 6, 2, 0))
+        self.assertEqual((score.path, score.rows_in, score.rows_out), ("scan", 6, 5))
+
+        # Only the row still selected is evaluated by the last predicate
+        self.assertEqual((subject.rows_in, subject.rows_out), (1, 1))
+
+        report = profile.to_dataframe()
+
+        self.assertEqual(report["rows_out"].tolist(), [2, 5, 1])
+        self.assertIn("Subject startswith 'Sci'", profile.report())
+
+    def test_explain_view(self):
+        view = data_view_by_dict({"Subject": "Science"}, self.data)
+
+        profile = explain_filter_by_dict({"Score": "> 51"}, view)
+
+        self.assertEqual((profile.rows, profile.selected), (3, 2))
+        self.assertEqual(profile.predicates[0].rows_in, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import unittest
+from unittest.mock import patch
+
+import numpy
+import pandas as pd
+
+from pydatastudio.data import dataframe_filter_plan
+from pydatastudio.data.dataframe_cache import invalidate_dataframe_cache
+from pydatastudio.data.dataframe_indexes import (
+    HASH_INDEX,
+    SORTED_INDEX,
+    DataFrameIndexException,
+    create_dataframe_index,
+    drop_dataframe_indexes,
+    obtain_dataframe_index,
+)
+from pydatastudio.data.dataframe_filter_plan import compile_filter
+from pydatastudio.data.dataframe_mask_cache import filter_mask_cache
+from pydatastudio.data.dataframe_utils import data_filter_by_dict, data_view_by_dict
+from pydatastudio.data.studio.data_studio import DataStudio
+
+
+class TestDataFrameIndexes(unittest.TestCase):
+    def setUp(self):
+        generator = numpy.random.default_rng(1)
+
+        self.data = pd.DataFrame(
+            {
+                "ISIN": generator.choice(["ES01", "ES02", "FR01", None], 500),
+                "Amount": generator.normal(size=500),
+                "Date": pd.date_range("2020-01-01", periods=500, freq="D"),
+            }
+        )
+        self.data.loc[::7, "Amount"] = None
+
+    def test_hash_index_lookup(self):
+        index = create_dataframe_index(self.data, "ISIN")
+
+        expected = numpy.flatnonzero(self.data["ISIN"].isin(["ES01", "FR01"]))
+
+        self.assertEqual(index.lookup(["ES01", "FR01", "XX"]).tolist(), expected.tolist())
+        self.assertIs(obtain_dataframe_index(self.data, "ISIN", HASH_INDEX), index)
+
+    def test_sorted_index_range(self):
+        index = create_dataframe_index(self.data, "Amount", SORTED_INDEX)
+
+        start, stop = index.range_bounds(">=", -0.5)
+        start, stop = index.range_bounds("<", 0.5, start, stop)
+
+        expected = numpy.flatnonzero(self.data["Amount"].between(-0.5, 0.5, inclusive="left"))
+
+        self.assertEqual(index.lookup(start, stop).tolist(), expected.tolist())
+
+    def test_sorted_index_not_available_for_strings(self):
+        with self.assertRaises(DataFrameIndexException):
+            create_dataframe_index(self.data, "ISIN", SORTED_INDEX)
+
+    def test_filters_use_indexes(self):
+        data_filters = [
+            {"ISIN": "ES01"},
+            {"ISIN": {"in": ["ES02", "FR01"]}},
+            {"ISIN": {"not in": ["ES02"]}},
+            {"Amount": "> 0.3"},
+            {"Amount": {"between": [-1, 0]}, "ISIN": "ES0.*"},
+            {"Date": {">=": "2020-03-01", "<": "2020-04-01"}, "Amount": "!= 0"},
+        ]
+
+        expected = [data_filter_by_dict(f, self.data).index.tolist() for f in data_filters]
+
+        create_dataframe_index(self.data, "ISIN")
+        create_dataframe_index(self.data, ["Amount", "Date"], SORTED_INDEX)
+
+        with patch.object(
+            dataframe_filter_plan._ComparisonPredicate,
+            "evaluate",
+            side_effect=AssertionError("Index not used"),
+        ):
+            for data_filter, expected_index in zip(data_filters[:5], expected):
+                result = compile_filter(data_filter).filter(self.data).index.tolist()
+
+                self.assertEqual(result, expected_index, data_filter)
+
+        result = data_filter_by_dict(data_filters[5], self.data).index.tolist()
+
+        self.assertEqual(result, expected[5])
+
+    def test_membership_with_missing_values(self):
+        data_filters = [
+            {"ISIN": {"in": ["ES01", None]}},
+            {"ISIN": {"in": [numpy.nan]}},
+            {"ISIN": {"not in": [None]}},
+            {"ISIN": {"not in": ["ES01", None]}},
+            {"ISIN": {"in": ["ES01"]}},
+            {"ISIN": {"not in": ["ES01"]}},
+            {"ISIN": None},
+        ]
+
+        expected = [data_filter_by_dict(f, self.data).index.tolist() for f in data_filters]
+
+        create_dataframe_index(self.data, "ISIN")
+
+        for data_filter, expected_index in zip(data_filters, expected):
+            with self.subTest(data_filter=data_filter):
+                result = data_filter_by_dict(data_filter, self.data).index.tolist()
+
+                self.assertEqual(result, expected_index)
+
+        data = pd.DataFrame({"S": pd.Series(["EUR", None, "USD", None], dtype=object)})
+        create_dataframe_index(data, "S")
+
+        self.assertEqual(
+            data_filter_by_dict({"S": {"in": ["EUR", None]}}, data).index.tolist(), [0, 1, 3]
+        )
+        self.assertEqual(
+            data_filter_by_dict({"S": {"not in": [None]}}, data).index.tolist(), [0, 2]
+        )
+
+    def test_drop_indexes(self):
+        create_dataframe_index(self.data, "ISIN")
+
+        drop_dataframe_indexes(self.data)
+
+        self.assertIsNone(obtain_dataframe_index(self.data, "ISIN"))
+
+    def test_indexes_invalidated_when_research_replaced(self):
+        studio = DataStudio()
+        studio.add_studio_research("research", {"goal": self.data})
+
+        create_dataframe_index(self.data, "ISIN")
+
+        studio.add_studio_research("research", {"goal": self.data.copy()})
+
+        self.assertIsNone(obtain_dataframe_index(self.data, "ISIN"))
+
+    def test_sorted_columns_use_searchsorted(self):
+        index = create_dataframe_index(self.data, "Date", SORTED_INDEX)
+
+        # Already sorted: the column is used as it is
+        self.assertIsNone(index.positions)
+
+        data_filters = [
+            {"Date": {">=": "2020-03-01", "<": "2020-04-01"}},
+            {"Date": {"between": ["2020-02-01", "2020-02-10"]}},
+            {"Date": "> '2021-01-01'"},
+            {"Date": {"<": "2019-01-01"}},
+        ]
+
+        expected = [
+            self.data.index[
+                self.data.eval("Date " + condition).to_numpy()
+            ].tolist()
+            for condition in (
+                ">= '2020-03-01' and Date < '2020-04-01'",
+                ">= '2020-02-01' and Date <= '2020-02-10'",
+                "> '2021-01-01'",
+                "< '2019-01-01'",
+            )
+        ]
+
+        with patch.object(
+            dataframe_filter_plan._ComparisonPredicate,
+            "evaluate",
+            side_effect=AssertionError("Sorted column not used"),
+        ):
+            for data_filter, expected_index in zip(data_filters, expected):
+                result = compile_filter(data_filter).filter(self.data).index.tolist()
+
+                self.assertEqual(result, expected_index, data_filter)
+
+            # Views are sliced by row positions
+            view = data_view_by_dict({"ISIN": "ES01"}, self.data).filter(data_filters[0])
+
+        self.assertEqual(
+            view.index.tolist(),
+            [i for i in expected[0] if self.data.at[i, "ISIN"] == "ES01"],
+        )
+
+    def test_sorted_columns_not_indexed_implicitly(self):
+        data = pd.DataFrame({"x": numpy.arange(100000)})
+
+        enabled = filter_mask_cache.enabled
+        filter_mask_cache.enabled = False
+
+        try:
+            self.assertEqual(data_filter_by_dict({"x": "< 10"}, data).index.tolist(), list(range(10)))
+
+            self.assertIsNone(obtain_dataframe_index(data, "x", SORTED_INDEX))
+
+            data["x"] = numpy.arange(100000)[::-1]
+
+            self.assertEqual(
+                data_filter_by_dict({"x": "< 10"}, data).index.tolist(), list(range(99990, 100000))
+            )
+
+        finally:
+            filter_mask_cache.enabled = enabled
+
+    def test_sorted_columns_detected_in_tracked_dataframes(self):
+        data = pd.DataFrame(
+            {
+                "Date": pd.date_range("2020-01-01", periods=100000, freq="min"),
+                "Amount": numpy.arange(100000),
+            }
+        )
+
+        # Researches of the knowledge are tracked
+        studio = DataStudio()
+        studio.add_studio_research("transactions", data)
+
+        data_filter = {"Date": {">=": "2020-01-02", "<": "2020-01-03"}}
+
+        expected = numpy.flatnonzero(
+            (data["Date"] >= "2020-01-02") & (data["Date"] < "2020-01-03")
+        ).tolist()
+
+        with patch.object(
+            dataframe_filter_plan._ComparisonPredicate,
+            "evaluate",
+            side_effect=AssertionError("Sorted column not used"),
+        ):
+            result = data_filter_by_dict(data_filter, data)
+
+        self.assertEqual(result.index.tolist(), expected)
+        self.assertIsNone(obtain_dataframe_index(data, "Date", SORTED_INDEX))
+
+        # Stored again after an in-place modification: not sorted any more
+        data.loc[0, "Date"] = pd.Timestamp("2030-01-01")
+        studio.add_studio_research("transactions", data)
+
+        self.assertEqual(data_filter_by_dict({"Date": "> '2025-01-01'"}, data).index.tolist(), [0])
+
+    def test_sorted_index_dropped_on_modification(self):
+        create_dataframe_index(self.data, "Date", SORTED_INDEX)
+
+        self.data.loc[0, "Date"] = pd.Timestamp("2030-01-01")
+        invalidate_dataframe_cache(self.data)
+
+        self.assertIsNone(obtain_dataframe_index(self.data, "Date", SORTED_INDEX))
+
+        self.assertEqual(data_filter_by_dict({"Date": "> '2025-01-01'"}, self.data).index.tolist(), [0])
+
+        # Not sorted any more: positions are sorted by value
+        self.assertIsNotNone(create_dataframe_index(self.data, "Date", SORTED_INDEX).positions)
+
+if __name__ == "__main__":
+    unittest.main()
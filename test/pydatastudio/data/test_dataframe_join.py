@@ -0,0 +1,436 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import unittest
+from unittest.mock import patch
+
+import numpy
+import pandas as pd
+
+from pydatastudio.data import dataframe_join
+from pydatastudio.data.dataframe_join import (
+    DataFrameJoinException,
+    MergeSpec,
+    merge_dataframes_asof,
+    merge_dataframes_by_interval,
+    merge_dataframes_by_spec,
+    semi_join_mask,
+)
+from pydatastudio.data.dataframe_utils import merge_dataframes_by_function
+
+
+class TestSemiJoin(unittest.TestCase):
+    def setUp(self):
+        generator = numpy.random.default_rng(5)
+
+        self.data = pd.DataFrame(
+            {
+                "A": generator.integers(0, 20, 3000),
+                "B": generator.choice(["x", "y", None], 3000),
+                "C": generator.choice([1.5, 2.5, numpy.nan], 3000),
+                "D": generator.random(3000),
+            }
+        )
+
+        self.cases = self.data.sample(200, random_state=1)[["A", "B", "C"]]
+
+    def expected(self, dataframe_filter):
+        keys = list(dataframe_filter.columns)
+
+        return (
+            self.data.set_index(keys).index.isin(dataframe_filter.set_index(keys).index).tolist()
+        )
+
+    def test_matches_multiindex_isin(self):
+        result = semi_join_mask(self.data, self.cases, chunk_size=700)
+
+        self.assertEqual(result.tolist(), self.expected(self.cases))
+
+    def test_single_key(self):
+        cases = pd.DataFrame({"A": [1.0, 3.0, 50.0]})
+
+        result = semi_join_mask(self.data, cases)
+
+        self.assertEqual(result.tolist(), self.data["A"].isin([1, 3]).tolist())
+
+    def test_missing_values(self):
+        data = pd.DataFrame({"k": pd.Series(["a", None, "b"], dtype=object)})
+
+        result = semi_join_mask(data, pd.DataFrame({"k": ["a", None]}))
+
+        self.assertEqual(result.tolist(), [True, True, False])
+
+        result = semi_join_mask(data, pd.DataFrame({"k": ["a", "b"]}))
+
+        self.assertEqual(result.tolist(), [True, False, True])
+
+    def test_missing_values_multiple_keys(self):
+        data = pd.DataFrame(
+            {
+                "A": pd.Series(["x", None, "y", None, "x"], dtype=object),
+                "B": [1.0, 2.0, numpy.nan, numpy.nan, numpy.nan],
+            }
+        )
+        cases = pd.DataFrame({"A": ["x", None, None], "B": [numpy.nan, 2.0, None]})
+
+        result = semi_join_mask(data, cases)
+
+        self.assertEqual(result.tolist(), [False, True, False, True, True])
+
+        with patch.object(dataframe_join, "MAX_COMBINED_CODE", 2):
+            self.assertEqual(semi_join_mask(data, cases).tolist(), result.tolist())
+
+    def test_combined_codes_recoded_before_overflow(self):
+        with patch.object(dataframe_join, "MAX_COMBINED_CODE", 8):
+            result = semi_join_mask(self.data, self.cases)
+
+        self.assertEqual(result.tolist(), self.expected(self.cases))
+
+    def test_parallel(self):
+        result = semi_join_mask(self.data, self.cases, chunk_size=500, parallel=True)
+
+        self.assertEqual(result.tolist(), self.expected(self.cases))
+
+    def test_empty_and_invalid(self):
+        self.assertFalse(semi_join_mask(self.data, self.cases.iloc[0:0]).any())
+
+        with self.assertRaises(KeyError):
+            semi_join_mask(self.data, pd.DataFrame({"E": [1]}))
+
+        with self.assertRaises(DataFrameJoinException):
+            semi_join_mask(self.data, pd.DataFrame(index=[0]))
+
+
+
+class TestMergeSpec(unittest.TestCase):
+    def setUp(self):
+        self.positions = pd.DataFrame(
+            {
+                "ISIN": ["ES01", "ES01", "FR01", "DE01"],
+                "Date": pd.to_datetime(["2023-01-05", "2023-01-10", "2023-01-07", "2023-01-07"]),
+                "Quantity": [10, 20, 30, 40],
+            },
+            index=[100, 101, 102, 103],
+        )
+
+        self.prices = pd.DataFrame(
+            {
+                "ISIN": ["ES01", "ES01", "ES01", "FR01", "FR01"],
+                "Price Date": pd.to_datetime(
+                    ["2023-01-01", "2023-01-06", "2023-01-09", "2023-01-02", "2023-01-08"]
+                ),
+                "Price": [1.0, 2.0, 3.0, 10.0, 11.0],
+            }
+        )
+
+    def test_last_price_before_date(self):
+        spec = MergeSpec(
+            on="ISIN",
+            conditions=[("Date", ">=", "Price Date")],
+            columns=["Price"],
+            aggregation="last",
+        )
+
+        result = merge_dataframes_by_spec(self.positions, self.prices, spec, chunk_size=3)
+
+        self.assertEqual(result.index.tolist(), [100, 101, 102, 103])
+        self.assertEqual(result["Price"].tolist()[:3], [1.0, 3.0, 10.0])
+        self.assertTrue(numpy.isnan(result["Price"].iloc[3]))
+
+    def test_left_join_without_aggregation(self):
+        spec = MergeSpec(on="ISIN", columns=["Price"])
+
+        result = merge_dataframes_by_spec(self.positions, self.prices, spec)
+
+        self.assertEqual(result.index.tolist(), [100, 100, 100, 101, 101, 101, 102, 102, 103])
+        self.assertEqual(result["Price"].tolist()[:3], [1.0, 2.0, 3.0])
+        self.assertTrue(numpy.isnan(result["Price"].iloc[-1]))
+
+    def test_tolerance_and_suffix(self):
+        spec = MergeSpec(
+            on={"ISIN": "ISIN"},
+            tolerances={"Date": ("Price Date", pd.Timedelta(days=1))},
+            columns=["Price", "ISIN"],
+            aggregation={"Price": "max", "ISIN": "count"},
+        )
+
+        prices = self.prices.assign(ISIN=self.prices["ISIN"])
+
+        result = merge_dataframes_by_spec(self.positions, prices, spec)
+
+        self.assertEqual(result["Price"].tolist()[:3], [2.0, 3.0, 11.0])
+        self.assertEqual(result["ISIN_y"].tolist()[:3], [1, 1, 1])
+
+    def test_conditions_without_keys(self):
+        spec = MergeSpec(
+            conditions=[("Quantity", ">", "Price")], columns=["Price"], aggregation="count"
+        )
+
+        result = merge_dataframes_by_spec(self.positions, self.prices, spec, chunk_size=2)
+
+        self.assertEqual(result["Price"].tolist(), [3, 5, 5, 5])
+
+    def test_range_conditions_without_keys_match_cross_join(self):
+        generator = numpy.random.default_rng(11)
+
+        first = pd.DataFrame(
+            {
+                "Value": generator.integers(0, 50, 200).astype(float),
+                "Day": pd.Timestamp("2023-01-01") + pd.to_timedelta(generator.integers(0, 30, 200), "D"),
+            }
+        )
+        first.loc[::13, "Value"] = numpy.nan
+
+        second = pd.DataFrame(
+            {
+                "Limit": generator.integers(0, 50, 80).astype(float),
+                "Other": generator.integers(0, 50, 80).astype(float),
+                "Event": pd.Timestamp("2023-01-01") + pd.to_timedelta(generator.integers(0, 30, 80), "D"),
+                "Id": numpy.arange(80),
+            }
+        )
+        second.loc[::7, "Limit"] = numpy.nan
+
+        specs = [
+            {"conditions": [("Value", operator_symbol, "Limit")]}
+            for operator_symbol in ("==", "<", "<=", ">", ">=")
+        ]
+        specs += [
+            {"conditions": [("Value", "!=", "Other"), ("Value", ">", "Limit")]},
+            {"conditions": [("Value", "<", "Other")], "tolerances": {"Value": ("Limit", 2.5)}},
+            {"tolerances": {"Day": ("Event", pd.Timedelta(days=2))}},
+        ]
+
+        for attrs in specs:
+            with self.subTest(spec=attrs):
+                spec = MergeSpec(columns=["Id"], aggregation="count", **attrs)
+
+                pairs = first.reset_index().merge(second, how="cross")
+                selected = numpy.ones(pairs.shape[0], dtype=bool)
+
+                for first_column, operator_symbol, second_column in spec.conditions:
+                    selected &= dataframe_join._compare(
+                        pairs[first_column], operator_symbol, pairs[second_column]
+                    )
+
+                for first_column, (second_column, tolerance) in spec.tolerances.items():
+                    selected &= dataframe_join._compare(
+                        (pairs[first_column] - pairs[second_column]).abs(), "<=", tolerance
+                    )
+
+                expected = pairs[selected].groupby("index")["Id"].count()
+                expected = expected.reindex(first.index, fill_value=0)
+
+                with patch.object(pd.DataFrame, "merge", side_effect=AssertionError("merge")):
+                    result = merge_dataframes_by_spec(first, second, spec, chunk_size=64)
+
+                self.assertEqual(result["Id"].fillna(0).tolist(), expected.tolist())
+
+    def test_without_keys_nor_range_conditions(self):
+        for attrs in ({}, {"conditions": [("Quantity", "!=", "Price")]}):
+            with self.subTest(spec=attrs):
+                with self.assertRaises(DataFrameJoinException):
+                    merge_dataframes_by_spec(self.positions, self.prices, MergeSpec(**attrs))
+
+    def test_spec_in_function_api(self):
+        first = pd.DataFrame({"A": [1, 2, 3], "B": ["a", "b", "c"]})
+        second = pd.DataFrame({"C": [1, 3, 2], "D": ["x", "y", "z"]})
+
+        result = merge_dataframes_by_function(
+            first, second, MergeSpec(on={"A": "C"}, columns=["D"], aggregation="first")
+        )
+
+        self.assertEqual(result["D"].tolist(), ["x", "z", "y"])
+
+    def test_invalid_condition(self):
+        with self.assertRaises(DataFrameJoinException):
+            MergeSpec(on="ISIN", conditions=[("Date", "~", "Price Date")])
+
+
+class TestAsofMerge(unittest.TestCase):
+    def setUp(self):
+        generator = numpy.random.default_rng(7)
+
+        self.trades = pd.DataFrame(
+            {
+                "ISIN": generator.choice(["ES1", "ES2", "FR1"], 500),
+                "Date": pd.Timestamp("2026-01-01")
+                + pd.to_timedelta(generator.integers(0, 100, 500), unit="D"),
+            },
+            index=generator.permutation(500) + 1000,
+        )
+
+        self.prices = pd.DataFrame(
+            {
+                "ISIN": generator.choice(["ES1", "ES2", "IT1"], 200),
+                "Price Date": pd.Timestamp("2026-01-01")
+                + pd.to_timedelta(generator.integers(0, 100, 200), unit="D"),
+                "Price": numpy.arange(200, dtype=float),
+            }
+        )
+
+    def _expected(self, direction, allow_exact_matches=True, tolerance=None):
+        left = self.trades.reset_index().sort_values("Date", kind="stable")
+        right = self.prices.sort_values("Price Date", kind="stable")
+
+        expected = pd.merge_asof(
+            left,
+            right,
+            left_on="Date",
+            right_on="Price Date",
+            by="ISIN",
+            direction=direction,
+            allow_exact_matches=allow_exact_matches,
+            tolerance=tolerance,
+        )
+
+        return expected.set_index("index")["Price"].reindex(self.trades.index)
+
+    def test_directions_match_pandas(self):
+        for direction in ("backward", "forward", "nearest"):
+            result = merge_dataframes_asof(
+                self.trades,
+                self.prices,
+                on=("Date", "Price Date"),
+                by="ISIN",
+                direction=direction,
+                columns=["Price"],
+            )
+
+            self.assertTrue(result.index.equals(self.trades.index))
+
+            if direction == "nearest":
+                # Ties may be solved differently: compare the distances
+                chosen = self.prices["Price Date"].reindex(result["Price"])
+                expected = self.prices["Price Date"].reindex(self._expected(direction))
+
+                distance = (chosen.to_numpy() - self.trades["Date"].to_numpy())
+                expected_distance = expected.to_numpy() - self.trades["Date"].to_numpy()
+
+                numpy.testing.assert_array_equal(
+                    numpy.abs(distance), numpy.abs(expected_distance)
+                )
+
+            else:
+                pd.testing.assert_series_equal(
+                    result["Price"], self._expected(direction), check_names=False
+                )
+
+    def test_exact_matches_and_tolerance(self):
+        result = merge_dataframes_asof(
+            self.trades,
+            self.prices,
+            on=("Date", "Price Date"),
+            by="ISIN",
+            allow_exact_matches=False,
+            tolerance=pd.Timedelta("3D"),
+            columns=["Price"],
+        )
+
+        pd.testing.assert_series_equal(
+            result["Price"],
+            self._expected("backward", False, pd.Timedelta("3D")),
+            check_names=False,
+        )
+
+    def test_without_keys_and_suffix(self):
+        first = pd.DataFrame({"Value": [5, 1, 12, numpy.nan], "Rate": [0, 0, 0, 0]})
+        second = pd.DataFrame({"Value": [10, 0], "Rate": [2.0, 1.0]})
+
+        result = merge_dataframes_asof(first, second, on="Value")
+
+        self.assertEqual(result.columns.tolist(), ["Value", "Rate", "Rate_y"])
+        self.assertEqual(result["Rate_y"].tolist()[:3], [1.0, 1.0, 2.0])
+        self.assertTrue(numpy.isnan(result["Rate_y"].iloc[3]))
+
+    def test_invalid_direction(self):
+        with self.assertRaises(DataFrameJoinException):
+            merge_dataframes_asof(self.trades, self.prices, on="Date", direction="up")
+
+
+class TestIntervalMerge(unittest.TestCase):
+    def setUp(self):
+        self.amounts = pd.DataFrame(
+            {"Country": ["ES", "ES", "FR", "ES", "IT"], "Amount": [500, 20000, 700, 12450, 10]},
+            index=list("abcde"),
+        )
+
+        self.brackets = pd.DataFrame(
+            {
+                "Country": ["ES", "ES", "ES", "FR"],
+                "From": [0, 12450, 20200, 0],
+                "To": [12450, 20200, 35200, 10000],
+                "Rate": [0.19, 0.24, 0.30, 0.11],
+            }
+        )
+
+    def test_brackets(self):
+        result = merge_dataframes_by_interval(
+            self.amounts, self.brackets, "Amount", "From", "To", by="Country", closed="left"
+        )
+
+        self.assertEqual(result.index.tolist(), list("abcde"))
+        self.assertEqual(result["Rate"].tolist()[:4], [0.19, 0.24, 0.11, 0.24])
+        self.assertTrue(numpy.isnan(result["Rate"].iloc[4]))
+
+    def test_right_closed(self):
+        result = merge_dataframes_by_interval(
+            self.amounts, self.brackets, "Amount", "From", "To", by="Country", closed="right"
+        )
+
+        self.assertEqual(result["Rate"].iloc[3], 0.19)
+
+    def test_overlapping_intervals_as_join(self):
+        # With both bounds included, 12450 is contained in two brackets
+        result = merge_dataframes_by_interval(
+            self.amounts, self.brackets, "Amount", "From", "To", by="Country"
+        )
+
+        self.assertEqual(result.shape[0], 6)
+        self.assertEqual(result.loc["d", "Rate"].tolist(), [0.19, 0.24])
+
+    def test_overlapping_intervals_without_keys(self):
+        generator = numpy.random.default_rng(3)
+
+        values = pd.DataFrame({"Value": generator.integers(0, 100, 300).astype(float)})
+        values.loc[::17, "Value"] = numpy.nan
+
+        starts = generator.integers(0, 90, 40)
+        intervals = pd.DataFrame(
+            {
+                "From": starts,
+                "To": starts + generator.integers(0, 20, 40),
+                "Id": numpy.arange(40),
+            }
+        )
+
+        for closed in ("both", "left", "right", "neither"):
+            with self.subTest(closed=closed):
+                spec = MergeSpec(
+                    conditions=[
+                        ("Value", ">=" if closed in ("both", "left") else ">", "From"),
+                        ("Value", "<=" if closed in ("both", "right") else "<", "To"),
+                    ],
+                    columns=["Id"],
+                )
+
+                with patch.object(
+                    pd.DataFrame, "merge", side_effect=AssertionError("merge")
+                ):
+                    result = merge_dataframes_by_interval(
+                        values, intervals, "Value", "From", "To", closed=closed
+                    )
+
+                pd.testing.assert_frame_equal(
+                    result, merge_dataframes_by_spec(values, intervals, spec)
+                )
+
+    def test_invalid_closed(self):
+        with self.assertRaises(DataFrameJoinException):
+            merge_dataframes_by_interval(self.amounts, self.brackets, "Amount", "From", "To", closed="x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import gc
+import unittest
+
+import pandas as pd
+
+from pydatastudio.data.dataframe_cache import invalidate_dataframe_cache
+from pydatastudio.data.dataframe_filter_plan import compile_filter
+from pydatastudio.data.dataframe_mask_cache import (
+    FilterMaskCache,
+    canonical_filter,
+    filter_mask_cache,
+)
+from pydatastudio.data.dataframe_utils import data_filter_by_dict, data_selection_by_dict
+
+
+class TestFilterMaskCache(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "Name": ["Alisa", "Bobby", "Cathrine", "Bobby"],
+                "Score": [65, 42, 52, 78],
+            }
+        )
+
+        self.cache = FilterMaskCache()
+
+    def test_hit_and_miss(self):
+        first = self.cache.mask({"Name": "Bobby", "Score": "> 50"}, self.data)
+        second = self.cache.mask({"Score": "> 50", "Name": "Bobby"}, self.data)
+
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+        self.assertEqual(first.tolist(), [False, False, False, True])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_different_filters_and_dataframes(self):
+        self.cache.mask({"Name": "Bobby"}, self.data)
+        self.cache.mask({"Name": "Alisa"}, self.data)
+        self.cache.mask({"Name": "Bobby"}, self.data.copy())
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 3))
+
+    def test_callables_not_cached(self):
+        data_filter = {"Callable": lambda row: row["Score"] > 50}
+
+        self.assertIsNone(canonical_filter(data_filter))
+
+        self.cache.mask(data_filter, self.data)
+        self.cache.mask(data_filter, self.data)
+
+        self.assertEqual(self.cache.info()["entries"], 0)
+
+    def test_plan_is_cached(self):
+        plan = compile_filter([{"Name": "Alisa"}, {"Score": "< 50"}])
+
+        self.cache.mask(plan, self.data)
+        result = self.cache.mask(plan, self.data)
+
+        self.assertEqual(result.tolist(), [True, True, False, False])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_budget_evicts_least_recently_used(self):
+        self.cache.budget = 2 * len(self.data)
+
+        self.cache.mask({"Name": "Alisa"}, self.data)
+        self.cache.mask({"Name": "Bobby"}, self.data)
+        self.cache.mask({"Name": "Alisa"}, self.data)
+        self.cache.mask({"Name": "Cathrine"}, self.data)
+
+        info = self.cache.info()
+
+        self.assertEqual(info["evictions"], 1)
+        self.assertEqual(info["entries"], 2)
+        self.assertLessEqual(info["nbytes"], self.cache.budget)
+
+        self.cache.mask({"Name": "Alisa"}, self.data)
+        self.cache.mask({"Name": "Bobby"}, self.data)
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 4))
+
+    def test_masks_dropped_with_dataframe(self):
+        data = self.data.copy()
+
+        self.cache.mask({"Name": "Alisa"}, data)
+        invalidate_dataframe_cache(data)
+        gc.collect()
+
+        self.assertEqual(self.cache.info()["entries"], 0)
+        self.assertEqual(self.cache.nbytes, 0)
+
+        self.cache.mask({"Name": "Alisa"}, data)
+        del data
+        gc.collect()
+
+        self.assertEqual(self.cache.info()["entries"], 0)
+
+    def test_disabled(self):
+        cache = FilterMaskCache(enabled=False)
+
+        first = cache.mask({"Name": "Bobby"}, self.data)
+        second = cache.mask({"Name": "Bobby"}, self.data)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(cache.info()["entries"], 0)
+        self.assertFalse(filter_mask_cache.enabled)
+
+    def test_masks_dropped_on_modification(self):
+        data = pd.DataFrame({"A": [1, 2, 3]})
+
+        self.assertEqual(self.cache.mask({"A": 1}, data).tolist(), [True, False, False])
+
+        data.loc[0, "A"] = 5
+        invalidate_dataframe_cache(data)
+
+        self.assertEqual(self.cache.mask({"A": 1}, data).tolist(), [False, False, False])
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_dataframe_utils_use_cache(self):
+        data = pd.DataFrame({"A": [1, 2, 3]})
+
+        self.assertEqual(data_filter_by_dict({"A": 1}, data).index.tolist(), [0])
+
+        data.loc[0, "A"] = 5
+
+        self.assertTrue(data_filter_by_dict({"A": 1}, data).empty)
+
+        filter_mask_cache.enabled = True
+
+        try:
+            filtered = data_filter_by_dict({"Name": "Bobby"}, self.data)
+            selection = data_selection_by_dict({"Name": "Bobby"}, self.data)
+
+            selection[:] = False
+
+            self.assertEqual(filtered.index.tolist(), [1, 3])
+            self.assertEqual(
+                data_selection_by_dict({"Name": "Bobby"}, self.data).tolist(),
+                [False, True, False, True],
+            )
+
+            self.data.loc[3, "Name"] = "Alisa"
+            invalidate_dataframe_cache(self.data)
+
+            self.assertEqual(
+                data_filter_by_dict({"Name": "Bobby"}, self.data).index.tolist(), [1]
+            )
+
+        finally:
+            filter_mask_cache.enabled = False
+            filter_mask_cache.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from pydatastudio.data import dataframe_normalization
+from pydatastudio.data.dataframe_cache import track_dataframe_version
+from pydatastudio.data.dataframe_filter_plan import compile_filter
+from pydatastudio.data.dataframe_normalization import (
+    normalize_text,
+    obtain_normalized_column,
+    split_match_mode,
+)
+from pydatastudio.data.dataframe_utils import data_filter_by_dict
+
+
+class TestDataFrameNormalization(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "Description": [
+                    "ACME Corp",
+                    "  acme   corp ",
+                    "Acme Corporation",
+                    "Globex",
+                    None,
+                ],
+                "Amount": [1, 2, 3, 4, 5],
+            }
+        )
+
+    def test_split_match_mode(self):
+        self.assertEqual(split_match_mode("Description~i"), ("Description", "i"))
+        self.assertEqual(split_match_mode("Description~n"), ("Description", "n"))
+        self.assertEqual(split_match_mode("Description~x"), ("Description~x", None))
+        self.assertEqual(split_match_mode("Description"), ("Description", None))
+        self.assertEqual(split_match_mode(3), (3, None))
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text("  ACME \t Corp ", "n"), "acme corp")
+        self.assertEqual(normalize_text("  ACME Corp ", "i"), "  acme corp ")
+        self.assertEqual(normalize_text(10, "n"), 10)
+
+    def test_case_insensitive(self):
+        result = data_filter_by_dict({"Description~i": "acme corp"}, self.data)
+        self.assertEqual(result["Amount"].tolist(), [1])
+
+        result = data_filter_by_dict({"Description~i": "acme.*"}, self.data)
+        self.assertEqual(result["Amount"].tolist(), [1, 3])
+
+        result = data_filter_by_dict({"Description~i": "ACME CORP(ORATION)?"}, self.data)
+        self.assertEqual(result["Amount"].tolist(), [1, 3])
+
+    def test_normalized(self):
+        result = data_filter_by_dict({"Description~n": "ACME Corp"}, self.data)
+        self.assertEqual(result["Amount"].tolist(), [1, 2])
+
+        result = data_filter_by_dict(
+            {"Description~n": {"in": ["acme corp", "GLOBEX"]}}, self.data
+        )
+        self.assertEqual(result["Amount"].tolist(), [1, 2, 4])
+
+        result = data_filter_by_dict({"Description~n": "== 'globex'"}, self.data)
+        self.assertEqual(result["Amount"].tolist(), [4])
+
+    def test_normalized_constant(self):
+        for value in ("ACME  Corp", " acme corp ", "ACME\tCORP"):
+            with self.subTest(value=value):
+                result = data_filter_by_dict({"Description~n": value}, self.data)
+                self.assertEqual(result["Amount"].tolist(), [1, 2])
+
+        result = data_filter_by_dict({"Description~n": "  ACME   Corp.*"}, self.data)
+        self.assertEqual(result["Amount"].tolist(), [1, 2, 3])
+
+        result = data_filter_by_dict({"Description~n": "acme corp(oration)?"}, self.data)
+        self.assertEqual(result["Amount"].tolist(), [1, 2, 3])
+
+    def test_plain_key_is_case_sensitive(self):
+        result = data_filter_by_dict({"Description": "acme corp"}, self.data)
+
+        self.assertTrue(result.empty)
+
+    def test_normalized_column_cached(self):
+        track_dataframe_version(self.data)
+
+        with patch.object(
+            dataframe_normalization,
+            "_normalize_column",
+            wraps=dataframe_normalization._normalize_column,
+        ) as normalize:
+            compile_filter({"Description~n": "acme corp"}).mask(self.data)
+            compile_filter({"Description~n": "acme.*"}).mask(self.data)
+            compile_filter({"Description~n": {"in": ["globex"]}}).mask(self.data)
+
+        self.assertEqual(normalize.call_count, 1)
+
+        normalized = obtain_normalized_column(self.data, "Description", "n")
+
+        self.assertEqual(normalized.tolist()[:4], ["acme corp", "acme corp", "acme corporation", "globex"])
+        self.assertTrue(pd.isna(normalized.iloc[4]))
+
+    def test_non_text_column(self):
+        result = data_filter_by_dict({"Amount~i": 3}, self.data)
+
+        self.assertEqual(result["Amount"].tolist(), [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
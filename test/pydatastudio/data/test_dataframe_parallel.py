@@ -0,0 +1,74 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import unittest
+
+import numpy
+import pandas as pd
+
+from pydatastudio.data.dataframe_filter_plan import compile_filter
+from pydatastudio.data.dataframe_parallel import ParallelFilterExecutor
+from pydatastudio.data.dataframe_utils import data_filter_by_dict
+
+
+class TestParallelFilterExecutor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ParallelFilterExecutor(max_workers=2, min_rows=0, min_chunk_rows=300)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def setUp(self):
+        generator = numpy.random.default_rng(4)
+
+        self.data = pd.DataFrame(
+            {
+                "ISIN": generator.choice(["ES01", "ES02", "FR01", None], 1000),
+                "Amount": generator.normal(size=1000),
+                "Count": generator.integers(0, 10, 1000),
+                "Date": pd.date_range("2020-01-01", periods=1000, freq="D"),
+                "Desk": pd.Categorical(generator.choice(["A1", "B1"], 1000)),
+            },
+            index=pd.RangeIndex(1000, 2000, name="Id"),
+        )
+
+    def test_chunk_bounds(self):
+        self.assertEqual(self.executor.chunk_bounds(1000), [(0, 333), (333, 666), (666, 1000)])
+        self.assertEqual(ParallelFilterExecutor(max_workers=8).chunk_bounds(1000), [(0, 1000)])
+
+    def test_parallel_mask_matches_serial_mask(self):
+        data_filters = [
+            {"ISIN": "ES.*", "Amount": "> 0"},
+            {"Count": {"in": [1, 2, 3]}, "Desk": "A1"},
+            {"Date": {">=": "2021-01-01", "<": "2021-06-01"}},
+            [{"ISIN": {"is null": True}}, {"Amount": "< -1"}],
+        ]
+
+        for data_filter in data_filters:
+            expected = compile_filter(data_filter).mask(self.data)
+
+            result = self.executor.mask(data_filter, self.data)
+
+            self.assertEqual(result.tolist(), expected.tolist(), data_filter)
+
+    def test_not_picklable_filter_evaluated_serially(self):
+        data_filter = {"Callable": lambda row: row["Count"] > 5}
+
+        result = self.executor.mask(data_filter, self.data)
+
+        self.assertEqual(result.tolist(), (self.data["Count"] > 5).tolist())
+
+    def test_data_filter_by_dict_parallel(self):
+        result = data_filter_by_dict({"ISIN": "FR01"}, self.data, parallel=True)
+
+        self.assertEqual(
+            result.index.tolist(), self.data.index[self.data["ISIN"] == "FR01"].tolist()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,9 @@ import unittest
 from pydatastudio import resources_manager
 from pydatastudio.data.dataframe_query_manager import DataframeQueryManager,\
     SPECIFIC_FILTERS_KEY
+from pydatastudio.data.dataframe_utils import data_filter_by_dict
+
+import pandas as pd
 
 
 class TestDataFrameQuery(unittest.TestCase):    
@@ -120,6 +123,25 @@ class TestDataFrameQuery(unittest.TestCase):
             
             self.fail("No element in filter")
 
+    def testOperatorFilters(self):
+        query_info = {
+            "general": {"Currency": {"filter": {"currency": {"in": ["EUR", "USD"]}}, "scope": "all"}},
+            "detail": {
+                "goal": {
+                    "pre-filter": {},
+                    "specific filters": {"big": {"amount": {"between": [100, 200]}}},
+                }
+            },
+        }
+
+        data = pd.DataFrame({"currency": ["EUR", "GBP", "USD", "EUR"], "amount": [150, 150, 50, 200]})
+
+        element_filter = DataframeQueryManager(query_info).obtain_specific_filter("goal")["big"]["Currency"]
+
+        result = data_filter_by_dict(element_filter, data)
+
+        self.assertEqual(result.index.tolist(), [0, 3])
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
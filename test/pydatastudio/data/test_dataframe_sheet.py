@@ -0,0 +1,111 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import datetime
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from pydatastudio.data import dataframe_sheet
+from pydatastudio.data.dataframe_manager import DataFrameManager
+from pydatastudio.data.dataframe_sheet import (
+    obtain_dataframe_from_rows,
+    obtain_dataframe_from_workbook,
+)
+from pydatastudio.data.dataframe_utils import obtain_dataframe_from_sheet
+
+
+class TestDataFrameSheet(unittest.TestCase):
+    def setUp(self):
+        self.header = ("Id", "ISIN", "Date", "Amount", "Flag", "Mixed")
+        self.rows = [
+            (
+                i,
+                None if i % 4 == 0 else f" ES{i:03d}_x000D_",
+                datetime.datetime(2023, 1, 1 + i % 28) if i % 5 else None,
+                None if i % 3 == 0 else i * 10,
+                i % 2 == 0,
+                "a" if i % 7 == 0 else i,
+            )
+            for i in range(50)
+        ]
+
+    def test_same_dtypes_as_rows(self):
+        expected = pd.DataFrame(self.rows, columns=self.header)
+
+        for block_rows in (1, 3, 7, 1000):
+            with self.subTest(block_rows=block_rows):
+                result = obtain_dataframe_from_rows(
+                    [self.header] + self.rows, block_rows=block_rows
+                )
+
+                pd.testing.assert_frame_equal(result, expected)
+
+    def test_columns_and_start(self):
+        result = obtain_dataframe_from_rows([(1,), (2, 3), (4, 5, 6)], ["A", "B"], start=10)
+
+        self.assertEqual(list(result.columns), ["A", "B"])
+        self.assertEqual(result.index.tolist(), [10, 11, 12])
+        self.assertEqual(result["A"].tolist(), [1, 2, 4])
+        self.assertTrue(pd.isna(result["B"].iloc[0]))
+
+        empty = obtain_dataframe_from_rows([self.header])
+
+        self.assertEqual(list(empty.columns), list(self.header))
+        self.assertTrue(empty.empty)
+
+        self.assertTrue(obtain_dataframe_from_rows([]).empty)
+
+    def test_obtain_dataframe_from_workbook(self):
+        workbook = Workbook()
+        workbook.active.title = "Other"
+        sheet = workbook.create_sheet("Data")
+        sheet.append(self.header)
+
+        for row in self.rows:
+            sheet.append(row)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.xlsx")
+            workbook.save(filename)
+
+            expected = obtain_dataframe_from_sheet(load_workbook(filename)["Data"])
+
+            with patch.object(
+                dataframe_sheet, "load_workbook", wraps=load_workbook
+            ) as load:
+                result = obtain_dataframe_from_workbook(filename, "Data", block_rows=8)
+
+                load.assert_called_once_with(filename, read_only=True, data_only=True)
+
+                with self.assertRaises(KeyError):
+                    obtain_dataframe_from_workbook(filename, "Unknown")
+
+            manager = DataFrameManager.obtain_dataframe_manager_from_workbook(
+                filename, "Data", strip_str=True
+            )
+
+        pd.testing.assert_frame_equal(result, expected)
+        pd.testing.assert_frame_equal(manager.dataframe, expected)
+
+        self.assertEqual(result["ISIN"].iloc[1], "ES001")
+
+    def test_workbook_closed(self):
+        with patch.object(dataframe_sheet, "load_workbook") as load:
+            workbook = load.return_value
+            workbook.__getitem__.side_effect = KeyError("Unknown")
+
+            with self.assertRaises(KeyError):
+                obtain_dataframe_from_workbook("data.xlsx", "Unknown")
+
+            workbook.close.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import unittest
+from datetime import date
+
+import pandas as pd
+
+from pydatastudio.data.dataframe_sqlite import (
+    SQLiteFilterBackend,
+    SQLiteFilterException,
+    translate_filter,
+)
+from pydatastudio.data.dataframe_utils import data_filter_by_dict
+
+
+class TestSQLiteFilterBackend(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "ISIN": ["ES001", "ES002", "FR001", None, "DE001", "ES003"],
+                "Amount": [100.0, 2000.0, 300.0, None, 5000.0, 1500.0],
+                "Date": pd.to_datetime(
+                    [
+                        "2023-01-01",
+                        "2023-02-01",
+                        "2023-03-01",
+                        "2023-04-01",
+                        "2023-05-01",
+                        "2023-06-01",
+                    ]
+                ),
+            }
+        )
+
+        self.backend = SQLiteFilterBackend()
+        self.backend.store(self.data, "transactions", indexes=["ISIN"])
+
+    def tearDown(self):
+        self.backend.close()
+
+    def assert_same_rows(self, data_filter):
+        result = self.backend.filter(data_filter, "transactions", parse_dates=["Date"])
+        expected = data_filter_by_dict(data_filter, self.data).reset_index(drop=True)
+
+        # Missing text is read back from SQLite as None
+        pd.testing.assert_frame_equal(
+            result.astype(object).where(result.notna(), None),
+            expected.astype(object).where(expected.notna(), None),
+        )
+
+    def test_filter(self):
+        filters = [
+            {"ISIN": "ES002"},
+            {"ISIN": "ES.*"},
+            {"ISIN": "(ES|FR)00[12]"},
+            {"ISIN": "--EMPTY--"},
+            {"Amount": "> 1000"},
+            {"Amount": "> 200 and <= 2000"},
+            {"Amount": {"!=": 300}},
+            {"Amount": {"between": [300, 2000]}},
+            {"ISIN": {"in": ["ES001", "DE001"]}},
+            {"ISIN": {"not in": ["ES001"]}},
+            {"ISIN": {"not null": True}},
+            {"Date": {">=": pd.Timestamp("2023-03-01")}},
+            {"ISIN": "ES.*", "Amount": "> 1000"},
+            [{"ISIN": "FR001"}, {"Amount": {">=": 5000}}],
+            {"ISIN": [{"ISIN": "FR.*"}, {"ISIN": "DE.*"}]},
+        ]
+
+        for data_filter in filters:
+            with self.subTest(data_filter=data_filter):
+                self.assert_same_rows(data_filter)
+
+    def test_membership_with_missing_values(self):
+        filters = [
+            {"ISIN": {"in": ["ES001", None]}},
+            {"ISIN": {"in": [None]}},
+            {"ISIN": {"not in": ["ES001", None]}},
+            {"ISIN": {"not in": [None]}},
+            {"Amount": {"in": [100.0, float("nan")]}},
+            {"Amount": {"not in": [100.0, float("nan")]}},
+        ]
+
+        for data_filter in filters:
+            with self.subTest(data_filter=data_filter):
+                self.assert_same_rows(data_filter)
+
+    def test_date_strings(self):
+        filters = [
+            {"Date": "> '2023-01-01'"},
+            {"Date": "<= '2023-03-01'"},
+            {"Date": "== '2023-02-01'"},
+            {"Date": "> '2023-01-01' and < '2023-04-01'"},
+            {"Date": {"between": ["2023-01-01", "2023-02-01"]}},
+            {"Date": {"!=": "2023-02-01"}},
+            {"Date": {">=": "2023-03-01 12:00"}},
+            {"Date": {"in": ["2023-01-01"]}},
+            [{"Date": "< '2023-02-01'"}, {"ISIN": "DE001"}],
+        ]
+
+        for data_filter in filters:
+            with self.subTest(data_filter=data_filter):
+                self.assert_same_rows(data_filter)
+
+        where, parameters, _ = translate_filter(
+            {"Date": "> '2023-01-01'"}, column_types={"Date": "TIMESTAMP"}
+        )
+
+        self.assertEqual(parameters, ["2023-01-01 00:00:00"])
+
+    def test_date_column(self):
+        data = pd.DataFrame({"Day": [date(2023, 1, 1), date(2023, 2, 1), date(2023, 3, 1)]})
+
+        self.backend.store(data, "days")
+
+        result = self.backend.filter({"Day": {"between": ["2023-01-01", "2023-02-01"]}}, "days")
+
+        self.assertEqual(result["Day"].tolist(), ["2023-01-01", "2023-02-01"])
+
+        # Dates with time are compared in pandas
+        _, _, residual = translate_filter(
+            {"Day": "> '2023-01-01 12:00'"}, column_types={"Day": "DATE"}
+        )
+
+        self.assertEqual(list(residual), ["Day"])
+
+    def test_residual_filter(self):
+        data_filter = {"ISIN": "ES.*", "Amount": lambda row: row["Amount"] > 1000}
+
+        where, _, residual = translate_filter(data_filter)
+
+        self.assertNotIn("Amount", where)
+        self.assertEqual(list(residual), ["Amount"])
+
+        self.assert_same_rows(data_filter)
+
+    def test_translate_filter(self):
+        where, parameters, residual = translate_filter({"ISIN": "ES.*", "Amount": "> 1000"})
+
+        self.assertEqual(
+            where,
+            '("ISIN" >= ? AND "ISIN" < ? AND "ISIN" REGEXP ?) AND "Amount" > ?',
+        )
+        self.assertEqual(parameters, ["ES", "ET", "^ES.*$", 1000])
+        self.assertEqual(residual, {})
+
+    def test_index_used(self):
+        where, parameters, _ = translate_filter({"ISIN": "ES.*"})
+
+        plan = self.backend.connection.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM transactions WHERE {where}", parameters
+        ).fetchall()
+
+        self.assertIn("ix_transactions_ISIN", str(plan))
+
+    def test_columns_and_count(self):
+        result = self.backend.filter({"ISIN": "ES.*"}, "transactions", columns=["ISIN"])
+
+        self.assertEqual(list(result.columns), ["ISIN"])
+        self.assertEqual(result["ISIN"].tolist(), ["ES001", "ES002", "ES003"])
+        self.assertEqual(self.backend.count({"ISIN": "ES.*"}, "transactions"), 3)
+
+    def test_invalid_filter(self):
+        with self.assertRaises(SQLiteFilterException):
+            self.backend.filter({"Unknown": 1}, "transactions")
+
+        with self.assertRaises(SQLiteFilterException):
+            self.backend.filter({"Amount": {"like": 1}}, "transactions")
+
+
+if __name__ == "__main__":
+    unittest.main()
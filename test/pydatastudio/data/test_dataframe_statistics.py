@@ -0,0 +1,202 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import gc
+import unittest
+from unittest.mock import patch
+
+import numpy
+import pandas as pd
+
+from pydatastudio.data import dataframe_cache, dataframe_filter_plan
+from pydatastudio.data.dataframe_cache import (
+    dataframe_version,
+    invalidate_dataframe_cache,
+    track_dataframe_version,
+)
+from pydatastudio.data.dataframe_filter_plan import compile_filter
+from pydatastudio.data.dataframe_normalization import obtain_normalized_column
+from pydatastudio.data.dataframe_statistics import (
+    obtain_dataframe_statistics,
+    peek_dataframe_statistics,
+)
+
+
+class TestDataFrameStatistics(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "A": [5, 1, 7, 3, 9, 2, 8, 4],
+                "B": [1.0, None, None, None, 4.0, 2.0, None, 3.0],
+                "C": pd.to_datetime(
+                    [
+                        "2020-01-01",
+                        "2020-01-02",
+                        None,
+                        None,
+                        "2020-02-01",
+                        "2020-02-02",
+                        "2020-03-01",
+                        None,
+                    ]
+                ),
+                "D": ["x", "y", "x", "x", None, "y", "x", "y"],
+            }
+        )
+
+    def test_statistics_are_cached(self):
+        statistics = obtain_dataframe_statistics(self.data, block_size=2)
+
+        self.assertIs(obtain_dataframe_statistics(self.data, block_size=2), statistics)
+
+        invalidate_dataframe_cache(self.data)
+
+        self.assertIsNot(obtain_dataframe_statistics(self.data, block_size=2), statistics)
+
+    def test_cache_released_with_dataframe(self):
+        data = self.data.copy()
+        identity = id(data)
+
+        obtain_dataframe_statistics(data)
+
+        self.assertIn(identity, dataframe_cache._caches)
+
+        del data
+        gc.collect()
+
+        self.assertNotIn(identity, dataframe_cache._caches)
+
+    def test_null_count_and_distinct_estimate(self):
+        statistics = obtain_dataframe_statistics(self.data, block_size=2)
+
+        self.assertEqual(statistics.column("B").null_count, 4)
+        self.assertEqual(statistics.column("D").distinct_estimate, 3)
+        self.assertIsNone(statistics.column("Unknown"))
+
+    def test_numeric_zone_map(self):
+        column = obtain_dataframe_statistics(self.data, block_size=2).column("A")
+
+        self.assertEqual((column.min, column.max), (1, 9))
+        self.assertEqual(column.block_min.tolist(), [1, 3, 2, 4])
+        self.assertEqual(column.block_max.tolist(), [5, 7, 9, 8])
+
+    def test_zone_map_ignores_missing_values(self):
+        statistics = obtain_dataframe_statistics(self.data, block_size=2)
+
+        self.assertEqual(statistics.column("B").block_max[0], 1.0)
+        self.assertTrue(numpy.isnan(statistics.column("B").block_max[1]))
+        self.assertTrue(numpy.isnat(statistics.column("C").block_min[1]))
+        self.assertEqual(statistics.column("C").max, numpy.datetime64("2020-03-01"))
+
+    def test_no_zone_map_for_strings(self):
+        column = obtain_dataframe_statistics(self.data, block_size=2).column("D")
+
+        self.assertFalse(column.has_zone_map)
+        self.assertIsNone(column.block_min)
+
+    @patch("pydatastudio.data.dataframe_statistics.DEFAULT_BLOCK_SIZE", 8)
+    def test_filter_pruned_by_zone_maps(self):
+        data = pd.DataFrame(
+            {
+                "Date": pd.date_range("2020-01-01", periods=100, freq="D"),
+                "Amount": numpy.arange(100) % 7,
+            }
+        )
+        data.loc[40:50, "Date"] = pd.NaT
+
+        track_dataframe_version(data)
+
+        for data_filter in [
+            {"Date": {">=": "2020-02-15", "<": "2020-03-01"}},
+            {"Date": "> '2030-01-01'"},
+            {"Amount": 3, "Date": {"between": ["2020-01-05", "2020-01-20"]}},
+            {"Date": {"!=": "2020-01-01"}},
+        ]:
+            expected = compile_filter(data_filter).mask(data)
+
+            with patch.object(dataframe_filter_plan, "ZONE_MAP_MIN_ROWS", 0):
+                result = compile_filter(data_filter).mask(data)
+
+            self.assertEqual(result.tolist(), expected.tolist(), data_filter)
+
+    @patch.object(dataframe_filter_plan, "ZONE_MAP_MIN_ROWS", 0)
+    def test_filter_outside_range_skips_evaluation(self):
+        data = pd.DataFrame({"A": numpy.arange(100)})
+        track_dataframe_version(data)
+
+        with patch.object(
+            dataframe_filter_plan._ComparisonPredicate, "evaluate"
+        ) as evaluate:
+            result = compile_filter({"A": "> 1000"}).mask(data)
+
+        evaluate.assert_not_called()
+        self.assertFalse(result.any())
+
+
+    def test_statistics_dropped_on_modification(self):
+        self.assertIsNone(dataframe_version(self.data))
+        self.assertEqual(track_dataframe_version(self.data), 0)
+
+        statistics = obtain_dataframe_statistics(self.data, block_size=2)
+
+        for modify in [
+            lambda data: data.loc.__setitem__((0, "A"), 50),
+            lambda data: data.fillna({"B": 0.0}, inplace=True),
+            lambda data: data.__setitem__("A", data["A"] * 2),
+        ]:
+            modify(self.data)
+
+            # In-place modifications are declared
+            invalidate_dataframe_cache(self.data)
+
+            self.assertIsNone(peek_dataframe_statistics(self.data))
+
+            current = obtain_dataframe_statistics(self.data, block_size=2)
+
+            self.assertIsNot(current, statistics)
+            self.assertEqual(current.column("A").max, self.data["A"].max())
+
+            statistics = current
+
+        self.assertEqual(dataframe_version(self.data), 3)
+
+    @patch.object(dataframe_filter_plan, "ZONE_MAP_MIN_ROWS", 0)
+    def test_filter_after_modification(self):
+        data = pd.DataFrame({"A": numpy.arange(100), "D": ["Acme"] * 100})
+        track_dataframe_version(data)
+
+        self.assertFalse(compile_filter({"A": "> 1000"}).mask(data).any())
+        self.assertEqual(compile_filter({"D~i": "acme"}).mask(data).sum(), 100)
+
+        self.assertIsNotNone(peek_dataframe_statistics(data))
+
+        data.loc[10, "A"] = 5000
+        data.loc[20, "D"] = "Other"
+        invalidate_dataframe_cache(data)
+
+        self.assertEqual(numpy.flatnonzero(compile_filter({"A": "> 1000"}).mask(data)).tolist(), [10])
+        self.assertEqual(compile_filter({"D~i": "acme"}).mask(data).sum(), 99)
+
+    @patch.object(dataframe_filter_plan, "ZONE_MAP_MIN_ROWS", 0)
+    def test_explicit_statistics_without_data_version(self):
+        data = pd.DataFrame({"A": numpy.arange(100), "D": ["Acme"] * 100})
+
+        # Not tracked: derived data is not created automatically
+        compile_filter({"A": "> 1000", "D~i": "acme"}).mask(data)
+
+        self.assertIsNone(peek_dataframe_statistics(data))
+        self.assertIsNone(dataframe_cache.peek_dataframe_cache(data))
+
+        statistics = obtain_dataframe_statistics(data)
+        normalized = obtain_normalized_column(data, "D", "i")
+
+        context = dataframe_filter_plan._EvaluationContext(data)
+
+        self.assertIs(context.statistics(), statistics)
+        self.assertIs(context.base_column("D~i"), normalized)
+
+
+if __name__ == "__main__":
+    unittest.main()
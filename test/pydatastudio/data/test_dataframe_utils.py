@@ -5,13 +5,26 @@ Created on 30 mar. 2021
 """
 import unittest
 from pydatastudio.data.dataframe_utils import (
+    data_bitmap_by_dicts,
     data_filter_by_dataframe,
     data_filter_by_dict,
+    data_filter_by_dict_from_chunks,
+    data_filter_by_dicts,
+    data_view_by_dict,
+    obtain_dataframe_chunks_from_sheet,
+    obtain_dataframe_from_sheet,
+    stream_data_filter_by_dict,
     merge_dataframes_by_function,
+    split_research_by,
 )
+from pydatastudio.data.dataframe_view import FilteredView
+from pydatastudio.data.studio.data_research_utils import summary_research
 
 from pydatastudio import resources_manager
+import io
 import os
+import tempfile
+from openpyxl import Workbook, load_workbook
 import pandas as pd
 from datetime import datetime
 
@@ -205,6 +218,20 @@ class TestDataFrameUtils(unittest.TestCase):
             ),
         )
 
+    def testObtainListQueryKeepsIndexAndOrder(self):
+        query = [{"Subject": "Science"}, {"Name": "Bobby"}]
+
+        result = data_filter_by_dict(query, self.data)
+
+        self.assertEqual(result.index.tolist(), [1, 3, 4, 5, 7, 9, 10, 11])
+
+    def testObtainListQueryKeepsIdenticalRows(self):
+        data = pd.DataFrame({"A": [1, 1, 2, 3], "B": ["x", "x", "y", "z"]})
+
+        result = data_filter_by_dict([{"A": 1}, {"B": "y"}], data)
+
+        self.assertEqual(result.index.tolist(), [0, 1, 2])
+
     def testObtainListQueryInKey(self):
         query = {
             "Name Filter": [{"Name": "Cathrin"}, {"Subject": "Mathematics"}],
@@ -221,6 +248,147 @@ class TestDataFrameUtils(unittest.TestCase):
             ),
         )
 
+    def testObtainFilteredRowsByInOperator(self):
+        result = data_filter_by_dict({"Name": {"in": ["Bobby", "Alice"]}}, self.data)
+
+        self.assertEqual(result.index.tolist(), [1, 4, 6, 7, 10])
+
+    def testObtainFilteredRowsByNotInOperator(self):
+        result = data_filter_by_dict(
+            {"Name": {"not in": ["Bobby", "Alisa", "Cathrine"]}}, self.data
+        )
+
+        self.assertEqual(result["Name"].tolist(), ["Alice", "Cathrin"])
+
+    def testObtainFilteredRowsByBetweenOperator(self):
+        result = data_filter_by_dict({"Score": {"between": [65, 87]}}, self.data)
+
+        self.assertEqual(result["Score"].tolist(), [65, 78, 87, 73, 65, 86])
+
+    def testObtainFilteredRowsBySeveralOperators(self):
+        result = data_filter_by_dict({"Score": {">": 65, "!=": 87, "<=": 89}}, self.data)
+
+        self.assertEqual(result["Score"].tolist(), [78, 73, 86, 89])
+
+    def testObtainFilteredRowsByNotEqualString(self):
+        result = data_filter_by_dict({"Subject": "!= 'Science'"}, self.data)
+
+        self.assertEqual(len(result), 6)
+
+    def testObtainFilteredRowsByNullOperators(self):
+        data = pd.DataFrame({"A": ["x", None, "y", float("nan")]})
+
+        self.assertEqual(
+            data_filter_by_dict({"A": {"is null": True}}, data).index.tolist(), [1, 3]
+        )
+        self.assertEqual(
+            data_filter_by_dict({"A": {"not null": True}}, data).index.tolist(), [0, 2]
+        )
+
+    def testObtainFilteredDataByDicts(self):
+        data_filters = {
+            "Bobby": {"Name": "Bobby", "Exam": "Semester 1"},
+            "Science": {"Subject": "Science", "Exam": "Semester 1"},
+            "All": [],
+        }
+
+        result = data_filter_by_dicts(data_filters, self.data)
+        bitmaps = data_bitmap_by_dicts(data_filters, self.data)
+
+        for name, data_filter in data_filters.items():
+            expected = data_filter_by_dict(data_filter, self.data)
+
+            pd.testing.assert_frame_equal(result[name], expected)
+            self.assertEqual(bitmaps[name].count(), len(expected))
+
+    def testFilterByDictFromCsvChunks(self):
+        csv = io.StringIO(self.data.to_csv(index=False))
+
+        chunks = pd.read_csv(csv, chunksize=5)
+        result = data_filter_by_dict_from_chunks({"Name": "Bobby", "Score": "> 40"}, chunks)
+
+        expected = data_filter_by_dict({"Name": "Bobby", "Score": "> 40"}, self.data)
+
+        self.assertEqual(result.index.tolist(), expected.index.tolist())
+        self.assertEqual(result["Score"].tolist(), expected["Score"].tolist())
+
+    def testStreamFilterSkipsEmptyChunks(self):
+        chunks = [self.data.iloc[0:4], self.data.iloc[4:8], self.data.iloc[8:]]
+
+        result = list(stream_data_filter_by_dict({"Name": "Cathrin"}, chunks))
+
+        self.assertEqual([len(chunk) for chunk in result], [1])
+
+        empty = data_filter_by_dict_from_chunks({"Name": "Nobody"}, chunks)
+
+        self.assertTrue(empty.empty)
+        self.assertEqual(list(empty.columns), list(self.data.columns))
+
+    def testFilterByDictFromSheetChunks(self):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["Name", "Score"])
+
+        for name, score in zip(self.data["Name"], self.data["Score"]):
+            sheet.append([" " + name + "_x000D_", score])
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.xlsx")
+            workbook.save(filename)
+
+            read_only = load_workbook(filename, read_only=True)
+
+            chunks = obtain_dataframe_chunks_from_sheet(read_only.active, chunk_size=5)
+            result = data_filter_by_dict_from_chunks({"Name": "Bobby"}, chunks)
+
+            expected = data_filter_by_dict(
+                {"Name": "Bobby"}, obtain_dataframe_from_sheet(load_workbook(filename).active)
+            )
+
+            read_only.close()
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def testSplitResearchBy(self):
+        result = split_research_by(self.data, ["Subject", "Name"])
+
+        self.assertEqual(list(result), sorted(self.data["Subject"].unique()))
+
+        for subject, names in result.items():
+            self.assertEqual(list(names), sorted(self.data.loc[self.data["Subject"] == subject, "Name"].unique()))
+
+            for name, leaf in names.items():
+                expected = self.data[(self.data["Subject"] == subject) & (self.data["Name"] == name)]
+
+                pd.testing.assert_frame_equal(leaf, expected)
+
+        summary = summary_research(result)
+
+        self.assertEqual(sum(summary["value"]), self.data.shape[0])
+
+    def testSplitResearchByLazyAndUnsorted(self):
+        data = self.data.copy()
+        data.loc[data.index[0], "Name"] = None
+
+        view = data_view_by_dict({"Score": "> 50"}, data)
+
+        result = split_research_by(view, "Name", lazy=True, sort=False)
+
+        expected = view.to_dataframe()
+        expected = expected[expected["Name"].notna()]
+
+        self.assertEqual(list(result), list(expected["Name"].unique()))
+
+        for name, leaf in result.items():
+            self.assertIsInstance(leaf, FilteredView)
+            self.assertFalse(leaf.materialized)
+
+            pd.testing.assert_frame_equal(leaf.to_dataframe(), expected[expected["Name"] == name])
+
+        with_missing = split_research_by(data, "Name", dropna=False)
+
+        self.assertEqual(sum(len(leaf) for leaf in with_missing.values()), data.shape[0])
+
     def test_merge_dataframes_by_function(self):
         def sample_merge_function(row, other_df):
             new_column_name = "Merged Column"
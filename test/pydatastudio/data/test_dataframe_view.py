@@ -0,0 +1,96 @@
+"""
+Created on 18 oct. 2026
+
+@author: imoreno
+"""
+import copy
+import unittest
+
+import pandas as pd
+
+from pydatastudio.data.dataframe_utils import data_filter_by_dict, data_view_by_dict
+from pydatastudio.data.dataframe_view import FilteredView
+from pydatastudio.data.studio.data_research_utils import (
+    materialize_research,
+    summary_research,
+)
+
+
+class TestFilteredView(unittest.TestCase):
+    def setUp(self):
+        self.data = pd.DataFrame(
+            {
+                "Name": ["Alisa", "Bobby", "Cathrine", "Bobby", "Alisa"],
+                "Subject": ["Mathematics", "Science", "Science", "Mathematics", "Science"],
+                "Score": [65, 42, 52, 78, 51],
+            },
+            index=[10, 11, 12, 13, 14],
+        )
+
+    def test_view_is_lazy(self):
+        view = data_view_by_dict({"Subject": "Science"}, self.data)
+
+        self.assertIsInstance(view, FilteredView)
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view.shape, (3, 3))
+        self.assertFalse(view.empty)
+        self.assertEqual(view.index.tolist(), [11, 12, 14])
+        self.assertFalse(view.materialized)
+
+    def test_chained_filters(self):
+        view = data_view_by_dict({"Subject": "Science"}, self.data)
+        view = data_filter_by_dict({"Score": "> 45"}, view)
+
+        self.assertIsInstance(view, FilteredView)
+
+        expected = data_filter_by_dict({"Subject": "Science", "Score": "> 45"}, self.data)
+
+        pd.testing.assert_frame_equal(view.to_dataframe(), expected)
+        self.assertTrue(view.materialized)
+
+    def test_empty_view(self):
+        view = data_view_by_dict({"Name": "Nobody"}, self.data)
+
+        self.assertTrue(view.empty)
+        self.assertTrue(view.filter({"Score": "> 0"}).empty)
+
+    def test_dataframe_attributes_materialize(self):
+        view = data_view_by_dict({"Name": "Bobby"}, self.data)
+
+        self.assertEqual(view["Score"].tolist(), [42, 78])
+        self.assertEqual(view.Score.sum(), 120)
+
+    def test_bitmap(self):
+        view = data_view_by_dict({"Name": "Alisa"}, self.data)
+
+        self.assertEqual(view.bitmap().to_positions().tolist(), [0, 4])
+        self.assertEqual(FilteredView(self.data).bitmap().count(), 5)
+
+    def test_deepcopy_shares_base(self):
+        view = data_view_by_dict({"Name": "Alisa"}, self.data)
+
+        copied = copy.deepcopy({"research": view})["research"]
+
+        self.assertIs(copied.base, self.data)
+        self.assertEqual(len(copied), 2)
+
+    def test_research_with_views(self):
+        research = {
+            "Goal 1": {
+                "Science": data_view_by_dict({"Subject": "Science"}, self.data),
+                "Mathematics": data_view_by_dict({"Subject": "Mathematics"}, self.data),
+            }
+        }
+
+        summary = summary_research(research)
+
+        self.assertEqual(summary["value"].tolist(), [3, 2])
+        self.assertFalse(research["Goal 1"]["Science"].materialized)
+
+        materialized = materialize_research(research)
+
+        self.assertIsInstance(materialized["Goal 1"]["Science"], pd.DataFrame)
+
+
+if __name__ == "__main__":
+    unittest.main()